@@ -0,0 +1,29 @@
+"""``utz.bases.Converter`` encode/decode, one value at a time and in bulk."""
+from random import Random
+
+from utz.bases import b62, b90
+
+VALS = [ Random(0).getrandbits(48) for _ in range(10_000) ]
+
+
+def bench_b62_encode():
+    return lambda: [ b62(v) for v in VALS ]
+
+
+def bench_b62_decode():
+    strs = [ b62(v) for v in VALS ]
+    return lambda: [ b62(s) for s in strs ]
+
+
+def bench_b62_encode_many():
+    return lambda: b62.encode_many(VALS)
+
+
+def bench_b62_decode_many():
+    import numpy  # noqa: F401
+    strs = b62.encode_many(VALS, width=9)
+    return lambda: b62.decode_many(strs, width=9)
+
+
+def bench_b90_encode():
+    return lambda: [ b90(v) for v in VALS ]
@@ -0,0 +1,66 @@
+"""Reading Git objects: a ``git`` fork per object, vs. pooled ``utz.git.cat_file`` sessions."""
+import atexit
+from os.path import join
+from shutil import rmtree
+from subprocess import check_call, check_output, DEVNULL
+from tempfile import mkdtemp
+
+from utz.git.cat_file import CatFile
+
+N = 50
+
+_repo = None
+
+
+def repo() -> str:
+    """A temporary repo with ``N`` commits (each rewriting ``file.txt``)."""
+    global _repo
+    if _repo is None:
+        dir = mkdtemp()
+        atexit.register(rmtree, dir)
+
+        def git(*args):
+            check_call([ 'git', *args ], cwd=dir, stdout=DEVNULL, stderr=DEVNULL)
+
+        git('init', '-q')
+        git('config', 'user.name', 'bench')
+        git('config', 'user.email', 'bench@example.com')
+        for i in range(N):
+            with open(join(dir, 'file.txt'), 'w') as f:
+                f.write(f'{i}\n')
+            git('add', 'file.txt')
+            git('commit', '-qm', f'commit {i}')
+        _repo = dir
+    return _repo
+
+
+REFS = [ f'HEAD~{i}' for i in range(N) ]
+BLOBS = [ f'HEAD~{i}:file.txt' for i in range(N) ]
+
+
+def bench_rev_parse_forks():
+    dir = repo()
+    return lambda: [ check_output([ 'git', 'rev-parse', ref ], cwd=dir) for ref in REFS ]
+
+
+def bench_resolve():
+    session = CatFile(repo())
+    atexit.register(session.close)
+    return lambda: [ session.resolve(ref) for ref in REFS ]
+
+
+def bench_resolve_many():
+    session = CatFile(repo())
+    atexit.register(session.close)
+    return lambda: session.resolve_many(REFS)
+
+
+def bench_show_forks():
+    dir = repo()
+    return lambda: [ check_output([ 'git', 'cat-file', '-p', blob ], cwd=dir) for blob in BLOBS ]
+
+
+def bench_read():
+    session = CatFile(repo())
+    atexit.register(session.close)
+    return lambda: [ session.read(blob) for blob in BLOBS ]
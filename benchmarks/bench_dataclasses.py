@@ -0,0 +1,31 @@
+"""``utz.dataclasses.from_dict`` decoding of nested dataclasses."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from utz.dataclasses import from_dict
+
+
+@dataclass
+class Point:
+    x: int
+    y: int
+    label: str | None = None
+
+
+@dataclass
+class Shape:
+    name: str
+    points: list[Point]
+    attrs: dict[str, float]
+
+
+SHAPE = dict(
+    name='poly',
+    points=[ dict(x=i, y=-i, label=None if i % 2 else f'p{i}') for i in range(100) ],
+    attrs={ f'k{i}': i / 2 for i in range(20) },
+)
+
+
+def bench_from_dict():
+    return lambda: from_dict(Shape, SHAPE)
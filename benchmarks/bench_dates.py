@@ -0,0 +1,32 @@
+"""``utz.YM``/``utz.YMD`` construction (from various argument types) and ranges."""
+from datetime import date
+
+from utz.ym import YM
+from utz.ymd import YMD
+
+
+def bench_ym_str():
+    return lambda: [ YM('202403') for _ in range(1_000) ]
+
+
+def bench_ym_ints():
+    return lambda: [ YM(2024, 3) for _ in range(1_000) ]
+
+
+def bench_ym_until():
+    start, end = YM(1900, 1), YM(2100, 1)
+    return lambda: list(start.until(end))
+
+
+def bench_ymd_str():
+    return lambda: [ YMD('20240315') for _ in range(1_000) ]
+
+
+def bench_ymd_date():
+    d = date(2024, 3, 15)
+    return lambda: [ YMD(d) for _ in range(1_000) ]
+
+
+def bench_ymd_until():
+    start, end = YMD(2020, 1, 1), YMD(2022, 1, 1)
+    return lambda: list(start.until(end))
@@ -0,0 +1,14 @@
+"""``utz.diff_dfs.Diff`` between two 1k-row DataFrames."""
+
+
+def bench_diff():
+    import numpy as np
+    import pandas as pd
+    from utz.diff_dfs import Diff
+
+    rng = np.random.default_rng(0)
+    l = pd.DataFrame(rng.integers(0, 10, (1_000, 10)), columns=[ f'c{i}' for i in range(10) ])
+    r = l.copy()
+    r.iloc[::7, 3] += 1
+    r = r.drop(index=range(0, 1_000, 50)).drop(columns=['c9'])
+    return lambda: Diff(l, r)
@@ -0,0 +1,20 @@
+"""``utz.env`` patching: ``os.environ``-mutating ``env(…)`` vs. context-local ``env.overlay(…)``."""
+from utz.environ import env
+
+
+def bench_patch():
+    def run():
+        for i in range(100):
+            with env(BENCH_A=i, BENCH_B='b'):
+                with env(BENCH_A=-i):
+                    pass
+    return run
+
+
+def bench_overlay():
+    def run():
+        for i in range(100):
+            with env.overlay(BENCH_A=i, BENCH_B='b'):
+                with env.overlay(BENCH_A=-i) as snapshot:
+                    snapshot.dict()
+    return run
@@ -0,0 +1,24 @@
+"""``utz.fn.call``: memoized kwarg-name lookup vs. re-introspecting on every call."""
+from functools import wraps
+
+from utz.fn import _compute_kwarg_names, call
+
+
+def fn1(a, b):
+    return a, b
+
+
+@wraps(fn1)
+def fn2(a, c, **kwargs):
+    return a, c, kwargs
+
+
+KWARGS = dict(a=1, b=2, c=3, d=4)
+
+
+def bench_call():
+    return lambda: call(fn2, **KWARGS)
+
+
+def bench_call_uncached():
+    return lambda: fn2(**{ k: v for k, v in KWARGS.items() if k in _compute_kwarg_names(fn2) })
@@ -0,0 +1,36 @@
+"""``utz.hash_file`` on a 16MiB file, read whole or in chunks."""
+import atexit
+from os import urandom
+from os.path import join
+from shutil import rmtree
+from tempfile import mkdtemp
+
+from utz.hash import hash_file
+
+_path = None
+
+
+def path() -> str:
+    global _path
+    if _path is None:
+        dir = mkdtemp()
+        atexit.register(rmtree, dir)
+        _path = join(dir, 'data.bin')
+        with open(_path, 'wb') as f:
+            f.write(urandom(16 << 20))
+    return _path
+
+
+def bench_sha256():
+    p = path()
+    return lambda: hash_file(p)
+
+
+def bench_sha256_chunked():
+    p = path()
+    return lambda: hash_file(p, chunk_size=1 << 20)
+
+
+def bench_md5():
+    p = path()
+    return lambda: hash_file(p, 'md5')
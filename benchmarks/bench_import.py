@@ -0,0 +1,11 @@
+"""``from utz import *`` time, in a fresh interpreter (net of interpreter startup)."""
+import sys
+from subprocess import check_call
+
+
+def bench_star_import():
+    return lambda: check_call([ sys.executable, '-c', 'from utz import *' ])
+
+
+def bench_interpreter():
+    return lambda: check_call([ sys.executable, '-c', 'pass' ])
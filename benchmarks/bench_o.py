@@ -0,0 +1,73 @@
+"""``utz.o`` construction and (nested) attribute access, vs. plain ``dict``s."""
+from utz.o import frozen_o, o
+
+D = { 'a': 1, 'b': { 'c': 2, 'd': { 'e': 3 } }, 'f': [ 1, 2, 3 ] }
+
+
+def bench_construct():
+    return lambda: [ o(D) for _ in range(1_000) ]
+
+
+def bench_construct_dict():
+    return lambda: [ dict(D) for _ in range(1_000) ]
+
+
+def bench_construct_frozen():
+    return lambda: [ frozen_o(D) for _ in range(1_000) ]
+
+
+def bench_getattr():
+    obj = o(D)
+    return lambda: [ obj.a for _ in range(1_000) ]
+
+
+def bench_getitem():
+    obj = o(D)
+    return lambda: [ obj['a'] for _ in range(1_000) ]
+
+
+def bench_getitem_dict():
+    return lambda: [ D['a'] for _ in range(1_000) ]
+
+
+def bench_nested_getattr():
+    obj = o(D)
+    return lambda: [ obj.b.d.e for _ in range(1_000) ]
+
+
+def bench_nested_getattr_frozen():
+    obj = frozen_o(D)
+    return lambda: [ obj.b.d.e for _ in range(1_000) ]
+
+
+def bench_nested_getitem_dict():
+    return lambda: [ D['b']['d']['e'] for _ in range(1_000) ]
+
+
+def bench_hash_frozen():
+    d = { k: v for k, v in D.items() if k != 'f' }
+    objs = [ frozen_o(d) for _ in range(1_000) ]
+    return lambda: { obj for obj in objs }
+
+
+LAYERS = [
+    { f'k{i}': { 'x': i, 'y': { 'z': i } } for i in range(50) },
+    { f'k{i}': { 'y': { 'w': i } } for i in range(0, 50, 5) },
+    { 'k0': { 'x': -1 }, 'debug': True },
+]
+
+
+def bench_merge():
+    return lambda: [ o.merge(*LAYERS) for _ in range(100) ]
+
+
+def bench_merge_getattr():
+    def run():
+        for _ in range(100):
+            cfg = o.merge(*LAYERS)
+            cfg.k0.y.z, cfg.k5.y.w, cfg.debug
+    return run
+
+
+def bench_merge_freeze():
+    return lambda: [ o.merge(*LAYERS).freeze() for _ in range(100) ]
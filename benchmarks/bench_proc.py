@@ -0,0 +1,17 @@
+"""``utz.process`` throughput: capturing output, splitting lines, and piping between processes."""
+from utz.process import lines, output
+from utz.process.pipeline import pipeline
+
+N = 100_000
+
+
+def bench_output():
+    return lambda: output('seq', N, log=None)
+
+
+def bench_lines():
+    return lambda: lines('seq', N, log=None)
+
+
+def bench_pipeline():
+    return lambda: pipeline([ ['seq', str(N)], ['grep', '7'], ['wc', '-l'] ])
@@ -0,0 +1,23 @@
+"""``utz.rgx.Patterns`` matching: many literal patterns, and mixed regexes."""
+from random import Random
+
+from utz.rgx import Excludes, Includes
+
+rng = Random(0)
+VALS = [ f'{rng.choice(["src", "test", "docs", "build"])}/{rng.getrandbits(32):x}.{rng.choice(["py", "md", "o"])}' for _ in range(10_000) ]
+LITERALS = [ f'{rng.getrandbits(32):x}' for _ in range(500) ]
+
+
+def bench_literals():
+    pats = Includes(LITERALS)
+    return lambda: pats.filter(VALS)
+
+
+def bench_regexes():
+    pats = Includes([ r'^src/.*\.py$', r'^test/[0-9a-f]{4}', r'\.md$', r'build/.*\.o' ])
+    return lambda: pats.filter(VALS)
+
+
+def bench_excludes_call():
+    pats = Excludes([ r'\.o$', r'^docs/' ])
+    return lambda: [ pats(v) for v in VALS ]
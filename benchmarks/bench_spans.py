@@ -0,0 +1,34 @@
+"""``utz.time.Spans``: per-span overhead, vs. a bare (object-creating) context manager."""
+from utz.time import Spans
+
+
+class Bare:
+    __slots__ = ('name',)
+    def __init__(self, name): self.name = name
+    def __enter__(self): return self
+    def __exit__(self, *exc): pass
+
+
+def bench_bare():
+    def run():
+        with Bare('x'):
+            pass
+    return run
+
+
+def bench_span():
+    span = Spans(max_events=0).span
+
+    def run():
+        with span('x'):
+            pass
+    return run
+
+
+def bench_span_events():
+    span = Spans().span
+
+    def run():
+        with span('x'):
+            pass
+    return run
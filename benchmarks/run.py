@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""Run ``utz`` benchmarks, and record results as machine-readable history.
+
+Benchmarks are ``bench_*`` functions in ``benchmarks/bench_*.py``; each performs any setup, and returns a zero-arg
+callable to be timed (functions raising ``ImportError`` during setup, e.g. for missing optional dependencies, are
+skipped, as are callables that raise on a warm-up call). Each callable is run enough times to fill ``--min-time`` seconds, ``--repeat`` times; the best and median
+seconds-per-call are recorded.
+
+Results are written to ``results.json`` (stable key order and rounding, so that committing it makes regressions show
+up as diffs between commits), and appended to ``history.jsonl`` (one line per run, tagged with the current commit).
+``--compare <ref>`` prints ratios against the latest recorded run at a given commit.
+"""
+from __future__ import annotations
+
+import json
+import platform
+import re
+import sys
+from datetime import datetime, timezone
+from glob import glob
+from importlib import import_module
+from os.path import basename, dirname, exists, join, splitext
+from statistics import median
+from subprocess import CalledProcessError, check_output, DEVNULL
+from timeit import Timer
+
+from click import argument, command, option
+
+DIR = dirname(__file__)
+
+
+def sig(v: float, digits: int = 3) -> float:
+    return float(f'{v:.{digits}g}')
+
+
+def commit(ref: str = 'HEAD') -> str | None:
+    try:
+        return check_output(['git', 'rev-parse', ref], cwd=DIR, stderr=DEVNULL).decode().strip()
+    except (CalledProcessError, FileNotFoundError):
+        return None
+
+
+def discover(pattern: str | None = None):
+    """Yield ``(name, function)`` for each benchmark (``<module>.<function>``, minus ``bench_`` prefixes)."""
+    sys.path.insert(0, DIR)
+    for path in sorted(glob(join(DIR, 'bench_*.py'))):
+        mod_name = splitext(basename(path))[0]
+        mod = import_module(mod_name)
+        for fn_name, fn in list(vars(mod).items()):
+            if not fn_name.startswith('bench_') or not callable(fn):
+                continue
+            name = f"{mod_name.removeprefix('bench_')}.{fn_name.removeprefix('bench_')}"
+            if pattern and not re.search(pattern, name):
+                continue
+            yield name, fn
+
+
+def measure(fn, repeat: int, min_time: float) -> dict:
+    timer = Timer(fn)
+    number, _ = timer.autorange()
+    # `autorange` targets ≥.2s; scale up to `min_time`
+    number = max(1, int(number * min_time / .2))
+    times = [ t / number for t in timer.repeat(repeat=repeat, number=number) ]
+    return dict(min=sig(min(times)), median=sig(median(times)), number=number)
+
+
+def fmt_s(v: float) -> str:
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if v >= scale:
+            return f'{v / scale:.3g}{unit}'
+    return f'{v / 1e-9:.3g}ns'
+
+
+def load_history(path: str) -> list[dict]:
+    if not exists(path):
+        return []
+    with open(path) as f:
+        return [ json.loads(line) for line in f if line.strip() ]
+
+
+@command
+@option('-c', '--compare', 'compare_ref', help='Print ratios vs. the latest recorded run at this Git ref')
+@option('-H', '--history', 'history_path', default=join(DIR, 'history.jsonl'), help='History JSONL path (appended to)')
+@option('-n', '--dry-run', is_flag=True, help="Don't write results or history")
+@option('-o', '--out', 'out_path', default=join(DIR, 'results.json'), help='Results JSON path (overwritten)')
+@option('-r', '--repeat', type=int, default=5, help='Timing repetitions per benchmark')
+@option('-t', '--min-time', type=float, default=.2, help='Approximate seconds per repetition')
+@argument('pattern', required=False)
+def main(compare_ref, history_path, dry_run, out_path, repeat, min_time, pattern):
+    """Run benchmarks (optionally filtered by a regex PATTERN)."""
+    baseline = None
+    if compare_ref:
+        sha = commit(compare_ref) or compare_ref
+        runs = [ run for run in load_history(history_path) if run.get('commit') == sha ]
+        if not runs:
+            raise ValueError(f"No recorded runs for {compare_ref} ({sha}) in {history_path}")
+        baseline = runs[-1]['results']
+
+    results = {}
+    for name, fn in discover(pattern):
+        try:
+            op = fn()
+        except ImportError as e:
+            sys.stderr.write(f'{name}: skipped ({e})\n')
+            continue
+        try:
+            op()  # Warm up (and check that it works)
+        except Exception as e:
+            sys.stderr.write(f'{name}: failed ({type(e).__name__}: {e})\n')
+            continue
+        result = results[name] = measure(op, repeat=repeat, min_time=min_time)
+        line = f'{name}: {fmt_s(result["min"])} (median {fmt_s(result["median"])}, {result["number"]} calls × {repeat})'
+        if baseline and name in baseline:
+            line += f'; {result["min"] / baseline[name]["min"]:.2f}x vs. {compare_ref}'
+        print(line)
+
+    if dry_run:
+        return
+    with open(out_path, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+        f.write('\n')
+    run = dict(
+        commit=commit(),
+        time=datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'),
+        python=platform.python_version(),
+        platform=platform.platform(),
+        results=results,
+    )
+    with open(history_path, 'a') as f:
+        f.write(json.dumps(run, sort_keys=True) + '\n')
+
+
+if __name__ == '__main__':
+    main()
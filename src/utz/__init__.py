@@ -21,14 +21,14 @@ with _try: from stdlb import *
 # ### Date/Time
 with _try: from dateutil.parser import parse
 with _try: from pytz import UTC
-from .time import now, today, Time, utc
+from .time import now, today, Spans, Time, utc
 
 # ### Jupyter
 with _try: from IPython.display import HTML, Image, Markdown, display
 
 # Import other utilities from this repo:
 
-from .backoff import backoff
+from .backoff import backoff, Backoff
 from .bases import b26u, b26l, b36u, b36l, b52, b62, b64, b90
 from .hash import hash_file, HashName
 from .path import mkdir, mkpar
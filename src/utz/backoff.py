@@ -1,8 +1,14 @@
+from __future__ import annotations
 
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
 from datetime import datetime as dt
+from functools import wraps
+from inspect import iscoroutinefunction
 from sys import stderr
-import time
-from typing import Union
+from typing import Callable, Iterator, Literal, Union
 
 
 def backoff(
@@ -58,3 +64,169 @@ def backoff(
             sleep *= step
             if max and sleep > max:
                 raise TimeoutError(msg or ('Failed after %d attempts / %ss' % (attempts, int((dt.now() - start).total_seconds()))))
+
+
+# ## Capped exponential backoff with jitter
+#
+# Deterministic schedules (like ``backoff`` above) cause many clients retrying against the same endpoint to
+# synchronize ("thundering herd"); jittered delays spread them out. Cf.
+# https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/.
+
+Jitter = Literal['full', 'equal', 'decorrelated'] | None
+
+
+@dataclass
+class Stats:
+    """Metrics from one ``Backoff`` run."""
+    attempts: int = 0
+    waited: float = 0.
+    delays: list[float] = field(default_factory=list)
+    elapsed: float = 0.
+
+
+class BackoffTimeout(TimeoutError):
+    """Raised when a ``Backoff`` exhausts its ``tries`` or ``deadline``; ``stats`` describes the attempts made, and
+    ``__cause__`` is the last exception raised by the wrapped function (if any)."""
+    def __init__(self, msg: str, stats: Stats, last=None):
+        super().__init__(msg)
+        self.stats = stats
+        self.last = last
+
+
+class Backoff:
+    """Retry a function with capped, jittered exponential backoff.
+
+    The un-jittered delay before retry ``i`` (0-indexed) is ``min(cap, base * factor**i)``; ``jitter`` then selects:
+    - ``'full'`` (default): uniform in ``[0, delay]``
+    - ``'equal'``: uniform in ``[delay/2, delay]``
+    - ``'decorrelated'``: uniform in ``[base, 3 * previous delay]``, capped
+    - ``None``: ``delay``, deterministically
+
+    Retries stop after ``tries`` attempts or ``deadline`` seconds (the last sleep is truncated to end at the deadline),
+    raising ``BackoffTimeout``. Exceptions matching ``exc`` trigger a retry (others propagate immediately), as do return
+    values for which ``pred`` is falsy.
+
+    Call ``run``/``arun`` directly, or use an instance as a decorator (on sync or ``async`` functions); metrics from
+    the most recent run are available as ``.stats`` (on the ``Backoff``, and on decorated functions).
+    """
+    def __init__(
+        self,
+        base: float = 0.1,
+        factor: float = 2,
+        cap: float = 30,
+        jitter: Jitter = 'full',
+        tries: int | None = 5,
+        deadline: float | None = None,
+        exc: type[BaseException] | tuple[type[BaseException], ...] = Exception,
+        pred: Callable | None = None,
+        rng: random.Random | None = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        asleep: Callable = asyncio.sleep,
+    ):
+        if jitter not in ('full', 'equal', 'decorrelated', None):
+            raise ValueError(f"Unrecognized jitter: {jitter}")
+        self.base = base
+        self.factor = factor
+        self.cap = cap
+        self.jitter = jitter
+        self.tries = tries
+        self.deadline = deadline
+        self.exc = exc
+        self.pred = pred
+        self.rng = rng or random.Random()
+        self.clock = clock
+        self.sleep = sleep
+        self.asleep = asleep
+        self.stats: Stats | None = None
+
+    def delays(self) -> Iterator[float]:
+        """Infinite iterator of (jittered) delays."""
+        rng = self.rng
+        base, cap = self.base, self.cap
+        prev = base
+        i = 0
+        while True:
+            if self.jitter == 'decorrelated':
+                delay = prev = min(cap, rng.uniform(base, prev * 3))
+            else:
+                delay = min(cap, base * self.factor ** i)
+                if self.jitter == 'full':
+                    delay = rng.uniform(0, delay)
+                elif self.jitter == 'equal':
+                    delay = delay / 2 + rng.uniform(0, delay / 2)
+            yield delay
+            i += 1
+
+    def _next_delay(self, stats: Stats, delays: Iterator[float], start: float, last) -> float:
+        """Return the next delay to sleep for (and record it in ``stats``), or raise ``BackoffTimeout``."""
+        now = self.clock()
+        stats.elapsed = now - start
+        if self.tries is not None and stats.attempts >= self.tries:
+            raise BackoffTimeout(f'Failed after {stats.attempts} attempts / {stats.elapsed:.3g}s', stats, last) from last
+        delay = next(delays)
+        if self.deadline is not None:
+            remaining = start + self.deadline - now
+            if remaining <= 0:
+                raise BackoffTimeout(f'Deadline ({self.deadline}s) exceeded after {stats.attempts} attempts', stats, last) from last
+            delay = min(delay, remaining)
+        stats.delays.append(delay)
+        stats.waited += delay
+        return delay
+
+    def run(self, fn: Callable, *args, **kwargs):
+        """Call ``fn(*args, **kwargs)`` until it succeeds."""
+        return self._run(Stats(), fn, args, kwargs)
+
+    def _run(self, stats: Stats, fn: Callable, args, kwargs):
+        self.stats = stats
+        delays = self.delays()
+        start = self.clock()
+        while True:
+            stats.attempts += 1
+            try:
+                v = fn(*args, **kwargs)
+            except self.exc as e:
+                last = e
+            else:
+                if self.pred is None or self.pred(v):
+                    stats.elapsed = self.clock() - start
+                    return v
+                last = None
+            self.sleep(self._next_delay(stats, delays, start, last))
+
+    async def arun(self, fn: Callable, *args, **kwargs):
+        """Await ``fn(*args, **kwargs)`` until it succeeds, sleeping with ``asyncio.sleep`` between attempts."""
+        return await self._arun(Stats(), fn, args, kwargs)
+
+    async def _arun(self, stats: Stats, fn: Callable, args, kwargs):
+        self.stats = stats
+        delays = self.delays()
+        start = self.clock()
+        while True:
+            stats.attempts += 1
+            try:
+                v = await fn(*args, **kwargs)
+            except self.exc as e:
+                last = e
+            else:
+                if self.pred is None or self.pred(v):
+                    stats.elapsed = self.clock() - start
+                    return v
+                last = None
+            await self.asleep(self._next_delay(stats, delays, start, last))
+
+    def __call__(self, fn: Callable) -> Callable:
+        """Decorate ``fn`` (sync or ``async``) to retry with this backoff policy."""
+        if iscoroutinefunction(fn):
+            @wraps(fn)
+            async def _fn(*args, **kwargs):
+                _fn.stats = Stats()
+                return await self._arun(_fn.stats, fn, args, kwargs)
+        else:
+            @wraps(fn)
+            def _fn(*args, **kwargs):
+                _fn.stats = Stats()
+                return self._run(_fn.stats, fn, args, kwargs)
+        _fn.stats = None
+        return _fn
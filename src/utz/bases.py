@@ -1,3 +1,9 @@
+from __future__ import annotations
+
+from typing import Iterable, Sequence
+
+U64_MAX = 2**64 - 1
+
 
 def i2s(v, chars):
     N = len(chars)
@@ -9,15 +15,13 @@ def i2s(v, chars):
         base *= N
         ceiling += base
 
-    chrs = ''
-    n = v - ceiling
-    for base in reversed(bases):
-        i = n // base
-        n -= i*base
-        ch = chars[i]
-        chrs += ch
+    n = v - ceiling + base
+    chrs = []
+    for _ in bases:
+        n, i = divmod(n, N)
+        chrs.append(chars[i])
 
-    return chrs
+    return ''.join(reversed(chrs))
 
 
 def s2i(s, ints):
@@ -33,11 +37,18 @@ def s2i(s, ints):
 
 
 def b2s(b, chars):
-    n = 0
-    for byte in b:
-        n *= 256
-        n += byte
-    return i2s(n, chars)
+    return i2s(int.from_bytes(b, 'big'), chars)
+
+
+def offsets(N: int, hi: int = U64_MAX) -> list[int]:
+    """Return the first integer encoded by strings of each length (``offsets(N)[k]`` ⟺ ``N**(k-1) + … + N + 1``),
+    up to and including the last one ``≤ hi``."""
+    offs = [0]
+    base = 1
+    while offs[-1] + base <= hi:
+        offs.append(offs[-1] + base)
+        base *= N
+    return offs
 
 
 class Converter:
@@ -53,12 +64,17 @@ class Converter:
     - etc.
 
     They also preserve ordering; alphabets are ASCII-ordered.
+
+    ``encode_many`` / ``decode_many`` convert batches of values with NumPy array arithmetic. Passing
+    ``width`` to either selects a fixed-width encoding instead: integers in ``[0, N**width)`` map to
+    ``width``-char strings, left-padded with the alphabet's first character (this also preserves ordering).
     """
     i2s: str
 
     def __init__(self, i2s: str):
         self.i2s = i2s
         self.s2i = { ch: i for i, ch in enumerate(self.i2s) }
+        self._tables = None
 
     def __call__(self, v):
         if isinstance(v, str):
@@ -70,6 +86,163 @@ class Converter:
         else:
             raise ValueError(f'Unrecognized type ({type(v)}): {v}')
 
+    @property
+    def N(self) -> int:
+        return len(self.i2s)
+
+    @property
+    def tables(self):
+        """Lazily-computed NumPy lookup tables: ``(offsets, codes, digits)``.
+
+        - ``offsets[k]``: first integer encoded by a ``k``-char string (as ``uint64``)
+        - ``codes[i]``: ASCII code of the ``i``-th char of the alphabet
+        - ``digits[c]``: index in the alphabet of ASCII code ``c`` (``-1`` if absent)
+        """
+        if self._tables is None:
+            import numpy as np
+            if any(ord(ch) >= 128 for ch in self.i2s):
+                raise ValueError(f"Vectorized conversions require an ASCII alphabet: {self.i2s}")
+            offs = np.array(offsets(self.N), dtype=np.uint64)
+            codes = np.array([ ord(ch) for ch in self.i2s ], dtype=np.uint8)
+            digits = np.full(128, -1, dtype=np.int64)
+            digits[codes] = np.arange(self.N)
+            self._tables = offs, codes, digits
+        return self._tables
+
+    def encode_many(self, vs: Iterable[int] | Iterable[bytes], width: int | None = None) -> list[str]:
+        """Encode many non-negative integers (or ``bytes``, interpreted as big-endian integers) to strings.
+
+        Integers must fit in 64 bits to be vectorized; larger values fall back to per-element conversion.
+        """
+        import numpy as np
+        if not isinstance(vs, np.ndarray):
+            vs = list(vs)
+            if vs and all(isinstance(v, bytes) for v in vs):
+                lens = { len(v) for v in vs }
+                if len(lens) == 1 and (L := lens.pop()) <= 8:
+                    # Fold equal-length byte-strings into `uint64`s, one column (byte) at a time
+                    bs = np.frombuffer(b''.join(vs), dtype=np.uint8).reshape(len(vs), L).astype(np.uint64)
+                    n = np.zeros(len(vs), dtype=np.uint64)
+                    for col in bs.T:
+                        n = (n << np.uint64(8)) | col
+                    vs = n
+                else:
+                    vs = [ int.from_bytes(v, 'big') for v in vs ]
+            if not isinstance(vs, np.ndarray):
+                if any(not isinstance(v, (int, np.integer)) for v in vs):
+                    raise ValueError(f'Expected ints or bytes: {vs}')
+                if any(v < 0 for v in vs):
+                    raise ValueError(f'Negative values can\'t be encoded: {vs}')
+                if any(v > U64_MAX for v in vs):
+                    return [ self._encode_big(int(v), width) for v in vs ]
+                vs = np.array(vs, dtype=np.uint64)
+        if vs.dtype.kind not in 'iu':
+            raise ValueError(f'Expected integer array, found {vs.dtype}')
+        if vs.dtype.kind == 'i':
+            if (vs < 0).any():
+                raise ValueError(f'Negative values can\'t be encoded: {vs[vs < 0]}')
+            vs = vs.astype(np.uint64)
+        vs = vs.ravel()
+        if not len(vs):
+            return []
+
+        offs, codes, _ = self.tables
+        N = np.uint64(self.N)
+        if width is None:
+            lens = np.searchsorted(offs, vs, side='right') - 1
+            n = vs - offs[lens]
+            W = int(lens.max())
+        else:
+            lens = None
+            n = vs.copy()
+            W = width
+
+        # Extract digits from least- to most-significant, writing each into its (left-aligned) column
+        chars = np.zeros((len(vs), W), dtype=np.uint8)
+        for j in range(W):
+            n, d = np.divmod(n, N)
+            if lens is None:
+                chars[:, W - 1 - j] = codes[d]
+            else:
+                mask = j < lens
+                rows = np.nonzero(mask)[0]
+                chars[rows, lens[rows] - 1 - j] = codes[d[rows]]
+        if width is not None and n.any():
+            raise ValueError(f'Values too large for width {width}: {vs[n != 0]}')
+        if not W:
+            # (all zeros; there's no 0-width `S` dtype to view `chars` as)
+            return [''] * len(vs)
+        # `S` dtype drops trailing NULs, leaving each variable-width string
+        return chars.view(f'S{W}').ravel().astype(f'U{W}').tolist()
+
+    def _encode_big(self, v: int, width: int | None) -> str:
+        if width is None:
+            return i2s(v, self.i2s)
+        N = self.N
+        chrs = []
+        for _ in range(width):
+            v, d = divmod(v, N)
+            chrs.append(self.i2s[d])
+        if v:
+            raise ValueError(f'Value too large for width {width}')
+        return ''.join(reversed(chrs))
+
+    def decode_many(self, ss: Sequence[str], width: int | None = None):
+        """Decode many strings to integers; inverse of ``encode_many``.
+
+        Returns a ``uint64`` NumPy array, or an ``object`` array of Python ``int``s if results may not fit in 64 bits.
+        """
+        import numpy as np
+        ss = np.asarray(ss, dtype=str).ravel()
+        if not len(ss):
+            return np.zeros(0, dtype=np.uint64)
+        offs, _, digits = self.tables
+        W = ss.dtype.itemsize // 4
+        chars = ss.view(np.uint32).reshape(len(ss), W) if W else np.zeros((len(ss), 0), dtype=np.uint32)
+        lens = (chars != 0).sum(axis=1)
+        if width is not None and (lens != width).any():
+            raise ValueError(f'Expected {width}-char strings: {ss[lens != width]}')
+        if (chars >= 128).any():
+            raise ValueError(f'Unrecognized chars: {ss[(chars >= 128).any(axis=1)]}')
+        ds = digits[chars]
+        if ((ds < 0) & (chars != 0)).any():
+            raise ValueError(f'Unrecognized chars: {ss[((ds < 0) & (chars != 0)).any(axis=1)]}')
+
+        ds = np.where(chars != 0, ds, 0).astype(np.uint64)
+
+        # Horner's method in `uint64`, flagging rows that overflow (which are then decoded with Python `int`s)
+        N = np.uint64(self.N)
+        hi = np.uint64(U64_MAX)
+        n = np.zeros(len(ss), dtype=np.uint64)
+        overflow = np.zeros(len(ss), dtype=bool)
+        with np.errstate(over='ignore'):
+            for i in range(W):
+                d = ds[:, i]
+                if width is None:
+                    live = i < lens
+                    overflow |= live & (n > (hi - d) // N)
+                    n = np.where(live, n * N + d, n)
+                else:
+                    overflow |= n > (hi - d) // N
+                    n = n * N + d
+            if width is None:
+                overflow |= lens >= len(offs)
+                base = offs[np.minimum(lens, len(offs) - 1)]
+                overflow |= n > hi - base
+                n += base
+        if overflow.any():
+            n = n.astype(object)
+            n[overflow] = [ self._decode_big(str(s), width) for s in ss[overflow] ]
+        return n
+
+    def _decode_big(self, s: str, width: int | None) -> int:
+        if width is None:
+            return s2i(s, self.s2i)
+        n = 0
+        for ch in s:
+            n = n * self.N + self.s2i[ch]
+        return n
+
 
 b26u = Converter('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
 b26l = Converter('abcdefghijklmnopqrstuvwxyz')
@@ -2,7 +2,10 @@
 
 from __future__ import annotations
 
-from asyncio import gather
+from asyncio import FIRST_EXCEPTION, Task, TimeoutError as AsyncTimeoutError, ensure_future, gather, shield, to_thread, \
+    wait, wait_for
+from collections.abc import Mapping
+from threading import Lock
 
 from contextlib import AbstractContextManager, contextmanager, asynccontextmanager, AbstractAsyncContextManager, \
     AsyncExitStack
@@ -42,20 +45,20 @@ ctxs = contexts
 
 
 async def aenter_ctx(ctx):
-    """Enter an async context manager or adapt a sync one."""
+    """Enter an async context manager or adapt a sync one (whose ``__enter__`` runs in a worker thread)."""
     if hasattr(ctx, '__aenter__'):
         return await ctx.__aenter__()
     elif hasattr(ctx, '__enter__'):
-        return ctx.__enter__()
+        return await to_thread(ctx.__enter__)
     else:
         raise TypeError(f"Object {ctx} is not a context manager")
 
 async def aexit_ctx(ctx, exc_type, exc_val, exc_tb):
-    """Exit an async context manager or adapt a sync one."""
+    """Exit an async context manager or adapt a sync one (whose ``__exit__`` runs in a worker thread)."""
     if hasattr(ctx, '__aexit__'):
         return await ctx.__aexit__(exc_type, exc_val, exc_tb)
     elif hasattr(ctx, '__exit__'):
-        return ctx.__exit__(exc_type, exc_val, exc_tb)
+        return await to_thread(ctx.__exit__, exc_type, exc_val, exc_tb)
     else:
         raise TypeError(f"Object {ctx} is not a context manager")
 
@@ -63,41 +66,166 @@ async def aexit_ctx(ctx, exc_type, exc_val, exc_tb):
 CtxMgr = Union[ContextManager[T], AsyncContextManager[T]]
 
 
-def acontexts(*ctxs: CtxMgr | Sequence[CtxMgr] | Iterator) -> AsyncContextManager:
-    """Compose context managers, running their __aenter__ and __aexit__ methods concurrently."""
-    # Flatten the list of context managers
-    flat_ctxs = []
+class _SyncEnter:
+    """Runs a sync context manager's ``__enter__`` in a worker thread, which can't be interrupted; if the caller gives
+    up waiting (timeout, cancellation) before it finishes, the thread ``__exit__``s the context itself afterward."""
+    def __init__(self, ctx: ContextManager):
+        self.ctx = ctx
+        self.lock = Lock()
+        self.state = None  # "entered" | "abandoned"
+
+    def enter(self):
+        value = self.ctx.__enter__()
+        with self.lock:
+            abandoned = self.state == 'abandoned'
+            if not abandoned:
+                self.state = 'entered'
+        if abandoned:
+            self.ctx.__exit__(None, None, None)
+        return value
+
+    def abandon(self) -> bool:
+        """Stop waiting on ``enter``; returns ``True`` if the context was already entered (and must be exited by the
+        caller)."""
+        with self.lock:
+            if self.state == 'entered':
+                return True
+            self.state = 'abandoned'
+            return False
+
+
+def _flatten(ctxs) -> list:
+    flat = []
     for _ctxs in ctxs:
         if isinstance(_ctxs, Sequence):
-            flat_ctxs.extend(_ctxs)
+            flat.extend(_ctxs)
         else:
-            flat_ctxs.append(_ctxs)
+            flat.append(_ctxs)
+    return flat
+
+
+def acontexts(
+    *ctxs: CtxMgr | Sequence[CtxMgr] | Iterator,
+    deps: Mapping[CtxMgr, Sequence[CtxMgr]] | None = None,
+    timeout: float | None = None,
+    total_timeout: float | None = None,
+) -> AsyncContextManager:
+    """Compose context managers, running their __aenter__ and __aexit__ methods concurrently.
+
+    Sync context managers' ``__enter__``/``__exit__`` run in worker threads (``asyncio.to_thread``), so they don't
+    block the event loop (or each other). ``deps`` maps contexts to others that must be entered before them (and exited
+    after them), e.g. ``acontexts(a, b, c, deps={c: [a, b]})`` enters ``a`` and ``b`` concurrently, then ``c``.
+
+    ``timeout`` bounds each context's entry, and ``total_timeout`` all of them; either raises ``TimeoutError``. If
+    entering fails, only the contexts that were entered are exited (concurrently, dependents first), and the error is
+    re-raised. Yields the contexts' values, in order.
+    """
+    flat_ctxs = _flatten(ctxs)
+    n = len(flat_ctxs)
+    idxs = { id(ctx): i for i, ctx in enumerate(flat_ctxs) }
+    parents: list[list[int]] = [ [] for _ in flat_ctxs ]
+    for ctx, ctx_deps in (deps or {}).items():
+        for c in [ ctx, *ctx_deps ]:
+            if id(c) not in idxs:
+                raise ValueError(f"`deps` references a context not passed to `acontexts`: {c}")
+        parents[idxs[id(ctx)]].extend(idxs[id(dep)] for dep in ctx_deps)
+
+    # Topological order (Kahn's algorithm), stable w.r.t. argument order
+    children: list[list[int]] = [ [] for _ in flat_ctxs ]
+    for i, ps in enumerate(parents):
+        for p in ps:
+            children[p].append(i)
+    pending = [ len(set(ps)) for ps in parents ]
+    order = [ i for i in range(n) if not pending[i] ]
+    for i in order:
+        for c in set(children[i]):
+            pending[c] -= 1
+            if not pending[c]:
+                order.append(c)
+    if len(order) < n:
+        raise ValueError("`deps` contains a cycle")
+
+    async def enter(i: int, entered: dict[int, CtxMgr], tasks: list[Task]):
+        await gather(*(tasks[p] for p in parents[i]))
+        ctx = flat_ctxs[i]
+        try:
+            if hasattr(ctx, '__aenter__'):
+                value = await wait_for(ctx.__aenter__(), timeout)
+            elif hasattr(ctx, '__enter__'):
+                sync = _SyncEnter(ctx)
+                future = ensure_future(to_thread(sync.enter))
+                try:
+                    value = await wait_for(shield(future), timeout)
+                except BaseException:
+                    if sync.abandon():
+                        entered[i] = ctx
+                    raise
+            else:
+                raise TypeError(f"Object {ctx} is not a context manager")
+        except AsyncTimeoutError:
+            if timeout is None:
+                raise
+            raise TimeoutError(f"Timed out entering {ctx} after {timeout}s") from None
+        entered[i] = ctx
+        return value
+
+    async def unwind(entered: dict[int, CtxMgr], exc_details) -> list[BaseException]:
+        """Exit ``entered`` contexts concurrently, each after its (entered) dependents."""
+        tasks: dict[int, Task] = {}
+
+        async def exit(i: int):
+            await gather(*(tasks[c] for c in children[i] if c in tasks), return_exceptions=True)
+            return await aexit_ctx(entered[i], *exc_details)
+
+        for i in reversed(order):
+            if i in entered:
+                tasks[i] = ensure_future(exit(i))
+        results = await gather(*tasks.values(), return_exceptions=True)
+        return [ r for r in results if isinstance(r, BaseException) ]
 
     @asynccontextmanager
     async def async_composed():
-        exit_stack = []
+        entered: dict[int, CtxMgr] = {}
+        tasks: list[Task | None] = [ None ] * n
+        for i in order:
+            tasks[i] = ensure_future(enter(i, entered, tasks))
+        try:
+            if tasks:
+                await wait(tasks, timeout=total_timeout, return_when=FIRST_EXCEPTION)
+            error = next((
+                task.exception()
+                for task in tasks
+                if task.done() and not task.cancelled() and task.exception() is not None
+            ), None)
+            if error is None:
+                pending = [ flat_ctxs[i] for i, task in enumerate(tasks) if not task.done() ]
+                if pending:
+                    error = TimeoutError(
+                        f"Timed out after {total_timeout}s entering {len(pending)}/{n} contexts: "
+                        f"{', '.join(map(repr, pending))}"
+                    )
+            if error is not None:
+                raise error
+            values = [ task.result() for task in tasks ]
+        except BaseException as e:
+            for task in tasks:
+                task.cancel()
+            await gather(*tasks, return_exceptions=True)
+            await unwind(entered, (type(e), e, e.__traceback__))
+            raise
+
         exc_details = (None, None, None)
         try:
-            # Run all __aenter__ methods concurrently
-            values = await gather(*(aenter_ctx(ctx) for ctx in flat_ctxs))
-            exit_stack = list(flat_ctxs)  # Track contexts that need to be exited
             yield values
         except BaseException as e:
             # Store exception details for __aexit__ methods
             exc_details = (type(e), e, e.__traceback__)
             raise
         finally:
-            # Run all __aexit__ methods concurrently
-            if exit_stack:
-                exit_results = await gather(
-                    *(aexit_ctx(ctx, *exc_details) for ctx in reversed(exit_stack)),
-                    return_exceptions=True
-                )
-                # Re-raise any exceptions from __aexit__ if no other exception is being propagated
-                if exc_details[0] is None:
-                    for result in exit_results:
-                        if isinstance(result, BaseException):
-                            raise result
+            errors = await unwind(entered, exc_details)
+            # Re-raise any exceptions from __aexit__ if no other exception is being propagated
+            if exc_details[0] is None and errors:
+                raise errors[0]
 
     return async_composed()
 
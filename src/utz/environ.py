@@ -3,8 +3,9 @@ from __future__ import annotations
 import os
 import enum
 import warnings
-from collections.abc import MutableMapping
+from collections.abc import Mapping, MutableMapping
 from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Any, Iterator, overload
 
 
@@ -33,6 +34,97 @@ class EnvPatchConflict(Exception):
         )
 
 
+class Snapshot(Mapping):
+    """Immutable environment: a base ``dict`` (copied from ``os.environ`` once), plus an overlay of changes.
+
+    ``overlay()`` returns a new ``Snapshot`` sharing the same base, whose overlay is the (small) union of its parent's
+    and the new changes; ``None`` values unset variables. Pass a ``Snapshot`` as ``env=`` to ``utz.process`` commands
+    (or ``subprocess``, via ``dict()``); the merged ``dict`` is computed on first use, and memoized.
+    """
+    __slots__ = ('_base', '_overlay', '_dict')
+
+    def __init__(self, base: Mapping[str, str] | None = None, overlay: dict[str, str | None] | None = None):
+        self._base = dict(os.environ if base is None else base)
+        self._overlay = overlay or {}
+        self._dict = None
+
+    @staticmethod
+    def _strs(updates: Mapping[str, Any]) -> dict[str, str | None]:
+        return { k: None if v is None else str(v) for k, v in updates.items() }
+
+    def overlay(self, updates: Mapping[str, Any] | None = None, **kwargs) -> Snapshot:
+        """Return a ``Snapshot`` with ``updates`` (or ``kwargs``) applied; ``None`` values unset variables."""
+        if updates is not None and kwargs:
+            raise ValueError("Cannot specify both dictionary and keyword arguments")
+        changes = self._strs(kwargs if updates is None else updates)
+        snapshot = Snapshot.__new__(Snapshot)
+        snapshot._base = self._base
+        snapshot._overlay = { **self._overlay, **changes }
+        snapshot._dict = None
+        return snapshot
+
+    def dict(self) -> dict[str, str]:
+        """Merged variables, as a (memoized; don't mutate it) ``dict``."""
+        if self._dict is None:
+            if not self._overlay:
+                self._dict = self._base
+            else:
+                d = { **self._base, **self._overlay }
+                for k, v in self._overlay.items():
+                    if v is None:
+                        del d[k]
+                self._dict = d
+        return self._dict
+
+    def __getitem__(self, key: str) -> str:
+        if key in self._overlay:
+            v = self._overlay[key]
+            if v is None:
+                raise KeyError(key)
+            return v
+        return self._base[key]
+
+    def __contains__(self, key: object) -> bool:
+        if key in self._overlay:
+            return self._overlay[key] is not None
+        return key in self._base
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.dict())
+
+    def __len__(self) -> int:
+        return len(self.dict())
+
+    def __repr__(self) -> str:
+        return f'Snapshot({len(self._base)} vars, overlay={self._overlay!r})'
+
+
+# Snapshot that `utz.process` commands use as their default `env=`, in the current thread / `asyncio` task
+_current: ContextVar[Snapshot | None] = ContextVar('utz.environ.current', default=None)
+
+
+# (raw `os.environ` contents, `Snapshot` of them); reused while `os.environ` is unchanged
+_latest: tuple[dict, Snapshot] | None = None
+
+
+def _environ_snapshot() -> Snapshot:
+    global _latest
+    # Comparing `os.environ`'s underlying (encoded) `dict` is much cheaper than decoding a fresh copy
+    raw = getattr(os.environ, '_data', None)
+    latest = _latest
+    if raw is not None and latest is not None and latest[0] == raw:
+        return latest[1]
+    snapshot = Snapshot()
+    if raw is not None:
+        _latest = (dict(raw), snapshot)
+    return snapshot
+
+
+def current() -> Snapshot | None:
+    """The innermost active ``env.overlay(…)`` ``Snapshot`` in this context (thread / ``asyncio`` task), if any."""
+    return _current.get()
+
+
 class Env(MutableMapping):
     """
     A singleton wrapper around os.environ that provides dictionary-like access to environment
@@ -55,6 +147,15 @@ class Env(MutableMapping):
                 _on_conflict=OnConflict.WARN,
                 _on_exit=OnExit.SKIP):
             print(env["MY_VAR"])  # temporary
+
+        # Context-local overlay (no `os.environ` mutation; safe across threads and asyncio tasks); applies to
+        # `utz.process` commands run in the block
+        with env.overlay(MY_VAR="temporary") as snapshot:
+            proc.run("my-cmd")  # sees MY_VAR=temporary
+            print(snapshot["MY_VAR"])  # temporary
+
+        # Or pass a snapshot explicitly
+        proc.run("my-cmd", env=env.snapshot().overlay(MY_VAR="temporary"))
     """
 
     _instance = None
@@ -83,6 +184,26 @@ class Env(MutableMapping):
     def __len__(self) -> int:
         return len(os.environ)
 
+    def snapshot(self) -> Snapshot:
+        """Immutable view of the environment: the active ``overlay`` (if any), else a copy of ``os.environ``."""
+        snapshot = _current.get()
+        return _environ_snapshot() if snapshot is None else snapshot
+
+    @contextmanager
+    def overlay(self, updates: Mapping[str, Any] | None = None, **kwargs) -> Iterator[Snapshot]:
+        """Apply ``updates`` (or ``kwargs``; ``None`` values unset variables) to a ``Snapshot``, and make it the
+        default ``env=`` for ``utz.process`` commands within the block.
+
+        ``os.environ`` is not modified; the overlay is local to the current thread / ``asyncio`` task (via a
+        ``ContextVar``), and nested overlays only copy their (small) change-sets.
+        """
+        snapshot = self.snapshot().overlay(updates, **kwargs)
+        token = _current.set(snapshot)
+        try:
+            yield snapshot
+        finally:
+            _current.reset(token)
+
     @contextmanager
     def _patch(
         self,
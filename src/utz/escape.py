@@ -1,6 +1,53 @@
 import re
-from re import escape, finditer
-from typing import Sequence
+from functools import partial
+from re import escape
+from typing import IO, Iterable, Iterator, Sequence
+
+
+def _tokens(ch: str):
+    """Regex matching the tokens ``split`` cares about: escaped backslashes, escaped ``ch``s, bare ``ch``s, and
+    (invalid) lone backslashes."""
+    escaped_ch = escape(ch)
+    return re.compile(r'\\\\|\\%s|%s|\\' % (escaped_ch, escaped_ch))
+
+
+def _split(chunks: Iterable[str], ch: str, max: int = 0) -> Iterator[str]:
+    """Single-pass tokenizer underlying ``split`` / ``split_io``: append slices to a list of parts, join once per
+    group."""
+    rgx = _tokens(ch)
+    chunks = iter(chunks)
+    parts = []
+    n = 0
+    tail = ''
+    done = False
+    while not done:
+        chunk = next(chunks, None)
+        if chunk is None:
+            body, tail, done = tail, '', True
+        else:
+            buf = tail + chunk
+            # Hold back a trailing unpaired backslash; its meaning depends on the next chunk's first char
+            run = len(buf) - len(buf.rstrip('\\'))
+            body, tail = (buf[:-1], buf[-1:]) if run % 2 else (buf, '')
+        idx = 0
+        for m in rgx.finditer(body):
+            start, end = m.span()
+            parts.append(body[idx:start])
+            tok = m[0]
+            if tok == ch:
+                yield ''.join(parts)
+                parts = []
+                n += 1
+                if max == n:
+                    yield body[end:] + tail + ''.join(chunks)
+                    return
+            elif len(tok) == 2:
+                parts.append(tok[1])
+            else:
+                raise RuntimeError(f'Unexpected lone backslash at {start}: {body=}')
+            idx = end
+        parts.append(body[idx:])
+    yield ''.join(parts)
 
 
 def split(s: str, ch: str, max: int = 0):
@@ -11,37 +58,15 @@ def split(s: str, ch: str, max: int = 0):
     be appended to the returned list, containing the remainder of ``s`` (with no un-escaping
     performed).
     """
-    idx = 0
-    strs = []
-    n = 0
-    nxt = ''
-    escaped_ch = escape(ch)
-    rgx = r'(?:\\+%s?|%s)' % (escaped_ch, escaped_ch)
-    for m in finditer(rgx, s):
-        start, end = m.span()
-        nxt += s[idx:start]
-        idx = start
-        span = s[start:end]
-        while span.startswith(r'\\'):
-            nxt += '\\'
-            span = span[2:]
-            idx += 2
-        if span == '\\' + ch:
-            nxt += ch
-            idx += 2
-        elif span == ch:
-            strs.append(nxt)
-            nxt = ''
-            idx += 1
-            n += 1
-            if max == n:
-                break
-        elif span:
-            raise RuntimeError(f'Unexpected end to span {s[start:end]}: {span}; {s=}, {idx=}, {m=}')
-        assert idx == end
-    nxt += s[idx:]
-    strs.append(nxt)
-    return strs
+    if '\\' not in s:
+        return s.split(ch, max or -1)
+    return list(_split([s], ch, max))
+
+
+def split_io(f: IO[str], ch: str, max: int = 0, size: int = 2**16) -> Iterator[str]:
+    """Streaming ``split``: read ``f`` in ``size``-char chunks, yielding each un-escaped group as soon as it is
+    complete."""
+    return _split(iter(partial(f.read, size), ''), ch, max)
 
 
 def join(strs: Sequence[str], ch: str, max: int = 0):
@@ -55,12 +80,10 @@ def join(strs: Sequence[str], ch: str, max: int = 0):
     have been a raw group from a corresponding call to split(…, max=…), and is directly appended to
     the final string (skipping the escaping steps above).
     """
-    escaped_ch = escape(ch)
+    escaped_ch = '\\' + ch
 
     def esc(s):
-        s = re.sub(r'\\', r'\\\\', s)
-        s = re.sub(escaped_ch, '\\' + escaped_ch, s)
-        return s
+        return s.replace('\\', '\\\\').replace(ch, escaped_ch)
 
     if max and len(strs) > max:
         if len(strs) > max + 1:
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from inspect import getfullargspec
 from typing import Callable, Sequence
+from weakref import WeakKeyDictionary
 
 Deco = Callable[[Callable], Callable]
 
@@ -24,7 +25,8 @@ def decos(*args: Deco | Sequence[Deco]):
 
 def args(fn, kwargs):
     """Filter kwargs to match function signature."""
-    return { k: v for k, v in kwargs.items() if recvs(fn, k) }
+    names = kwarg_names(fn)
+    return { k: v for k, v in kwargs.items() if k in names }
 
 
 def call(fn, *_args, **kwargs):
@@ -34,11 +36,33 @@ def call(fn, *_args, **kwargs):
 
 def recvs(fn: Callable, k: str) -> bool:
     """True if ``fn`` takes a kwarg ``k``, or a var-kwargs and a wrapped descendant function does."""
-    spec = getfullargspec(fn)
-    if k in spec.args or k in spec.kwonlyargs:
-        return True
-    if spec.varkw:
+    return k in kwarg_names(fn)
+
+
+# fn → (kwarg names in its own signature, whether it takes var-kwargs)
+_kwarg_names: WeakKeyDictionary[Callable, tuple[frozenset[str], bool]] = WeakKeyDictionary()
+
+
+def kwarg_names(fn: Callable) -> frozenset[str]:
+    """Names of kwargs ``fn`` can receive (following ``__wrapped__`` chains through var-kwargs functions).
+
+    Each function's own signature is memoized (in a ``WeakKeyDictionary``, so entries don't outlive their functions);
+    callables that don't support weak references are introspected on every call. ``__wrapped__`` is re-read on each
+    call, so reassigning it takes effect.
+    """
+    try:
+        names, varkw = _kwarg_names[fn]
+    except KeyError:
+        names, varkw = _kwarg_names[fn] = _compute_kwarg_names(fn)
+    except TypeError:
+        names, varkw = _compute_kwarg_names(fn)
+    if varkw:
         wrapped = getattr(fn, '__wrapped__', None)
         if wrapped:
-            return recvs(wrapped, k)
-    return False
+            names |= kwarg_names(wrapped)
+    return names
+
+
+def _compute_kwarg_names(fn: Callable) -> tuple[frozenset[str], bool]:
+    spec = getfullargspec(fn)
+    return frozenset(spec.args) | frozenset(spec.kwonlyargs), bool(spec.varkw)
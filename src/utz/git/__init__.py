@@ -29,7 +29,7 @@ except ImportError:
     pass
 
 
-from . import branch, clone, diff, head, remote, status, submodule, tag
+from . import branch, cat_file, clone, diff, head, remote, status, submodule, tag
 from .ctx import txn
 from .head import fmt, sha
 from .log import msg
@@ -0,0 +1,202 @@
+"""Long-lived ``git cat-file --batch`` / ``--batch-check`` coprocesses, for resolving refs and reading objects without
+forking a ``git`` process per lookup.
+
+Sessions are pooled per repository root. Helpers like ``utz.git.log.sha`` / ``utz.git.log.msg`` route through the pool
+when it is enabled:
+
+```python
+from utz.git import cat_file
+with cat_file.enabled():
+    shas = [ git.log.sha(ref) for ref in refs ]  # no forks after the first lookup
+# or, in bulk:
+shas = cat_file.session().resolve_many(refs)
+```
+"""
+from __future__ import annotations
+
+import atexit
+from contextlib import contextmanager
+from subprocess import DEVNULL, PIPE, Popen
+from threading import Lock, Thread
+from typing import IO, Iterable
+
+from ..context import Yield
+from .repo import find_root
+
+
+class CatFile:
+    """``git cat-file`` coprocesses for one repository; the ``--batch-check`` (object info) and ``--batch`` (object
+    contents) processes are each started on first use.
+
+    Lookups accept any revision expression ``git cat-file`` does (refs, ``<rev>^{commit}``, ``<rev>:<path>``, etc.), and
+    return ``None`` for missing or ambiguous names. Thread-safe.
+    """
+    def __init__(self, cwd: str | None = None):
+        self.cwd = cwd
+        self._check: Popen | None = None
+        self._batch: Popen | None = None
+        self._lock = Lock()
+
+    def _start(self, mode: str) -> Popen:
+        return Popen(
+            ['git', 'cat-file', f'--{mode}'],
+            stdin=PIPE,
+            stdout=PIPE,
+            stderr=DEVNULL,
+            cwd=self.cwd,
+        )
+
+    @property
+    def check_proc(self) -> Popen:
+        if self._check is None or self._check.poll() is not None:
+            self._check = self._start('batch-check')
+        return self._check
+
+    @property
+    def batch_proc(self) -> Popen:
+        if self._batch is None or self._batch.poll() is not None:
+            self._batch = self._start('batch')
+        return self._batch
+
+    @staticmethod
+    def _query(ref: str) -> bytes:
+        if '\n' in ref:
+            raise ValueError(f"Invalid ref: {ref!r}")
+        return f'{ref}\n'.encode()
+
+    @staticmethod
+    def _parse_header(ln: bytes) -> tuple[str, str, int] | None:
+        """Parse a ``<sha> <type> <size>`` line (``None`` for ``<ref> missing`` / ``<ref> ambiguous``)."""
+        if not ln:
+            raise RuntimeError("`git cat-file` exited unexpectedly")
+        pieces = ln.decode().rstrip('\n').rsplit(' ', 2)
+        if len(pieces) != 3 or pieces[2] in ('missing', 'ambiguous'):
+            return None
+        sha, typ, size = pieces
+        return sha, typ, int(size)
+
+    def info(self, ref: str) -> tuple[str, str, int] | None:
+        """Return ``(sha, type, size)`` for ``ref``."""
+        return self.info_many([ ref ])[0]
+
+    def info_many(self, refs: Iterable[str]) -> list[tuple[str, str, int] | None]:
+        """Look up many refs in one pipelined exchange (queries are written from a separate thread, so neither pipe can
+        fill up and deadlock)."""
+        queries = [ self._query(ref) for ref in refs ]
+        if not queries:
+            return []
+        with self._lock:
+            proc = self.check_proc
+            stdin: IO[bytes] = proc.stdin
+            if len(queries) == 1:
+                stdin.write(queries[0])
+                stdin.flush()
+                return [ self._parse_header(proc.stdout.readline()) ]
+
+            def write():
+                stdin.write(b''.join(queries))
+                stdin.flush()
+
+            writer = Thread(target=write, daemon=True)
+            writer.start()
+            infos = [ self._parse_header(proc.stdout.readline()) for _ in queries ]
+            writer.join()
+            return infos
+
+    def resolve(self, ref: str) -> str | None:
+        """Resolve ``ref`` to a full SHA."""
+        info = self.info(ref)
+        return info[0] if info else None
+
+    def resolve_many(self, refs: Iterable[str]) -> list[str | None]:
+        """Resolve many refs to full SHAs (``None`` for unresolvable refs), in one round-trip."""
+        return [ info[0] if info else None for info in self.info_many(refs) ]
+
+    def read(self, ref: str) -> tuple[str, str, bytes] | None:
+        """Return ``(sha, type, contents)`` for ``ref``."""
+        query = self._query(ref)
+        with self._lock:
+            proc = self.batch_proc
+            proc.stdin.write(query)
+            proc.stdin.flush()
+            header = self._parse_header(proc.stdout.readline())
+            if header is None:
+                return None
+            sha, typ, size = header
+            contents = proc.stdout.read(size)
+            proc.stdout.read(1)  # trailing newline
+            return sha, typ, contents
+
+    def msg(self, ref: str = 'HEAD') -> str | None:
+        """Return the message of the commit ``ref`` points to (equivalent to ``git log -1 --format=%B``)."""
+        obj = self.read(f'{ref}^{{commit}}')
+        if obj is None:
+            return None
+        _, _, contents = obj
+        _, _, message = contents.partition(b'\n\n')
+        return message.decode()
+
+    def close(self):
+        with self._lock:
+            for proc in (self._check, self._batch):
+                if proc is not None and proc.poll() is None:
+                    proc.stdin.close()
+                    proc.wait()
+            self._check = self._batch = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+_sessions: dict[str, CatFile] = {}
+_sessions_lock = Lock()
+ENABLED = False
+
+
+def session(cwd: str | None = None) -> CatFile:
+    """Return the pooled ``CatFile`` session for the repository containing ``cwd`` (default: current directory)."""
+    root = find_root(cwd)
+    with _sessions_lock:
+        sess = _sessions.get(root)
+        if sess is None:
+            sess = _sessions[root] = CatFile(root)
+        return sess
+
+
+def close_all():
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for sess in sessions:
+        sess.close()
+
+
+atexit.register(close_all)
+
+
+def enable(on: bool = True):
+    """Route ``utz.git`` helpers (``log.sha``, ``log.msg``, …) through pooled ``cat-file`` sessions."""
+    global ENABLED
+    ENABLED = on
+
+
+@contextmanager
+def enabled(on: bool = True) -> Yield[None]:
+    """Temporarily ``enable`` (or disable) ``cat-file`` sessions."""
+    prev = ENABLED
+    enable(on)
+    try:
+        yield
+    finally:
+        enable(prev)
+
+
+def use(kwargs: dict) -> CatFile | None:
+    """Return a session to answer a helper call with, if sessions are enabled and ``kwargs`` (otherwise destined for
+    ``utz.proc``) only specify a ``cwd``."""
+    if not ENABLED or set(kwargs) - { 'cwd' }:
+        return None
+    return session(kwargs.get('cwd'))
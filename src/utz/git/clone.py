@@ -1,6 +1,10 @@
+from __future__ import annotations
+
 from contextlib import contextmanager
-from os.path import basename
-from re import match
+from hashlib import sha1
+from os import environ, makedirs
+from os.path import basename, exists, expanduser, join
+from re import match, sub
 from sys import stderr
 from traceback import print_exc
 from typing import Iterable
@@ -9,6 +13,32 @@ from utz import now, tmpdir
 from utz.proc import check, line, run
 
 
+def cache_dir() -> str:
+    """Default directory for ``mirror`` clones (under ``$XDG_CACHE_HOME``, default ``~/.cache``)."""
+    cache_home = environ.get('XDG_CACHE_HOME') or expanduser('~/.cache')
+    return join(cache_home, 'utz', 'git-mirrors')
+
+
+def mirror(url: str, dir: str | None = None, fetch: bool = True, **run_kwargs) -> str:
+    """Maintain a local, bare mirror of ``url`` (under ``dir``, default ``cache_dir()``), keyed by URL, and return its
+    path.
+
+    The mirror is created with ``git clone --mirror`` on first use, and refreshed incrementally (``git fetch --prune``)
+    on subsequent calls (if ``fetch``). Clones of ``url`` can then borrow its objects via ``--reference``, only fetching
+    what's new over the network.
+    """
+    dir = dir or cache_dir()
+    name = sub(r'[^\w.-]+', '_', basename(url.rstrip('/')))
+    path = join(dir, f'{sha1(url.encode()).hexdigest()[:12]}-{name}')
+    if exists(path):
+        if fetch:
+            run('git', 'fetch', '--prune', 'origin', **{ **run_kwargs, 'cwd': path })
+    else:
+        makedirs(dir, exist_ok=True)
+        run('git', 'clone', '--mirror', url, path, **run_kwargs)
+    return path
+
+
 @contextmanager
 def tmp(
         url,
@@ -22,6 +52,12 @@ def tmp(
         name=None,
         bare=False,
         dir=None,
+        depth: int | None = None,
+        filter: str | None = None,
+        reference: str | None = None,
+        dissociate: bool = False,
+        sparse: Iterable[str] | None = None,
+        cache: bool | str = False,
         **run_kwargs,
 ):
     """contextmanager for creating a Git repo in a temporary directory, and optionally cd'ing into it and upstreaming
@@ -40,24 +76,53 @@ def tmp(
     - `cd` (bool): move into the temporary clone dir before `yield`ing
     - `name`: basename for the temporary clone directory (defaults to basename of `url`)
     - `bare`: clone a bare repository
+    - `depth` (int): shallow clone, truncating history to this many commits (note: ignored by `git clone` for plain local
+        paths; use `file://` URLs)
+    - `filter` (str): partial clone, e.g. `'blob:none'` (blobs are fetched lazily, on checkout)
+    - `reference` (str): borrow objects from this local repository (`git clone --reference`)
+    - `dissociate` (bool): copy borrowed objects into the clone (`--dissociate`), so it doesn't depend on `reference`
+    - `sparse` (list[str]): directories to populate in a sparse checkout (`git clone --sparse`, then
+        `git sparse-checkout set`)
+    - `cache` (bool | str): maintain a local mirror of `url` (in this dir, if `str`, else `cache_dir()`), refreshed
+        with `git fetch`, and clone with `--reference` to it (cf. `mirror`)
     """
     import utz
     from utz import git
     name = name or basename(url)
     if name.endswith('.git'):
         name = name[:-len('.git')]
+    if sparse is not None:
+        if bare:
+            raise ValueError("`sparse` requires a non-`bare` clone")
+        sparse = list(sparse)
+    if cache:
+        if reference:
+            raise ValueError("Pass at most one of `cache`, `reference`")
+        reference = mirror(url, dir=cache if isinstance(cache, str) else None, **run_kwargs)
     with tmpdir(name, dir=dir) as repo_dir:
         cmd = ['git', 'clone']
         if submodules:
             cmd += ['--recurse-submodules']
         if bare:
             cmd += ['--bare']
+        if depth:
+            cmd += ['--depth', str(depth)]
+        if filter:
+            cmd += [f'--filter={filter}']
+        if reference:
+            cmd += ['--reference', reference]
+            if dissociate:
+                cmd += ['--dissociate']
+        if sparse is not None:
+            cmd += ['--sparse']
         if branch and not ref:
             # branch must already exist and we want to clone and work on it
             cmd += ['-b', branch]
         cmd += clone_args
         cmd += [url, repo_dir, ]
         run(*cmd, **run_kwargs)
+        if sparse:
+            run('git', 'sparse-checkout', 'set', *sparse, **{ **run_kwargs, 'cwd': repo_dir })
         if ref:
             with utz.cd(repo_dir):
                 if ref is True:
@@ -1,10 +1,140 @@
-from ..proc import lines
+"""Cheap checks for uncommitted changes, suitable for large worktrees.
 
+Rather than listing every change (``git status --porcelain``), each kind of change is checked with a command that exits
+as soon as it finds one:
+- staged (index vs. ``HEAD``): ``git diff-index --cached --quiet``
+- unstaged (worktree vs. index, tracked files only): ``git diff-files --quiet``, with stat-only hits confirmed by
+  ``git diff --quiet`` (which compares contents)
+- untracked: ``git ls-files --others --exclude-standard``, killed after its first line of output
+"""
+from __future__ import annotations
 
-def exists(untracked=True, unstaged=True):
-    lns = lines('git', 'status', '--porcelain')
-    if not untracked:
-        lns = [ ln for ln in lns if not ln.startswith('??') ]
-    if not unstaged:
-        lns = [ ln for ln in lns if not ln.startswith(' ') ]
-    return bool(lns)
+from os import stat
+from os.path import join
+from subprocess import DEVNULL, PIPE, Popen, run
+from time import monotonic
+from typing import Callable
+
+from ..proc import run as _run
+from .repo import find_root, git_dir
+
+# `git hash-object -t tree /dev/null`
+EMPTY_TREE = '4b825dc642cb6eb9a060e54bf8d69288fbee4904'
+
+
+def _quiet(*args: str, cwd: str | None = None) -> bool:
+    """Run a ``--quiet`` git diff command, returning ``True`` iff it found differences (exit code 1)."""
+    p = run(['git', *args], stdout=DEVNULL, stderr=DEVNULL, cwd=cwd)
+    if p.returncode not in (0, 1):
+        raise RuntimeError(f"`git {' '.join(args)}` failed ({p.returncode})")
+    return p.returncode == 1
+
+
+def has_staged(cwd: str | None = None) -> bool:
+    """True iff the index differs from ``HEAD`` (or, in a repo with no commits, is non-empty)."""
+    p = run(['git', 'diff-index', '--cached', '--quiet', 'HEAD', '--'], stdout=DEVNULL, stderr=DEVNULL, cwd=cwd)
+    if p.returncode == 128:
+        # No `HEAD` yet; compare to the empty tree
+        return _quiet('diff-index', '--cached', '--quiet', EMPTY_TREE, '--', cwd=cwd)
+    elif p.returncode not in (0, 1):
+        raise RuntimeError(f"`git diff-index` failed ({p.returncode})")
+    return p.returncode == 1
+
+
+def has_unstaged(cwd: str | None = None, refresh: bool = False) -> bool:
+    """True iff any tracked file in the worktree differs from the index.
+
+    ``diff-files`` only compares stat info, so files whose stat changed but whose content didn't (e.g. ``touch``ed) look
+    modified to it; such hits are confirmed with ``git diff --quiet``, which refreshes stat info in memory and compares
+    contents. ``refresh=True`` instead refreshes the index itself first (``git update-index -q --refresh``), which
+    writes ``.git/index`` (taking ``index.lock``), but makes later checks cheap.
+    """
+    if refresh:
+        # Exits 1 when files need updating (i.e. have content changes), which `diff-files` then reports
+        run(['git', 'update-index', '-q', '--refresh'], stdout=DEVNULL, stderr=DEVNULL, cwd=cwd)
+        return _quiet('diff-files', '--quiet', cwd=cwd)
+    return _quiet('diff-files', '--quiet', cwd=cwd) and _quiet('diff', '--quiet', cwd=cwd)
+
+
+def has_untracked(cwd: str | None = None) -> bool:
+    """True iff there are any untracked, non-ignored files; stops ``git ls-files`` after the first one."""
+    p = Popen(
+        ['git', 'ls-files', '--others', '--exclude-standard', '--directory', '--no-empty-directory'],
+        stdout=PIPE,
+        stderr=DEVNULL,
+        cwd=cwd,
+    )
+    try:
+        return bool(p.stdout.readline())
+    finally:
+        if p.poll() is None:
+            p.kill()
+        p.wait()
+        p.stdout.close()
+
+
+# (repo root, check name) → (time, index mtime, result)
+_cache: dict[tuple, tuple[float, int | None, bool]] = {}
+
+
+def index_mtime(cwd: str | None = None) -> int | None:
+    gitdir = git_dir(cwd)
+    if not gitdir:
+        return None
+    try:
+        return stat(join(gitdir, 'index')).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def cached(key: tuple, fn: Callable[[], bool], ttl: float | None, cwd: str | None = None) -> bool:
+    """Memoize ``fn()`` for ``ttl`` seconds, per repo and ``key``, invalidated early if the index file changes.
+
+    Note that worktree edits don't touch the index, so results for unstaged/untracked changes can be up to ``ttl``
+    seconds stale.
+    """
+    if not ttl:
+        return fn()
+    key = (find_root(cwd), *key)
+    now = monotonic()
+    hit = _cache.get(key)
+    if hit and now - hit[0] < ttl and hit[1] == index_mtime(cwd):
+        return hit[2]
+    result = fn()
+    # Read after `fn`, which may itself rewrite the index (cf. `has_unstaged(refresh=True)`)
+    _cache[key] = (now, index_mtime(cwd), result)
+    return result
+
+
+def exists(
+    untracked=True,
+    unstaged=True,
+    cwd: str | None = None,
+    ttl: float | None = None,
+    refresh: bool = False,
+):
+    """True iff there are uncommitted changes: staged changes, plus (optionally) unstaged changes to tracked files and
+    untracked files.
+
+    Checks run cheapest-first, and stop at the first kind of change found. Pass ``ttl`` (seconds) to reuse results from
+    recent calls (cf. ``cached``), and ``refresh`` to write refreshed stat info to the index before checking for unstaged
+    changes (cf. ``has_unstaged``).
+    """
+    def check():
+        return (
+            has_staged(cwd) or
+            (unstaged and has_unstaged(cwd, refresh=refresh)) or
+            (untracked and has_untracked(cwd))
+        )
+
+    return cached(('exists', bool(untracked), bool(unstaged), bool(refresh)), check, ttl, cwd)
+
+
+def enable_caches(untracked_cache: bool = True, fsmonitor: bool = False, cwd: str | None = None):
+    """Enable Git's untracked-file cache (``core.untrackedCache``) and/or builtin filesystem monitor
+    (``core.fsmonitor``; macOS/Windows only), which speed up untracked/unstaged checks in large worktrees."""
+    if untracked_cache:
+        _run('git', 'config', 'core.untrackedCache', 'true', cwd=cwd)
+        _run('git', 'update-index', '--untracked-cache', cwd=cwd)
+    if fsmonitor:
+        _run('git', 'config', 'core.fsmonitor', 'true', cwd=cwd)
@@ -4,11 +4,11 @@ from __future__ import annotations
 import re
 import shutil
 import tempfile
-from os import chdir
 from pathlib import Path
 from urllib.parse import quote
 
 from utz import proc, err
+from utz.git.tree import write_tree
 
 
 def get_github_user() -> str | None:
@@ -21,17 +21,11 @@ def get_github_user() -> str | None:
 
 def get_gist_remote_name(gist_id: str) -> str:
     """Find the remote name for a gist repository."""
+    from utz.git.remote import urls
     try:
-        remotes = proc.lines('git', 'remote', log=False)
-        for remote in remotes:
-            if not remote:
-                continue
-            try:
-                url = proc.line('git', 'remote', 'get-url', remote, err_ok=True, log=False)
-                if url and (f'gist.github.com:{gist_id}' in url or f'gist.github.com/{gist_id}' in url):
-                    return remote
-            except Exception:
-                continue
+        for remote, url in urls().items():
+            if f'gist.github.com:{gist_id}' in url or f'gist.github.com/{gist_id}' in url:
+                return remote
     except Exception:
         pass
     return 'origin'
@@ -99,150 +93,90 @@ def upload_files_to_gist(
 
     results = []
 
+    if not commit_msg:
+        commit_msg = 'Add assets'
+
+    def commit_files(parent_ref: str | None, cwd: str | None = None) -> str:
+        """Write blobs straight from the source paths, build the (possibly nested) tree on top of ``parent_ref``'s, and
+        commit it; a constant number of ``git`` invocations, regardless of the number of files."""
+        tree_hash = write_tree(
+            [ (source_path, safe_name) for source_path, _, safe_name in file_mapping ],
+            base=parent_ref,
+            cwd=cwd,
+        )
+        commit_cmd = ['git', 'commit-tree', tree_hash, '-m', commit_msg]
+        if parent_ref:
+            commit_cmd.extend(['-p', parent_ref])
+        commit_hash = proc.line(*commit_cmd, cwd=cwd, log=False)
+        if verbose:
+            for _, orig_name, _ in file_mapping:
+                err(f"Added {orig_name}")
+        return commit_hash
+
     if is_local_clone:
         # We're already in the gist repo
-        temp_dir = tempfile.mkdtemp(prefix='assets_')
-
         if not remote_name:
             remote_name = get_gist_remote_name(gist_id)
             if verbose:
                 err(f"Using remote '{remote_name}'")
 
+        # Check if branch exists on remote
         try:
-            # Copy files to temp directory
-            temp_files = []
-            for source_path, orig_name, safe_name in file_mapping:
-                temp_path = Path(temp_dir) / safe_name
-                shutil.copy2(source_path, temp_path)
-                temp_files.append((orig_name, safe_name, temp_path))
-                if verbose:
-                    err(f"Staged {orig_name}")
+            output = proc.text('git', 'ls-remote', '--heads', remote_name, branch, err_ok=True, log=False)
+            branch_exists = bool(output.strip() if output else False)
+        except Exception:
+            branch_exists = False
 
-            # Check if branch exists on remote
-            try:
-                output = proc.text('git', 'ls-remote', '--heads', remote_name, branch, err_ok=True, log=False)
-                branch_exists = bool(output.strip() if output else False)
-            except Exception:
-                branch_exists = False
-
-            if branch_exists:
-                proc.run('git', 'fetch', remote_name, f'{branch}:{branch}', log=False)
-                if verbose:
-                    err(f"Fetched existing branch '{branch}'")
-                parent_ref = branch
-            else:
-                if verbose:
-                    err(f"Creating new branch '{branch}'")
-                parent_ref = None
-
-            # Build tree with all files
-            tree_entries = []
-
-            # Get existing tree if we have a parent
-            if parent_ref:
-                try:
-                    existing_tree = proc.text('git', 'ls-tree', parent_ref, err_ok=True, log=False)
-                    if existing_tree:
-                        new_files = {safe_name for _, safe_name, _ in temp_files}
-                        for line in existing_tree.strip().split('\n'):
-                            if line:
-                                parts = line.split('\t', 1)
-                                if len(parts) == 2:
-                                    filename = parts[1]
-                                    if filename not in new_files:
-                                        tree_entries.append(line)
-                except Exception:
-                    pass
-
-            # Add new/updated files
-            for orig_name, safe_name, temp_path in temp_files:
-                blob_hash = proc.line('git', 'hash-object', '-w', str(temp_path), log=False)
-                tree_entries.append(f'100644 blob {blob_hash}\t{safe_name}')
-
-            # Create tree - use proc.line with input parameter
-            tree_input = '\n'.join(tree_entries) + '\n'
-            tree_hash = proc.line('git', 'mktree', input=tree_input.encode(), log=False)
-
-            # Create commit
-            if not commit_msg:
-                commit_msg = 'Add assets'
-            commit_cmd = ['git', 'commit-tree', tree_hash, '-m', commit_msg]
-            if parent_ref:
-                commit_cmd.extend(['-p', parent_ref])
-            commit_hash = proc.line(*commit_cmd, log=False)
-
-            # Update branch ref
-            proc.run('git', 'update-ref', f'refs/heads/{branch}', commit_hash, log=False)
-
-            # Push the branch
-            proc.run('git', 'push', remote_name, f'{branch}:{branch}', log=False)
+        if branch_exists:
+            proc.run('git', 'fetch', remote_name, f'{branch}:{branch}', log=False)
             if verbose:
-                err(f"Pushed to branch '{branch}'")
+                err(f"Fetched existing branch '{branch}'")
+            parent_ref = branch
+        else:
+            if verbose:
+                err(f"Creating new branch '{branch}'")
+            parent_ref = None
 
-            # Build results with commit SHA
-            for orig_name, safe_name, _ in temp_files:
-                encoded_name = quote(safe_name)
-                url = f"https://gist.githubusercontent.com/{user}/{gist_id}/raw/{commit_hash}/{encoded_name}"
-                results.append((orig_name, safe_name, url))
-                if verbose:
-                    err(f"Uploaded: {url}")
+        commit_hash = commit_files(parent_ref)
 
-        finally:
-            shutil.rmtree(temp_dir, ignore_errors=True)
+        # Update branch ref
+        proc.run('git', 'update-ref', f'refs/heads/{branch}', commit_hash, log=False)
+
+        # Push the branch
+        proc.run('git', 'push', remote_name, f'{branch}:{branch}', log=False)
+        if verbose:
+            err(f"Pushed to branch '{branch}'")
 
     else:
-        # Need to clone the gist
+        # Need to clone the gist; a bare clone suffices, since the new commit is built without a worktree
         temp_dir = tempfile.mkdtemp(prefix='gist_')
-        original_dir = Path.cwd()
-
         try:
             gist_url = f"git@gist.github.com:{gist_id}.git"
-            proc.run('git', 'clone', gist_url, temp_dir, log=False)
-            chdir(temp_dir)
+            proc.run('git', 'clone', '--bare', gist_url, temp_dir, log=False)
 
-            # Create or switch to branch
-            try:
-                proc.run('git', 'checkout', '-b', branch, log=False)
-                if verbose:
-                    err(f"Created branch '{branch}'")
-            except Exception:
-                try:
-                    proc.run('git', 'checkout', branch, log=False)
-                    if verbose:
-                        err(f"Using existing branch '{branch}'")
-                except Exception:
-                    if verbose:
-                        err(f"Warning: Could not checkout branch '{branch}', using main")
-                    branch = 'main'
-
-            # Copy and add files
-            for source_path, orig_name, safe_name in file_mapping:
-                shutil.copy2(source_path, safe_name)
-                proc.run('git', 'add', safe_name, log=False)
+            # Build on the existing branch, or create it from the default branch
+            if proc.check('git', 'rev-parse', '--verify', '--quiet', f'refs/heads/{branch}', cwd=temp_dir, log=False):
+                parent_ref = branch
                 if verbose:
-                    err(f"Added {orig_name}")
-
-            # Commit and push
-            if not commit_msg:
-                commit_msg = 'Add assets'
-            proc.run('git', 'commit', '-m', commit_msg, log=False)
-            proc.run('git', 'push', 'origin', branch, log=False)
-
-            # Get the commit hash for the URL
-            commit_hash = proc.line('git', 'rev-parse', 'HEAD', log=False)
-
-            # Build results with commit SHA
-            for _, orig_name, safe_name in file_mapping:
-                encoded_name = quote(safe_name)
-                url = f"https://gist.githubusercontent.com/{user}/{gist_id}/raw/{commit_hash}/{encoded_name}"
-                results.append((orig_name, safe_name, url))
+                    err(f"Using existing branch '{branch}'")
+            else:
+                parent_ref = 'HEAD'
                 if verbose:
-                    err(f"Uploaded: {url}")
+                    err(f"Created branch '{branch}'")
 
+            commit_hash = commit_files(parent_ref, cwd=temp_dir)
+            proc.run('git', 'push', 'origin', f'{commit_hash}:refs/heads/{branch}', cwd=temp_dir, log=False)
         finally:
-            chdir(original_dir)
             shutil.rmtree(temp_dir, ignore_errors=True)
 
+    # Build results with commit SHA
+    for _, orig_name, safe_name in file_mapping:
+        encoded_name = quote(safe_name)
+        url = f"https://gist.githubusercontent.com/{user}/{gist_id}/raw/{commit_hash}/{encoded_name}"
+        results.append((orig_name, safe_name, url))
+        if verbose:
+            err(f"Uploaded: {url}")
+
     return results
 
 
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import json
 import re
 from functools import wraps
-from os import environ
+from os import environ, getpid, makedirs, replace, stat
+from os.path import dirname, expanduser, join
 from typing import Literal
 
 import utz
@@ -37,22 +39,67 @@ def get_remotes():
     """
     from . import remote
     remotes = {}
-    for name in remote.ls():
+    for name, url in remote.urls().items():
+        name_with_owner = parse_url(url, err='none')
+        if name_with_owner:
+            remotes[name] = name_with_owner
+    return remotes
+
+
+def cache_path() -> str:
+    """On-disk cache of ``gh repo view`` results (under ``$XDG_CACHE_HOME``, default ``~/.cache``)."""
+    cache_home = environ.get('XDG_CACHE_HOME') or expanduser('~/.cache')
+    return join(cache_home, 'utz', 'gh-repo-view.json')
+
+
+def repo_name_with_owner(cache: bool = True, log=False) -> str:
+    """Return the current repository's ``nameWithOwner``, per ``gh repo view``.
+
+    Results are cached on disk, keyed by repository root, and invalidated when the repo's Git ``config`` changes
+    (e.g. remotes are edited, or ``gh repo set-default`` is run).
+    """
+    from .repo import common_dir, find_root
+    key = mtime = None
+    if cache:
+        gitdir = common_dir()
+        if gitdir:
+            key = find_root()
+            try:
+                mtime = stat(join(gitdir, 'config')).st_mtime_ns
+            except FileNotFoundError:
+                pass
+    path = cache_path()
+    entries = {}
+    if mtime is not None:
         try:
-            url = remote.url(name)
-            name_with_owner = parse_url(url, err='none')
-            if name_with_owner:
-                remotes[name] = name_with_owner
-        except Exception:
+            with open(path) as f:
+                entries = json.load(f)
+        except (FileNotFoundError, ValueError):
             pass
-    return remotes
+        entry = entries.get(key)
+        if entry and entry.get('mtime') == mtime:
+            return entry['nameWithOwner']
+
+    name_with_owner = proc.json('gh', 'repo', 'view', '--json', 'nameWithOwner', log=log)['nameWithOwner']
+    if mtime is not None:
+        entries[key] = dict(mtime=mtime, nameWithOwner=name_with_owner)
+        makedirs(dirname(path), exist_ok=True)
+        tmp = f'{path}.{getpid()}.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(entries, f, indent=2)
+        replace(tmp, path)
+    return name_with_owner
 
 
 def repository_option(
     *flag_args,
     env=GITHUB_REPOSITORY,
-    help='Repository name (with owner, e.g. "owner/repo"), defaults to $GITHUB_REPOSITORY then `gh repo view --json nameWithOwner`', **flag_kwargs,
+    help='Repository name (with owner, e.g. "owner/repo"), defaults to $GITHUB_REPOSITORY then `gh repo view --json nameWithOwner`',
+    cache: bool = True,
+    **flag_kwargs,
 ):
+    """``click.option`` for a GitHub repository, falling back to ``$GITHUB_REPOSITORY`` then (cached, cf.
+    ``repo_name_with_owner``) ``gh repo view``."""
     if not flag_args:
         flag_args = ('-R', '--repository')
 
@@ -66,7 +113,7 @@ def repository_option(
                 repository = environ.get(env)
                 if not repository:
                     verbose = kwargs.get('verbose', 0)
-                    repository = proc.json('gh', 'repo', 'view', '--json', 'nameWithOwner', log=None if verbose else False)['nameWithOwner']
+                    repository = repo_name_with_owner(cache=cache, log=None if verbose else False)
             return fn(*args, repository=repository, **kwargs)
 
         return _fn
@@ -1,4 +1,5 @@
 from ..proc import line
+from . import log
 
 
 def sha(*args,**kwargs):
@@ -6,6 +7,9 @@ def sha(*args,**kwargs):
 
 
 def fmt(fmt, *args, **kwargs):
+    if fmt == '%H' and len(args) <= 1:
+        # Full SHAs can be answered by a pooled `git cat-file` session, if enabled (cf. `utz.git.cat_file`)
+        return log.fmt(*args, fmt=fmt, **kwargs)
     return line('git','log','-n1',f'--format={fmt}',*args,**kwargs)
 
 
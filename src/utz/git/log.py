@@ -1,12 +1,28 @@
+from __future__ import annotations
+
+from codecs import getincrementaldecoder
+from subprocess import CalledProcessError, PIPE, Popen
+from typing import Iterator, NamedTuple, Sequence
 
 from ..proc import line, output
+from . import cat_file
 
 
 def msg(ref=None):
+    if sess := cat_file.use({}):
+        m = sess.msg(ref or 'HEAD')
+        if m is not None:
+            return m.strip()
     return output('git','log','-n1','--format=%B',ref).decode().strip()
 
 
 def fmt(*refs: str, fmt: str = '%h', **kwargs) -> str:
+    if fmt == '%H' and len(refs) <= 1 and (sess := cat_file.use(kwargs)):
+        ref = refs[0] if refs else 'HEAD'
+        if not ref.startswith('-'):
+            sha = sess.resolve(f'{ref}^{{commit}}')
+            if sha:
+                return sha
     return line('git', 'log', '-1', f'--format={fmt}', *refs, **kwargs)
 
 
@@ -16,3 +32,135 @@ def sha(ref: str, **kwargs) -> str:
 
 def short_sha(ref: str, **kwargs) -> str:
     return fmt(ref, fmt='%h', **kwargs)
+
+
+# ## Streaming `git log` parser
+
+# Commit field name → `git log --format` placeholder
+FIELDS = {
+    'sha': '%H',
+    'short_sha': '%h',
+    'tree': '%T',
+    'parents': '%P',
+    'author_name': '%an',
+    'author_email': '%ae',
+    'author_date': '%at',
+    'committer_name': '%cn',
+    'committer_email': '%ce',
+    'commit_date': '%ct',
+    'refs': '%D',
+    'subject': '%s',
+    'body': '%b',
+    'message': '%B',
+}
+# Fields parsed from Unix timestamps to `int`s
+INT_FIELDS = { 'author_date', 'commit_date' }
+RS = '\x1e'
+
+
+class FileStat(NamedTuple):
+    """One ``--numstat`` entry; ``added``/``deleted`` are ``None`` for binary files, ``src`` is set for renames."""
+    added: int | None
+    deleted: int | None
+    path: str
+    src: str | None = None
+
+
+class Commit:
+    """Commit record yielded by ``commits``; fields that weren't requested are ``None``."""
+    __slots__ = (*FIELDS, 'numstat')
+
+    def __init__(self, **kwargs):
+        for k in self.__slots__:
+            setattr(self, k, kwargs.get(k))
+
+    def __eq__(self, other):
+        return isinstance(other, Commit) and all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    def __repr__(self):
+        fields = ', '.join(f'{k}={getattr(self, k)!r}' for k in self.__slots__ if getattr(self, k) is not None)
+        return f'Commit({fields})'
+
+
+def _parse_numstat(rest: str) -> list[FileStat]:
+    toks = iter(rest.lstrip('\n').split('\0'))
+    stats = []
+    for tok in toks:
+        if not tok:
+            continue
+        added, deleted, path = tok.split('\t', 2)
+        src = None
+        if not path:
+            # Rename/copy: `<added>\t<deleted>\t\0<src>\0<dst>\0`
+            src, path = next(toks), next(toks)
+        stats.append(FileStat(
+            None if added == '-' else int(added),
+            None if deleted == '-' else int(deleted),
+            path,
+            src,
+        ))
+    return stats
+
+
+def _parse_record(rec: str, fields: Sequence[str], numstat: bool) -> Commit:
+    *vals, rest = rec.split('\0', len(fields))
+    kwargs = {}
+    for k, v in zip(fields, vals):
+        if k in INT_FIELDS:
+            v = int(v)
+        elif k == 'parents':
+            v = tuple(v.split())
+        kwargs[k] = v
+    if numstat:
+        kwargs['numstat'] = _parse_numstat(rest)
+    return Commit(**kwargs)
+
+
+def commits(
+    revs: str | Sequence[str] | None = None,
+    fields: Sequence[str] = ('sha', 'subject'),
+    numstat: bool = False,
+    args: Sequence[str] = (),
+    cwd: str | None = None,
+    chunk_size: int = 2**16,
+) -> Iterator[Commit]:
+    """Stream ``Commit`` records from one ``git log`` process.
+
+    ``revs`` is a revision range (e.g. ``'v1.0..main'``) or list of revisions (default: ``HEAD``); ``fields`` are keys
+    of ``FIELDS``. Output is read in ``chunk_size`` pieces and parsed incrementally, so memory use is bounded by the
+    largest single commit record, regardless of history length. ``numstat=True`` populates ``Commit.numstat`` with
+    ``FileStat``s.
+    """
+    unknown = [ k for k in fields if k not in FIELDS ]
+    if unknown:
+        raise ValueError(f"Unrecognized fields: {unknown}")
+    fields = list(fields)
+    fmt = RS + '%x00'.join(FIELDS[k] for k in fields)
+    if isinstance(revs, str):
+        revs = [ revs ]
+    cmd = [ 'git', 'log', '-z', f'--format={fmt}', *args ]
+    if numstat:
+        cmd.append('--numstat')
+    cmd += [ *(revs or []), '--' ]
+    p = Popen(cmd, stdout=PIPE, cwd=cwd)
+    decoder = getincrementaldecoder('utf-8')(errors='replace')
+    buf = ''
+    try:
+        while True:
+            chunk = p.stdout.read(chunk_size)
+            buf += decoder.decode(chunk, final=not chunk)
+            *recs, buf = buf.split(RS)
+            for rec in recs:
+                if rec:
+                    yield _parse_record(rec, fields, numstat)
+            if not chunk:
+                break
+        if buf:
+            yield _parse_record(buf, fields, numstat)
+        if p.wait():
+            raise CalledProcessError(p.returncode, cmd)
+    finally:
+        if p.poll() is None:
+            p.kill()
+            p.wait()
+        p.stdout.close()
@@ -1,66 +1,205 @@
-import re
-from re import match
+from bisect import bisect_left
+from os import stat
+from os.path import join
 from subprocess import CalledProcessError
+from time import monotonic
 
 from utz import proc
 
 from ..proc import *
+from .repo import common_dir
 
 
 def ls(): return lines('git', 'remote')
 
 
-LS_REMOTE_LINE_REGEX = r'(?P<sha>[0-9a-f]{40})\s+(?:refs/(?P<type>[^/]+)/(?P<name>.*)|(?P<head>HEAD))'
+# Repo config path → (config mtime, {remote name: URL})
+_urls_cache = {}
 
 
-def parse_ls_remote_lines(lns, head=None, tag=None, sha=None, heads=False, tags=False):
-    d = {}
+def urls(cwd=None):
+    """Map remote names to (fetch) URLs, from one ``git config --get-regexp`` call.
+
+    As with ``git remote get-url``, ``url.<base>.insteadOf`` rewriting is applied (the longest matching prefix wins);
+    ``pushInsteadOf`` only affects push URLs, so is ignored.
+
+    Memoized per repository, and invalidated when the repo's ``config`` file's mtime changes (changes to ``insteadOf``
+    rules in global config are only picked up then).
+    """
+    gitdir = common_dir(cwd)
+    config = join(gitdir, 'config') if gitdir else None
+    try:
+        mtime = stat(config).st_mtime_ns if config else None
+    except FileNotFoundError:
+        mtime = None
+    if mtime is not None:
+        cached = _urls_cache.get(config)
+        if cached and cached[0] == mtime:
+            return dict(cached[1])
+
+    lns = lines(
+        'git', 'config', '--get-regexp', r'^(remote\..*\.url|url\..*\.insteadof)$',
+        cwd=cwd, err_ok=None, log=None,
+    ) or []
+    remotes = {}
+    # URL prefix → replacement base
+    instead_of = {}
     for ln in lns:
-        m = match(LS_REMOTE_LINE_REGEX, ln)
-        typ = m['type']
-        if typ:
-            name = m['name']
-            if typ not in d:
-                d[typ] = {}
-            if not sha or m['sha'].startswith(sha):
-                d[typ][name] = m['sha']
-        elif m['head']:
-            if not sha or m['sha'].startswith(sha):
-                d['head'] = m['sha']
+        key, _, val = ln.partition(' ')
+        if key.startswith('url.'):
+            instead_of.setdefault(val, key[len('url.'):-len('.insteadof')])
         else:
-            raise ValueError(f'Unexpected `git ls-remote` line: {ln}')
-
-    if head:
-        return d.get('heads', {}).get(head)
-    if tag:
-        return d.get('tags', {}).get(tag)
-    if sha:
-        r = {}
-        for k, v in d.items():
-            if k == 'head':
-                if v.startswith(sha):
-                    r[k] = v
+            name = key[len('remote.'):-len('.url')]
+            # `git remote get-url` returns a remote's first URL
+            remotes.setdefault(name, val)
+    if instead_of:
+        prefixes = sorted(instead_of, key=len, reverse=True)
+        for name, url in remotes.items():
+            for prefix in prefixes:
+                if url.startswith(prefix):
+                    remotes[name] = instead_of[prefix] + url[len(prefix):]
+                    break
+    if mtime is not None:
+        _urls_cache[config] = (mtime, remotes)
+    return dict(remotes)
+
+
+# Matches one line of `git ls-remote` output (`Refs` parses lines without it; kept for importers)
+LS_REMOTE_LINE_REGEX = r'(?P<sha>[0-9a-f]{40})\s+(?:refs/(?P<type>[^/]+)/(?P<name>.*)|(?P<head>HEAD))'
+
+
+class Refs:
+    """Snapshot of a remote's refs (parsed ``git ls-remote`` output), answering ``head``/``tag``/``sha``-prefix queries
+    in memory.
+
+    ``refs`` maps ref types (``"heads"``, ``"tags"``, ``"pull"``, …) to ``{name: sha}``, and ``head`` is the remote's
+    ``HEAD`` (if listed). SHA-prefix lookups bisect a sorted index of all SHAs.
+    """
+    def __init__(self, lns):
+        self.head = None
+        self.refs = {}
+        index = []
+        for ln in lns:
+            pieces = ln.split(None, 1)
+            if len(pieces) != 2 or len(pieces[0]) != 40:
+                raise ValueError(f'Unexpected `git ls-remote` line: {ln}')
+            sha, ref = pieces
+            if ref == 'HEAD':
+                self.head = sha
+                index.append((sha, 'head', None))
+            elif ref.startswith('refs/') and '/' in ref[5:]:
+                typ, name = ref[5:].split('/', 1)
+                self.refs.setdefault(typ, {})[name] = sha
+                index.append((sha, typ, name))
             else:
-                typ = { name: id for name, id in v.items() if id.startswith(sha) }
-                if typ:
-                    r[k] = typ
-        d = r
-    if heads or tags:
+                raise ValueError(f'Unexpected `git ls-remote` line: {ln}')
+        index.sort()
+        self.shas = [ sha for sha, _, _ in index ]
+        self.owners = [ (typ, name) for _, typ, name in index ]
+
+    @property
+    def heads(self):
+        return self.refs.get('heads')
+
+    @property
+    def tags(self):
+        return self.refs.get('tags')
+
+    def find(self, prefix):
+        """Refs pointing at SHAs starting with ``prefix``, as ``(type, name)`` pairs (``("head", None)`` for ``HEAD``)."""
+        idx = bisect_left(self.shas, prefix)
+        found = []
+        while idx < len(self.shas) and self.shas[idx].startswith(prefix):
+            found.append(self.owners[idx])
+            idx += 1
+        return found
+
+    def dict(self):
+        d = {}
+        if self.head:
+            d['head'] = self.head
+        d.update({ typ: dict(refs) for typ, refs in self.refs.items() })
+        return d
+
+    def query(self, head=None, tag=None, sha=None, heads=False, tags=False):
+        """Answer an ``ls_remote`` query; see ``parse_ls_remote_lines``."""
+        if head or tag:
+            id = self.refs.get('heads' if head else 'tags', {}).get(head or tag)
+            return id if id and (not sha or id.startswith(sha)) else None
+
+        if sha:
+            d = {}
+            for typ, name in self.find(sha):
+                if typ == 'head':
+                    d['head'] = self.head
+                else:
+                    d.setdefault(typ, {})[name] = self.refs[typ][name]
+        else:
+            d = self.dict()
+
         if heads and tags: return { 'heads': d.get('heads'), 'tags': d.get('tags') }
         elif heads: return d.get('heads')
         elif tags: return d.get('tags')
-        else: raise
+        return d
+
+
+def parse_ls_remote_lines(lns, head=None, tag=None, sha=None, heads=False, tags=False):
+    """Parse ``git ls-remote`` output lines.
+
+    Returns the SHA of branch ``head`` or tag ``tag``, if either is passed; otherwise a ``{"head": sha, "heads": {…},
+    "tags": {…}}`` dict, restricted to refs whose SHAs start with ``sha`` (if passed), and to its ``heads`` and/or
+    ``tags`` (if passed).
+    """
+    return Refs(lns).query(head=head, tag=tag, sha=sha, heads=heads, tags=tags)
+
 
-    return d
+# (remote URL, extra args) → (fetch time, Refs)
+_refs_cache = {}
 
 
-def ls_remote(remote, *args, head=None, tag=None, sha=None, heads=False, tags=False):
-    cmd = ['git', 'ls-remote']
-    if head or heads: cmd += ['--heads']
-    if tag or tags: cmd += ['--tags']
-    cmd += (remote,) + args
-    lns = lines(cmd)
-    return parse_ls_remote_lines(lns, head=head, tag=tag, sha=sha, heads=heads, tags=tags)
+def snapshot(remote, *args, ttl=None, refresh=False):
+    """Return a ``Refs`` snapshot of ``remote`` (a remote name or URL), from one ``git ls-remote`` call.
+
+    Snapshots are memoized per remote (and ``args``): a cached snapshot is reused if it is less than ``ttl`` seconds
+    old (``None``: any age). Pass ``refresh=True`` to re-fetch unconditionally.
+    """
+    key = (urls().get(remote, remote), args)
+    now = monotonic()
+    if not refresh:
+        cached = _refs_cache.get(key)
+        if cached and (ttl is None or now - cached[0] < ttl):
+            return cached[1]
+    refs = Refs(lines('git', 'ls-remote', remote, *args, log=None))
+    _refs_cache[key] = (now, refs)
+    return refs
+
+
+def clear_snapshots(remote=None):
+    """Drop memoized ``snapshot``s (of ``remote`` only, if passed)."""
+    if remote is None:
+        _refs_cache.clear()
+        return
+    url = urls().get(remote, remote)
+    for key in [ key for key in _refs_cache if key[0] == url ]:
+        del _refs_cache[key]
+
+
+def ls_remote(remote, *args, head=None, tag=None, sha=None, heads=False, tags=False, ttl=0, refresh=False):
+    """Query ``remote``'s refs (cf. ``parse_ls_remote_lines``).
+
+    By default (``ttl=0``), each call runs ``git ls-remote`` (restricted to branches/tags, as relevant). Otherwise,
+    queries are answered from a memoized full ``snapshot`` up to ``ttl`` seconds old (``None``: any age), so that
+    several queries against one remote cost one network round trip.
+    """
+    if ttl == 0 and not refresh:
+        cmd = ['git', 'ls-remote']
+        if head or heads: cmd += ['--heads']
+        if tag or tags: cmd += ['--tags']
+        cmd += (remote,) + args
+        refs = Refs(lines(cmd))
+    else:
+        refs = snapshot(remote, *args, ttl=ttl, refresh=refresh)
+    return refs.query(head=head, tag=tag, sha=sha, heads=heads, tags=tags)
 
 
 def exists(name): return name in ls()
@@ -121,5 +260,5 @@ def push(name=None, local=None, remote=None):
 
 def git_remote_sha(url: str, ref: str, **kwargs):
     line = proc.line('git', 'ls-remote', url, ref, **kwargs)
-    new_sha, _ = re.split(r'\s+', line, 1)
+    new_sha, _ = line.split(None, 1)
     return new_sha
@@ -1,16 +1,191 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from os import getcwd
+from os.path import dirname, exists, isdir, isfile, join, realpath
+from threading import Lock
+
 from ..proc import line
 
-_repo = None
+
+class RepoCache:
+    """Path-keyed LRU cache of GitPython ``Repo`` handles.
+
+    GitPython keeps ``git cat-file`` coprocesses alive per ``Repo``; evicted (and ``clear``ed) handles are ``close()``d,
+    so processes touching many repos don't accumulate them. ``factory`` builds a handle from a repo root (default:
+    ``git.Repo``).
+    """
+    def __init__(self, maxsize: int = 16, factory=None):
+        self.maxsize = maxsize
+        self.factory = factory
+        self._repos: OrderedDict = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, path: str | None = None):
+        """Return the handle for the repo containing ``path`` (default: current directory)."""
+        key = find_root(path)
+        with self._lock:
+            repo = self._repos.get(key)
+            if repo is not None:
+                self._repos.move_to_end(key)
+                return repo
+        factory = self.factory
+        if factory is None:
+            from git import Repo
+            factory = Repo
+        repo = factory(key)
+        with self._lock:
+            existing = self._repos.get(key)
+            if existing is not None:
+                # Lost a race with another thread
+                self._repos.move_to_end(key)
+                evicted = [ repo ]
+                repo = existing
+            else:
+                self._repos[key] = repo
+                evicted = self._evict(self.maxsize)
+        for old in evicted:
+            old.close()
+        return repo
+
+    def _evict(self, size: int) -> list:
+        """Pop least-recently-used handles until at most ``size`` remain (caller holds ``_lock``)."""
+        evicted = []
+        while len(self._repos) > size:
+            _, old = self._repos.popitem(last=False)
+            evicted.append(old)
+        return evicted
+
+    def resize(self, maxsize: int):
+        """Change the cache bound, closing any handles evicted as a result."""
+        with self._lock:
+            self.maxsize = maxsize
+            evicted = self._evict(maxsize)
+        for old in evicted:
+            old.close()
+
+    def clear(self):
+        """Close and drop all cached handles."""
+        with self._lock:
+            evicted = self._evict(0)
+        for old in evicted:
+            old.close()
+
+    def __len__(self):
+        return len(self._repos)
+
+    def __contains__(self, path):
+        return find_root(path) in self._repos
+
+
+repos = RepoCache()
+
+
+def git_repo(path: str | None = None):
+    """Return a (cached) GitPython ``Repo`` for the repository containing ``path`` (default: current directory)."""
+    return repos.get(path)
+
+
+def root(cwd: str | None = None) -> str:
+    """Get the root directory of the current git repository (from the ``Repo`` cache, if GitPython is installed).
+
+    Outside a repo, or in a bare one, raises ``CalledProcessError`` (from ``git rev-parse``), with or without GitPython.
+    """
+    try:
+        import git
+    except ImportError:
+        return line('git', 'rev-parse', '--show-toplevel', cwd=cwd)
+    try:
+        tree = git_repo(cwd).working_tree_dir
+    except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+        tree = None
+    if tree is None:
+        # Let `rev-parse` raise its usual error
+        return line('git', 'rev-parse', '--show-toplevel', cwd=cwd)
+    return tree
+
+
+def find_root(cwd: str | None = None) -> str:
+    """Find the directory containing ``.git`` (a directory, or a file, for worktrees/submodules) above ``cwd``, without
+    forking ``git``; falls back to ``cwd`` itself (e.g. for bare repos)."""
+    cwd = realpath(cwd or getcwd())
+    path = cwd
+    while True:
+        if exists(join(path, '.git')):
+            return path
+        parent = dirname(path)
+        if parent == path:
+            return cwd
+        path = parent
+
+
+def git_dir(cwd: str | None = None) -> str | None:
+    """Locate the ``.git`` directory for ``cwd`` without forking ``git`` (following ``gitdir:`` files); for linked
+    worktrees, this is the per-worktree dir (cf. ``common_dir``)."""
+    root = find_root(cwd)
+    path = join(root, '.git')
+    if isdir(path):
+        return path
+    elif isfile(path):
+        with open(path) as f:
+            content = f.read().strip()
+        if content.startswith('gitdir: '):
+            gitdir = content[len('gitdir: '):]
+            return realpath(join(root, gitdir))
+    elif isfile(join(root, 'HEAD')) and isdir(join(root, 'objects')):
+        # Bare repo
+        return root
+    return None
+
+
+def common_dir(cwd: str | None = None) -> str | None:
+    """Locate the Git "common dir" (containing ``config``, ``packed-refs``, …; differs from ``git_dir`` in linked
+    worktrees)."""
+    gitdir = git_dir(cwd)
+    if gitdir is None:
+        return None
+    commondir = join(gitdir, 'commondir')
+    if isfile(commondir):
+        with open(commondir) as f:
+            return realpath(join(gitdir, f.read().strip()))
+    return gitdir
 
 
-def git_repo():
-    global _repo
-    if not _repo:
-        from git import Repo
-        _repo = Repo()
-    return _repo
+def read_ref(ref: str, cwd: str | None = None) -> str | None:
+    """Resolve a full ref name (e.g. ``refs/heads/main``) to a SHA by reading loose refs / ``packed-refs``, without
+    forking ``git``; ``None`` if it can't be found this way."""
+    common = common_dir(cwd)
+    if common is None:
+        return None
+    path = join(common, ref)
+    if isfile(path):
+        with open(path) as f:
+            sha = f.read().strip()
+        return sha or None
+    packed = join(common, 'packed-refs')
+    if isfile(packed):
+        with open(packed) as f:
+            for ln in f:
+                if ln.startswith(('#', '^')):
+                    continue
+                sha, _, name = ln.rstrip('\n').partition(' ')
+                if name == ref:
+                    return sha
+    return None
 
 
-def root():
-    """Get the root directory of the current git repository."""
-    return line('git', 'rev-parse', '--show-toplevel')
+def read_head(cwd: str | None = None) -> tuple[str | None, str | None] | None:
+    """Read ``HEAD`` without forking ``git``: return ``(ref, sha)``, where ``ref`` is the branch ``HEAD`` points to
+    (``None`` if detached) and ``sha`` is ``None`` for an unborn branch; ``None`` if there's no readable ``HEAD``."""
+    gitdir = git_dir(cwd)
+    if gitdir is None:
+        return None
+    try:
+        with open(join(gitdir, 'HEAD')) as f:
+            head = f.read().strip()
+    except FileNotFoundError:
+        return None
+    if head.startswith('ref: '):
+        ref = head[len('ref: '):]
+        return ref, read_ref(ref, cwd)
+    return None, head or None
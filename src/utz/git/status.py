@@ -1,15 +1,19 @@
 """Git status utilities."""
+from __future__ import annotations
 
 from subprocess import CalledProcessError
 
 from ..proc import run
+from .diff import cached
 
 
-def is_dirty(cwd: str = None) -> bool:
+def is_dirty(cwd: str = None, ttl: float | None = None) -> bool:
     """Check if git working tree has uncommitted changes.
 
     Args:
         cwd: Directory to run git command in (default: current directory)
+        ttl: Reuse a result computed within this many seconds (and since the index last changed); cf.
+            ``utz.git.diff.cached``
 
     Returns:
         True if there are uncommitted changes (staged or unstaged), False otherwise
@@ -28,16 +32,19 @@ def is_dirty(cwd: str = None) -> bool:
         - 1 if dirty
         - 128 if no HEAD (empty repo)
     """
-    try:
-        kwargs = {}
-        if cwd:
-            kwargs['cwd'] = cwd
-        run(['git', 'diff-index', '--quiet', 'HEAD', '--'], **kwargs)
-        return False
-    except CalledProcessError as e:
-        if e.returncode == 1:
-            return True
-        if e.returncode == 128:
-            # No HEAD (empty repo with no commits)
+    def check():
+        try:
+            kwargs = {}
+            if cwd:
+                kwargs['cwd'] = cwd
+            run(['git', 'diff-index', '--quiet', 'HEAD', '--'], **kwargs)
             return False
-        raise
+        except CalledProcessError as e:
+            if e.returncode == 1:
+                return True
+            if e.returncode == 128:
+                # No HEAD (empty repo with no commits)
+                return False
+            raise
+
+    return cached(('is_dirty',), check, ttl, cwd)
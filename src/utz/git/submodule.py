@@ -1,30 +1,180 @@
 #!/usr/bin/env python
-from utz.git.repo import git_repo
+"""Submodule helpers that read ``.gitmodules`` directly (one ``git config`` call, memoized), and run ``update``/
+``fetch`` across many submodules concurrently."""
+from __future__ import annotations
+
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from os import stat
+from os.path import exists as path_exists, join
+from subprocess import CalledProcessError, PIPE, STDOUT, run as sp_run
+from time import perf_counter
+from typing import NamedTuple
+
+from utz.git.repo import find_root, git_repo
 from utz.proc import lines, run
 
 
-def ls():
-    return lines('git', 'submodule', 'foreach', '--quiet', 'echo $name')
+class Submodule(NamedTuple):
+    name: str
+    path: str
+    url: str | None = None
+    branch: str | None = None
+
+
+class Result(NamedTuple):
+    """Outcome of one submodule's command in ``update``/``fetch``."""
+    name: str
+    path: str
+    returncode: int
+    elapsed: float
+    output: str
+
+
+# `.gitmodules` path → (mtime, {name: Submodule})
+_cache: dict[str, tuple[int, dict[str, Submodule]]] = {}
+
+
+def parse(cwd: str | None = None) -> dict[str, Submodule]:
+    """Map submodule names to ``Submodule``s, parsed from ``.gitmodules`` with one ``git config -f … --get-regexp``.
+
+    Memoized per repository, and invalidated when ``.gitmodules``' mtime changes.
+    """
+    root = find_root(cwd)
+    path = join(root, '.gitmodules')
+    try:
+        mtime = stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return {}
+    cached = _cache.get(path)
+    if cached and cached[0] == mtime:
+        return dict(cached[1])
+
+    attrs: dict[str, dict[str, str]] = {}
+    lns = lines('git', 'config', '-f', path, '--get-regexp', r'^submodule\.', err_ok=None, log=None) or []
+    for ln in lns:
+        key, _, value = ln.partition(' ')
+        # Names may contain `.`s; variable names can't
+        name, _, var = key[len('submodule.'):].rpartition('.')
+        attrs.setdefault(name, {}).setdefault(var, value)
+    submodules = {
+        name: Submodule(name, d.get('path', name), d.get('url'), d.get('branch'))
+        for name, d in attrs.items()
+    }
+    _cache[path] = (mtime, submodules)
+    return dict(submodules)
+
 
+def ls(cwd: str | None = None) -> list[str]:
+    """Names of submodules configured in ``.gitmodules``."""
+    return list(parse(cwd))
 
-def exists(name):
-    return name in ls()
+
+def exists(name: str, cwd: str | None = None) -> bool:
+    """True iff ``name`` is a configured submodule's name or path."""
+    submodules = parse(cwd)
+    return name in submodules or any(s.path == name for s in submodules.values())
 
 
 def add(url, path=None):
-    if exists(path):
+    if path and exists(path):
         return
-    cmd = ['git', 'submodule', 'add', 'url']
+    cmd = ['git', 'submodule', 'add', url]
     if path:
         cmd.append(path)
     run(cmd)
 
 
-_submodule_map = None
+def _select(names, cwd) -> list[Submodule]:
+    submodules = parse(cwd)
+    if not names:
+        return list(submodules.values())
+    by_path = { s.path: s for s in submodules.values() }
+    selected = []
+    for name in names:
+        s = submodules.get(name) or by_path.get(name)
+        if s is None:
+            raise ValueError(f"No such submodule: {name}")
+        selected.append(s)
+    return selected
+
+
+def _run_all(cmds: list[tuple[Submodule, list[str], str]], workers: int, check: bool) -> list[Result]:
+    def run_one(item):
+        submodule, cmd, dir = item
+        start = perf_counter()
+        p = sp_run(cmd, cwd=dir, stdout=PIPE, stderr=STDOUT, text=True)
+        return Result(submodule.name, submodule.path, p.returncode, perf_counter() - start, p.stdout)
+
+    if not cmds:
+        return []
+    with ThreadPoolExecutor(max_workers=min(workers, len(cmds))) as pool:
+        results = list(pool.map(run_one, cmds))
+    if check:
+        for (_, cmd, _), result in zip(cmds, results):
+            if result.returncode:
+                raise CalledProcessError(result.returncode, cmd, output=result.output)
+    return results
+
+
+def update(
+    *names: str,
+    init: bool = True,
+    recursive: bool = False,
+    depth: int | None = None,
+    workers: int = 8,
+    check: bool = True,
+    cwd: str | None = None,
+) -> list[Result]:
+    """``git submodule update`` the named submodules (default: all), ``workers`` at a time; returns per-submodule
+    ``Result``s (with timings).
+
+    ``init`` registers the selected submodules first, in one ``git submodule init`` (so that concurrent updates don't
+    contend for the superproject's config lock). With ``check``, raises ``CalledProcessError`` for the first failed
+    submodule (after all have finished).
+    """
+    root = find_root(cwd)
+    submodules = _select(names, root)
+    if not submodules:
+        return []
+    if init:
+        run('git', 'submodule', 'init', '--', *[ s.path for s in submodules ], cwd=root, log=None)
+    base = [ 'git', 'submodule', 'update' ]
+    if recursive:
+        base += ['--init', '--recursive'] if init else ['--recursive']
+    if depth:
+        base += ['--depth', str(depth)]
+    cmds = [ (s, [ *base, '--', s.path ], root) for s in submodules ]
+    return _run_all(cmds, workers, check)
+
+
+def fetch(
+    *names: str,
+    args: tuple[str, ...] = (),
+    workers: int = 8,
+    check: bool = True,
+    cwd: str | None = None,
+) -> list[Result]:
+    """``git fetch`` in the named (checked-out) submodules (default: all), ``workers`` at a time; returns per-submodule
+    ``Result``s (with timings). Uninitialized submodules are skipped."""
+    root = find_root(cwd)
+    cmds = [
+        (s, [ 'git', 'fetch', *args ], join(root, s.path))
+        for s in _select(names, root)
+        if path_exists(join(root, s.path, '.git'))
+    ]
+    return _run_all(cmds, workers, check)
+
 
+def git_submodules(cwd: str | None = None):
+    """Map submodule paths to GitPython ``Submodule`` objects.
 
-def git_submodules():
-    global _submodule_map
-    if not _submodule_map:
-        _submodule_map = { s.path: s for s in git_repo().submodules }
-    return _submodule_map
+    Deprecated: use ``parse``, which reads ``.gitmodules`` without loading GitPython (and is invalidated when it
+    changes). Not memoized beyond the cached ``Repo`` handle, so reflects the current ``.gitmodules``.
+    """
+    warnings.warn(
+        "`git_submodules` is deprecated; use `utz.git.submodule.parse`",
+        DeprecationWarning,
+        stacklevel=2,
+    )
+    return { s.path: s for s in git_repo(cwd).submodules }
@@ -1,27 +1,62 @@
 from __future__ import annotations
 
-from asyncio import gather, set_event_loop
+from asyncio import gather
+from concurrent.futures import Executor, Future, ThreadPoolExecutor, wait
 from os import getcwd, remove, makedirs
 from os.path import splitext, exists, dirname
+from threading import Lock
 
-import asyncio
 import json
 import memray
 from contextlib import AbstractContextManager, AbstractAsyncContextManager
-from subprocess import DEVNULL
+from subprocess import CalledProcessError, DEVNULL, Popen
 from tempfile import NamedTemporaryFile
 from types import TracebackType
-from typing import Literal, Self
+from typing import Literal, TYPE_CHECKING
 
 from utz import err
 from utz.aio import proc
+from utz.process import Cmd
 from utz.process.log import Log, silent
 
+if TYPE_CHECKING:
+    # `typing.Self` requires Python ≥3.11
+    from typing_extensions import Self
+
 
 Verbosity = Literal[0, 1, 2]
 
+_pool: ThreadPoolExecutor | None = None
+_pool_lock = Lock()
+
+
+def pool() -> ThreadPoolExecutor:
+    """Shared executor for ``Tracker(background=True)`` report generation (the work happens in ``memray``
+    subprocesses, so threads suffice)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(thread_name_prefix='utz.mem')
+        return _pool
+
+
+def peak_memory(path: str) -> int:
+    """Read peak memory use from a ``memray`` capture file's header (no need to run ``memray stats``)."""
+    reader = memray.FileReader(path)
+    try:
+        return reader.metadata.peak_memory
+    finally:
+        reader.close()
+
 
 class Tracker(AbstractContextManager, AbstractAsyncContextManager):
+    """Profile memory allocations in a ``with`` (or ``async with``) block with ``memray``.
+
+    On exit, ``peak_mem`` is read from the capture file's header, and ``memray stats`` / ``memray flamegraph`` reports
+    are generated (concurrently). With ``background=True`` (or an ``Executor``), report generation is handed off to a
+    worker pool, and exit returns immediately; ``future`` (or ``result()``) tracks its completion, after which ``stats``
+    is populated.
+    """
     def __init__(
         self,
         path: str | None = None,
@@ -31,6 +66,7 @@ class Tracker(AbstractContextManager, AbstractAsyncContextManager):
         log: Log | bool | Verbosity = None,
         stats: bool = True,
         flamegraph: bool = True,
+        background: bool | Executor = False,
         **kwargs,
     ):
         if not stats and not flamegraph and not keep:
@@ -57,10 +93,15 @@ class Tracker(AbstractContextManager, AbstractAsyncContextManager):
         self.stats = None
         self.compute_stats = stats
         self.compute_flamegraph = flamegraph
+        self.background = background
+        self.future: Future | None = None
         self.tracker = None
 
     def __enter__(self) -> Self:
-        self.peak_mem = self.stats = None
+        if self.future is not None:
+            # A previous session's reports may still be reading its capture file (which may be about to be reused)
+            wait([ self.future ])
+        self.peak_mem = self.stats = self.future = None
         assert not self.tracker, f"Attempted to `__enter__` MemTracker before `__exit__`ing"
         path = self.path
         if path is None:
@@ -79,67 +120,113 @@ class Tracker(AbstractContextManager, AbstractAsyncContextManager):
     async def __aenter__(self) -> Self:
         return self.__enter__()
 
+    @staticmethod
+    def _stats_path(path: str) -> str:
+        return f'{splitext(path)[0]}.stats.json'
+
+    @staticmethod
+    def _flamegraph_path(path: str) -> str:
+        return f'{splitext(path)[0]}.html'
+
     @property
     def stats_path(self) -> str | None:
         path = self.path
-        if path is None:
-            return path
-        else:
-            return f'{splitext(self.path)[0]}.stats.json'
+        return None if path is None else self._stats_path(path)
 
     @property
     def flamegraph_path(self) -> str | None:
         path = self.path
-        if path is None:
-            return path
-        else:
-            return f'{splitext(self.path)[0]}.html'
+        return None if path is None else self._flamegraph_path(path)
 
-    async def __aexit__(
-        self,
-        exc_type: type[BaseException] | None,
-        exc_value: BaseException | None,
-        exc_tb: TracebackType | None,
-    ):
+    @property
+    def rm(self) -> bool:
+        """Whether to remove the ``memray`` capture (and stats JSON) after generating reports."""
+        return self.keep is False or (self.keep is None and self.tmpfile)
+
+    def _stop(self, exc_type, exc_value, exc_tb) -> bool:
+        """Stop tracking, and read ``peak_mem``; return ``True`` iff reports should be generated."""
         self.tracker.__exit__(exc_type, exc_value, exc_tb)
         self.tracker = None
-        rm = self.keep is False or (self.keep is None and self.tmpfile)
-        coros = []
+        if exc_value:
+            if self.rm:
+                remove(self.path)
+                self.path = None
+            return False
+        self.peak_mem = peak_memory(self.path)
+        return True
+
+    def _cmds(self, path: str) -> list[Cmd]:
+        kwargs = dict() if self.verbose > 1 else dict(stdout=DEVNULL)
+        cmds = []
         if self.compute_stats:
-            stats_path = self.stats_path
-            if not exc_value:
-                coros.append(
-                    proc.run(
-                        'memray', 'stats', '--json', '-fo', stats_path, self.path,
-                        log=self.log,
-                        **(dict() if self.verbose > 1 else dict(stdout=DEVNULL)),
-                    )
-                )
+            cmds.append(Cmd.mk('memray', 'stats', '--json', '-fo', self._stats_path(path), path, **kwargs))
         if self.compute_flamegraph:
-            flamegraph_path = self.flamegraph_path
-            if not exc_value:
-                coros.append(
-                    proc.run(
-                        'memray', 'flamegraph', '-fo', flamegraph_path, self.path,
-                        log=self.log,
-                        **(dict() if self.verbose > 1 else dict(stdout=DEVNULL)),
-                    )
-                )
-
-        await gather(*coros)
-        if rm:
-            remove(self.path)
-            self.path = None
-        if exc_value:
-            raise exc_value
-        with open(stats_path, 'r') as f:
-            stats = json.load(f)
-        if rm:
-            remove(stats_path)
+            cmds.append(Cmd.mk('memray', 'flamegraph', '-fo', self._flamegraph_path(path), path, **kwargs))
+        return cmds
+
+    def _finish(self, path: str) -> dict | None:
+        """Load stats written by ``memray stats``, and clean up."""
+        stats_path = self._stats_path(path)
+        if self.rm:
+            remove(path)
+            if self.path == path:
+                self.path = None
+        stats = None
+        if self.compute_stats:
+            with open(stats_path, 'r') as f:
+                stats = json.load(f)
+            if self.rm:
+                remove(stats_path)
         self.stats = stats
-        self.peak_mem = stats['metadata']['peak_memory']
+        return stats
+
+    def report(self, path: str | None = None) -> dict | None:
+        """Generate reports (``memray`` subprocesses run concurrently, without an event loop); return stats.
+
+        ``path`` defaults to ``self.path``; background reports are passed the path captured at submission time.
+        """
+        path = path or self.path
+        procs = []
+        for cmd in self._cmds(path):
+            args, kwargs = cmd.compile(log=self.log)
+            procs.append((args, Popen(args, **kwargs)))
+        for args, p in procs:
+            if p.wait() != 0:
+                raise CalledProcessError(p.returncode, args)
+        return self._finish(path)
+
+    async def areport(self) -> dict | None:
+        """Generate reports (``memray`` subprocesses run concurrently); return stats."""
+        path = self.path
+        await gather(*[
+            proc.run(*cmd.cmd, log=self.log, **cmd.kwargs)
+            for cmd in self._cmds(path)
+        ])
+        return self._finish(path)
+
+    def _submit(self) -> Future:
+        executor = self.background if isinstance(self.background, Executor) else pool()
+        self.future = executor.submit(self.report, self.path)
+        return self.future
+
+    def result(self, timeout: float | None = None) -> dict | None:
+        """Wait for background report generation (if any), and return stats."""
+        if self.future is not None:
+            return self.future.result(timeout)
+        return self.stats
 
-        pass
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_tb: TracebackType | None,
+    ):
+        if not self._stop(exc_type, exc_value, exc_tb):
+            return
+        if self.background:
+            self._submit()
+        else:
+            await self.areport()
 
     def __exit__(
         self,
@@ -147,16 +234,10 @@ class Tracker(AbstractContextManager, AbstractAsyncContextManager):
         exc_value: BaseException | None,
         exc_tb: TracebackType | None,
     ):
-        coro = self.__aexit__(exc_type, exc_value, exc_tb)
-        try:
-            # If we're already in an event loop
-            loop = asyncio.get_running_loop()
-            loop.run_until_complete(coro)
-        except RuntimeError:
-            # If no event loop is running, create one
-            loop = asyncio.new_event_loop()
-            set_event_loop(loop)
-            try:
-                loop.run_until_complete(coro)
-            finally:
-                loop.close()
+        # Synchronous; doesn't need (or interfere with) an event loop, so this also works inside `async` code
+        if not self._stop(exc_type, exc_value, exc_tb):
+            return
+        if self.background:
+            self._submit()
+        else:
+            self.report()
@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 
-from collections.abc import MutableMapping
+from collections.abc import ItemsView, MutableMapping
 
 
 def rev(arg: dict) -> dict:
@@ -8,23 +8,34 @@ def rev(arg: dict) -> dict:
 
 
 def merge(*args, **kwargs):
-    if args:
-        (obj, *args) = args
-        obj = dict(obj)
-    else:
-        obj = dict()
-    for arg in args:
-        obj.update(**arg)
-    for k,v in kwargs.items():
-        obj[k] = v
-    return o(obj)
+    """Deep-merge ``dict``s (later args, then ``kwargs``, take precedence), as a lazy ``layered_o`` view."""
+    if kwargs:
+        args = (*args, kwargs)
+    return layered_o(*args)
+
+
+RESERVED = '_data'
+
+_ga = object.__getattribute__
 
 
 class o(MutableMapping, dict):
+    """``dict`` wrapper exposing keys as attributes (``o({'a': 1}).a == 1``).
+
+    Wraps (doesn't copy) one ``dict``: mutations through the ``o`` are visible in the ``dict``, and vice versa. Nested
+    ``dict`` values are wrapped in ``o``s on access, and the wrappers are cached, so repeated (deep) access like
+    ``cfg.a.b.c`` doesn't allocate. Methods take precedence over keys of the same name (``o(items=1).items`` is the
+    method; use ``o['items']``). ``freeze()`` returns an immutable, hashable copy (``frozen_o``).
+
+    The ``dict`` base class holds shallow references to the same values, kept in sync with writes made through the
+    ``o``, for C-level consumers that read it directly (e.g. ``json``'s encoder).
+    """
+    __slots__ = ('_data', '_children')
+
     def __init__(self, *args, **kwargs):
         if len(args) > 1:
             raise ValueError(f'≤1 positional args required, got {len(args)}')
-        
+
         if args:
             (data,) = args
             if type(data) is not dict:
@@ -34,21 +45,50 @@ class o(MutableMapping, dict):
         else:
             data = kwargs
 
-        K = '_data'
-        if K in data:
-            raise ValueError(f"Reserved key '{K}' found in 'data' dict: {data}")
+        if RESERVED in data:
+            raise ValueError(f"Reserved key '{RESERVED}' found in 'data' dict: {data}")
 
-        super().__init__(**data)
+        dict.update(self, data)
+        object.__setattr__(self, '_data', data)
+        # key → `o` wrapping the (`dict`) value at that key
+        object.__setattr__(self, '_children', {})
 
-        for k, v in data.items():
-            if type(v) is dict and not isinstance(v, o): v = o(v)
-            super(o, self).__setattr__(k, v)
+    def __getattribute__(self, k):
+        # Look up keys before falling back to regular attribute access (which would first search the class's MRO, and
+        # only then call a `__getattr__`); `_ga` skips this method, for internal attribute access.
+        if k in _ATTRS:
+            return _ga(self, k)
+        try:
+            v = _ga(self, '_data')[k]
+        except KeyError:
+            try:
+                return _ga(self, k)
+            except AttributeError:
+                raise AttributeError(f'Key {k}') from None
+        if type(v) is not dict:
+            return v
+        children = _ga(self, '_children')
+        child = children.get(k)
+        if child is None or _ga(child, '_data') is not v:
+            child = children[k] = o(v)
+        return child
 
-        super(o, self).__setattr__(K, data)
+    def _wrap(self, k, v):
+        if type(v) is not dict:
+            return v
+        children = _ga(self, '_children')
+        child = children.get(k)
+        # The underlying `dict` may have been mutated directly; only reuse a wrapper of the current value
+        if child is None or _ga(child, '_data') is not v:
+            child = children[k] = o(v)
+        return child
 
     def merge(self, *args, **kwargs):
         return merge(self, *args, **kwargs)
 
+    def freeze(self) -> 'frozen_o':
+        return frozen_o(self._data)
+
     def update(self, *args, **kwargs):
         for arg in args:
             self.update(**arg)
@@ -61,33 +101,32 @@ class o(MutableMapping, dict):
 
     def __setattr__(self, k, v):
         if isinstance(v, dict) and not isinstance(v, o): v = o(v)
-        self._data[k] = v
+        self[k] = v
 
-    def __getattr__(self, k):
+    def __delattr__(self, k):
         try:
-            v = self._data[k]
-            if isinstance(v, dict) and not isinstance(v, o): v = o(v)
-            return v
+            del self[k]
         except KeyError:
-            raise AttributeError(f'Key {k}')
+            raise AttributeError(f'Key {k}') from None
 
     def __len__(self):
-        return len(self._data)
+        return len(_ga(self, '_data'))
 
     def __delitem__(self, k):
         del self._data[k]
+        self._children.pop(k, None)
+        dict.pop(self, k, None)
 
     def get(self, k, default=None):
-        if k in self:
-            return self[k]
+        data = _ga(self, '_data')
+        if k in data:
+            return _ga(self, '_wrap')(k, data[k])
         else:
             return default
 
     def __call__(self, *keys, default=None):
         obj = self
-        keys = list(keys)
-        while keys:
-            key = keys.pop(0)
+        for key in keys:
             if key in obj:
                 obj = obj[key]
             else:
@@ -96,17 +135,17 @@ class o(MutableMapping, dict):
         return obj
 
     def __getitem__(self, k):
-        v = self._data[k]
-        if type(v) is dict:
-            v = o(v)
-        return v
+        v = _ga(self, '_data')[k]
+        return v if type(v) is not dict else _ga(self, '_wrap')(k, v)
 
     def __setitem__(self, k, v):
         self._data[k] = v
+        self._children.pop(k, None)
+        dict.__setitem__(self, k, v)
 
     def __contains__(self, k):
-        return k in self._data
-    
+        return k in _ga(self, '_data')
+
     def __str__(self):
         return str(self._data)
 
@@ -114,12 +153,20 @@ class o(MutableMapping, dict):
         return repr(self._data)
 
     def __iter__(self):
-        return iter(self._data)
+        return iter(_ga(self, '_data'))
 
     def items(self):
         return self._data.items()
 
+    def __reduce__(self):
+        return type(self), (dict(self._data),)
+
+    def __copy__(self):
+        return type(self)(dict(self._data))
+
     def __eq__(self, r):
+        if isinstance(r, layered_o):
+            return NotImplemented
         if isinstance(r, o):
             return self._data == r._data
         if isinstance(r, dict):
@@ -127,11 +174,211 @@ class o(MutableMapping, dict):
         return NotImplemented
 
     def __ne__(self, r):
+        if isinstance(r, layered_o):
+            return NotImplemented
         if isinstance(r, o):
             return self._data != r._data
         if isinstance(r, dict):
             return self._data != r
         return NotImplemented
 
+    __hash__ = None
+
+
+def _freeze(v):
+    if isinstance(v, frozen_o):
+        return v
+    if isinstance(v, dict):
+        return frozen_o(v)
+    return v
+
+
+class frozen_o(o):
+    """Immutable, hashable ``o``.
+
+    Copies its input (a ``dict``, ``o``, or kwargs), freezing nested ``dict``s (recursively); other values are stored
+    as-is, so a ``frozen_o`` is hashable iff its (non-``dict``) values are, like a ``tuple``. The hash is computed on
+    first use, and cached.
+    """
+    __slots__ = ('_hash',)
+
+    def __init__(self, *args, **kwargs):
+        if len(args) > 1:
+            raise ValueError(f'≤1 positional args required, got {len(args)}')
+        if args:
+            (data,) = args
+            if not isinstance(data, dict):
+                raise ValueError(f'Single-arg frozen_o() ctor call needs dict arg, not {type(data)}: {data}')
+            if kwargs:
+                raise ValueError(f'Positional dict arg is exclusive with kwargs: {data}, {kwargs}')
+            if isinstance(data, o):
+                data = data._data
+        else:
+            data = kwargs
+        if RESERVED in data:
+            raise ValueError(f"Reserved key '{RESERVED}' found in 'data' dict: {data}")
+        data = { k: _freeze(v) for k, v in data.items() }
+        dict.update(self, data)
+        object.__setattr__(self, '_data', data)
+        object.__setattr__(self, '_children', {})
+        object.__setattr__(self, '_hash', None)
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError(f"'{type(self).__name__}' object is immutable")
+
+    __setattr__ = __delattr__ = __setitem__ = __delitem__ = update = _immutable
+    pop = popitem = clear = setdefault = _immutable
+
+    def freeze(self) -> 'frozen_o':
+        return self
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
+
     def __hash__(self):
-        return hash(self._data)
+        h = self._hash
+        if h is None:
+            h = hash(frozenset(self._data.items()))
+            object.__setattr__(self, '_hash', h)
+        return h
+
+
+class layered_o(o):
+    """Read-only-until-written, deep-merged view of several ``dict``s (``ChainMap``-style; later layers take
+    precedence), returned by ``merge``.
+
+    Construction only collects the top-level keys (shallowly, into the ``dict`` base); a key whose value is a ``dict``
+    in more than one layer resolves, on first access, to a nested ``layered_o`` over those ``dict``s (down to the first
+    layer with a non-``dict`` value there), which is memoized. The first write materializes the merged data into fresh
+    ``dict``s (layers are never mutated), and turns the view into a plain ``o``; ``freeze()`` returns a ``frozen_o`` of
+    the merged data. Layers are assumed not to change while the view is in use.
+    """
+    # Same layout as `o`, so that materializing can reassign `__class__`; while layered, `_data` holds the layers
+    # (highest-precedence first), and `_children` memoizes resolved nested views.
+    __slots__ = ()
+
+    def __init__(self, *layers):
+        maps = []
+        for layer in layers:
+            if isinstance(layer, layered_o):
+                maps.extend(reversed(layer._data))
+            elif isinstance(layer, o):
+                maps.append(layer._data)
+            else:
+                maps.append(layer)
+        for m in maps:
+            dict.update(self, m)
+        object.__setattr__(self, '_data', tuple(reversed(maps)))
+        object.__setattr__(self, '_children', {})
+
+    def __getattribute__(self, k):
+        if k in _ATTRS:
+            return _ga(self, k)
+        try:
+            return layered_o.__getitem__(self, k)
+        except KeyError:
+            try:
+                return _ga(self, k)
+            except AttributeError:
+                raise AttributeError(f'Key {k}') from None
+
+    def __getitem__(self, k):
+        v = dict.__getitem__(self, k)
+        if not isinstance(v, dict):
+            return v
+        children = _ga(self, '_children')
+        child = children.get(k)
+        if child is None:
+            dicts = []
+            for m in _ga(self, '_data'):
+                if k in m:
+                    v = m[k]
+                    if not isinstance(v, dict):
+                        break
+                    dicts.append(v)
+            child = children[k] = layered_o(*reversed(dicts))
+        return child
+
+    def get(self, k, default=None):
+        return self[k] if dict.__contains__(self, k) else default
+
+    def __contains__(self, k):
+        return dict.__contains__(self, k)
+
+    def __len__(self):
+        return dict.__len__(self)
+
+    def __iter__(self):
+        return dict.__iter__(self)
+
+    def items(self):
+        return ItemsView(self)
+
+    def _resolve(self) -> dict:
+        """Deep-merged data, in fresh ``dict``s (except subtrees that have already been materialized)."""
+        data = {}
+        for k, v in dict.items(self):
+            if isinstance(v, dict):
+                v = self[k]
+                v = v._resolve() if isinstance(v, layered_o) else v._data
+            data[k] = v
+        return data
+
+    def _materialize(self) -> o:
+        data = self._resolve()
+        dict.clear(self)
+        dict.update(self, data)
+        object.__setattr__(self, '_data', data)
+        object.__setattr__(self, '_children', {})
+        object.__setattr__(self, '__class__', o)
+        return self
+
+    def freeze(self) -> frozen_o:
+        return frozen_o(self._resolve())
+
+    def __setattr__(self, k, v):
+        setattr(self._materialize(), k, v)
+
+    def __delattr__(self, k):
+        delattr(self._materialize(), k)
+
+    def __setitem__(self, k, v):
+        self._materialize()[k] = v
+
+    def __delitem__(self, k):
+        del self._materialize()[k]
+
+    def update(self, *args, **kwargs):
+        self._materialize().update(*args, **kwargs)
+
+    def __str__(self):
+        return str(self._resolve())
+
+    def __repr__(self):
+        return repr(self._resolve())
+
+    def __reduce__(self):
+        return o, (self._resolve(),)
+
+    def __copy__(self):
+        return layered_o(self)
+
+    def __eq__(self, r):
+        if isinstance(r, layered_o):
+            r = r._resolve()
+        elif isinstance(r, o):
+            r = r._data
+        elif not isinstance(r, dict):
+            return NotImplemented
+        return self._resolve() == r
+
+    def __ne__(self, r):
+        eq = self.__eq__(r)
+        return eq if eq is NotImplemented else not eq
+
+
+# Class attributes (methods, slots) shadow keys of the same name
+_ATTRS = frozenset(dir(frozen_o)) | frozenset(dir(layered_o))
@@ -0,0 +1,150 @@
+"""Per-test performance budgets, as a pytest plugin.
+
+Tests marked ``@pytest.mark.perf`` (or parametrized with ``utz.parametrize(..., perf=True)``) are wrapped in a
+``utz.Time`` timer and (if ``memray`` is installed) a ``utz.mem.Tracker``; their wall time, peak memory, and allocation
+count are compared against a JSON baseline, keyed by test ID (including ``parametrize`` case IDs), and the test fails
+if any metric regresses beyond a tolerance.
+
+Enable with ``pytest -p utz.perf``, or ``pytest_plugins = ['utz.perf']`` in a root ``conftest.py``. Options:
+- ``--perf-baseline``: baseline JSON path (default: ``perf-baseline.json``, in the pytest rootdir)
+- ``--perf-update``: overwrite baseline entries with the current run's measurements
+- ``--perf-tolerance``: allowed relative increase, for all metrics (default: ``DEFAULT_TOLERANCE``)
+
+Tests without a baseline entry pass, and their measurements are added to the baseline file. Marker kwargs:
+``tolerance`` (a ``float``, or ``dict`` of per-metric ``float``s) and ``memory`` (``False`` to skip ``memray``).
+"""
+from __future__ import annotations
+
+import json
+from os.path import exists, join
+from typing import Union
+
+import pytest
+
+from utz.time import Time
+
+METRICS = ('time', 'peak_mem', 'allocations')
+DEFAULT_TOLERANCE = dict(time=.25, peak_mem=.1, allocations=.1)
+# Increases smaller than these are never considered regressions (wall time is noisy, and small allocations vary)
+FLOORS = dict(time=.01, peak_mem=1 << 20, allocations=1_000)
+
+Tolerance = Union[float, dict[str, float]]
+
+
+def tolerances(tolerance: Tolerance | None) -> dict[str, float]:
+    if tolerance is None:
+        return dict(DEFAULT_TOLERANCE)
+    if isinstance(tolerance, dict):
+        return { **DEFAULT_TOLERANCE, **tolerance }
+    return { metric: tolerance for metric in METRICS }
+
+
+class Baseline:
+    """Per-test metrics (``{test ID: {metric: value}}``), loaded from and saved to a JSON file."""
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: dict[str, dict[str, float]] = {}
+        if exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+        self.dirty = False
+
+    def get(self, key: str) -> dict[str, float] | None:
+        return self.entries.get(key)
+
+    def set(self, key: str, metrics: dict[str, float]):
+        self.entries[key] = metrics
+        self.dirty = True
+
+    def regressions(self, key: str, metrics: dict[str, float], tolerance: Tolerance | None = None) -> list[str]:
+        """Descriptions of ``metrics`` that exceed their baseline values by more than the tolerance (and floor)."""
+        baseline = self.get(key) or {}
+        tols = tolerances(tolerance)
+        msgs = []
+        for metric, value in metrics.items():
+            prev = baseline.get(metric)
+            if prev is None:
+                continue
+            limit = prev * (1 + tols[metric])
+            if value > limit and value - prev > FLOORS[metric]:
+                msgs.append(f"{metric}: {value:.4g} > {prev:.4g} (+{tols[metric]:.0%} = {limit:.4g})")
+        return msgs
+
+    def save(self):
+        if not self.dirty:
+            return
+        with open(self.path, 'w') as f:
+            json.dump(dict(sorted(self.entries.items())), f, indent=2)
+            f.write('\n')
+        self.dirty = False
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('utz-perf', 'per-test performance budgets (utz.perf)')
+    group.addoption('--perf-baseline', default=None, help='Baseline JSON path (default: <rootdir>/perf-baseline.json)')
+    group.addoption('--perf-update', action='store_true', help='Overwrite baseline entries with current measurements')
+    group.addoption('--perf-tolerance', type=float, default=None, help='Allowed relative increase, for all metrics')
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers',
+        'perf(tolerance=None, memory=True): record time/memory, and fail on regressions vs. a baseline (utz.perf)',
+    )
+    path = config.getoption('perf_baseline') or join(str(config.rootpath), 'perf-baseline.json')
+    config._utz_perf_baseline = Baseline(path)
+
+
+def pytest_sessionfinish(session):
+    baseline = getattr(session.config, '_utz_perf_baseline', None)
+    if baseline:
+        baseline.save()
+
+
+def _memray():
+    try:
+        import memray  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker('perf')
+    if marker is None:
+        return (yield)
+
+    config = item.config
+    baseline: Baseline = config._utz_perf_baseline
+    memory = marker.kwargs.get('memory', True) and _memray()
+    tracker = None
+    if memory:
+        from utz.mem import Tracker
+        tracker = Tracker(stats=True, flamegraph=False, native_traces=False, follow_fork=False)
+
+    time = Time()
+    if tracker:
+        with tracker, time('call'):
+            result = yield
+    else:
+        with time('call'):
+            result = yield
+
+    metrics = dict(time=time['call'])
+    if tracker:
+        metrics['peak_mem'] = tracker.peak_mem
+        metrics['allocations'] = tracker.stats['total_num_allocations']
+    item.user_properties.append(('perf', metrics))
+
+    key = item.nodeid
+    tolerance = config.getoption('perf_tolerance')
+    if tolerance is None:
+        tolerance = marker.kwargs.get('tolerance')
+    if config.getoption('perf_update') or baseline.get(key) is None:
+        baseline.set(key, metrics)
+    else:
+        msgs = baseline.regressions(key, metrics, tolerance)
+        if msgs:
+            pytest.fail(f"Performance regression in {key}:\n" + "\n".join(f"  {msg}" for msg in msgs), pytrace=False)
+    return result
@@ -8,6 +8,7 @@ from abc import ABC
 from dataclasses import dataclass
 from typing import Any, Sequence, Union
 
+from utz.environ import Snapshot, current
 from utz.process.log import Log
 from utz.process.util import Arg, Elides, flatten, ELIDED
 
@@ -28,6 +29,11 @@ class Cmd(ABC):
         if log:
             log(f'Running: {self}')
         args, kwargs = self._compile()
+        env = kwargs.get('env')
+        if env is None:
+            env = current()
+        if isinstance(env, Snapshot):
+            kwargs['env'] = env.dict()
         if both:
             if 'stderr' in kwargs and kwargs['stderr'] is not STDOUT:
                 raise ValueError(f"`both=True` conflicts with `stderr={kwargs['stderr']}`")
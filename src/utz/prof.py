@@ -0,0 +1,188 @@
+"""CPU profiling context manager: the CPU counterpart to ``utz.mem.Tracker``.
+
+Samples the profiled thread's stack on a timer thread (``mode="sample"``), aggregating "collapsed" stacks, the input
+format for ``flamegraph.pl``, speedscope, etc. ``mode="cprofile"`` runs ``cProfile`` instead (deterministic, but with
+higher overhead).
+"""
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from contextlib import AbstractContextManager, AbstractAsyncContextManager
+from os import environ, makedirs
+from os.path import basename, dirname
+from threading import Event, Thread, get_ident
+from time import perf_counter
+from types import FrameType, TracebackType
+from typing import Literal, TYPE_CHECKING
+
+from utz import err
+from utz.process.log import Log, silent
+
+if TYPE_CHECKING:
+    # `typing.Self` requires Python ≥3.11
+    from typing_extensions import Self
+
+Mode = Literal['sample', 'cprofile', 'auto']
+
+# Set to "0" to make all `Tracker`s no-ops
+ENV_VAR = 'UTZ_PROF'
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f'{code.co_name} ({basename(code.co_filename)}:{code.co_firstlineno})'.replace(';', ':')
+
+
+def collapse(frame: FrameType | None, root: FrameType | None = None) -> str:
+    """Render ``frame``'s stack (outermost first, starting from ``root``, if it's on the stack) as a ``;``-delimited
+    string."""
+    labels = []
+    while frame is not None:
+        labels.append(frame_label(frame))
+        if frame is root:
+            break
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class Tracker(AbstractContextManager, AbstractAsyncContextManager):
+    """Profile CPU use of the code in a ``with`` (or ``async with``) block.
+
+    In ``"sample"`` mode, a daemon thread wakes every ``interval`` seconds and records the stack of the thread that
+    entered the block (or of every other thread, with ``all_threads=True``). After exit:
+    - ``stacks``: ``Counter`` of collapsed stacks (``"outer;…;inner"`` → sample count)
+    - ``samples``, ``duration``: number of samples taken, wall-clock seconds profiled
+    - ``path`` (if provided): collapsed stacks written one per line (``<stack> <count>``), for ``flamegraph.pl`` et al.
+
+    ``"cprofile"`` mode runs ``cProfile``, and exposes a ``pstats.Stats`` as ``stats`` (``path``, if provided, receives
+    a ``.prof`` dump); ``"auto"`` samples where ``sys._current_frames`` is available, and falls back to ``cProfile``
+    otherwise. With ``enabled=False`` (or ``$UTZ_PROF=0``), the tracker does nothing.
+    """
+    def __init__(
+        self,
+        path: str | None = None,
+        mode: Mode = 'auto',
+        interval: float = .005,
+        all_threads: bool = False,
+        enabled: bool | None = None,
+        log: Log | bool = None,
+    ):
+        if mode not in ('sample', 'cprofile', 'auto'):
+            raise ValueError(f"Unrecognized mode: {mode}")
+        if mode == 'auto':
+            mode = 'sample' if hasattr(sys, '_current_frames') else 'cprofile'
+        self.path = path
+        self.mode = mode
+        self.interval = interval
+        self.all_threads = all_threads
+        if enabled is None:
+            enabled = environ.get(ENV_VAR, '1') not in ('0', '')
+        self.enabled = enabled
+        if log is True:
+            log = err
+        elif not log:
+            log = silent
+        self.log = log
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self.duration = None
+        self.stats = None
+        self._profile = None
+        self._thread: Thread | None = None
+        self._stop = Event()
+        self._target = None
+        self._root = None
+        self._start = None
+
+    def _sample(self):
+        me = get_ident()
+        root = self._root
+        stacks = self.stacks
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            if self.all_threads:
+                for tid, frame in frames.items():
+                    if tid != me:
+                        stacks[collapse(frame)] += 1
+            else:
+                frame = frames.get(self._target)
+                if frame is None:
+                    continue
+                stacks[collapse(frame, root)] += 1
+            self.samples += 1
+
+    def __enter__(self, depth: int = 1) -> Self:
+        if not self.enabled:
+            return self
+        assert self._thread is None and self._profile is None, "Attempted to `__enter__` prof.Tracker before `__exit__`ing"
+        self.stacks = Counter()
+        self.samples = 0
+        self.duration = self.stats = None
+        self._start = perf_counter()
+        if self.mode == 'sample':
+            self._target = get_ident()
+            # Sampled stacks start from the frame containing the `with` block (omitting its callers)
+            self._root = sys._getframe(depth)
+            self._stop.clear()
+            self._thread = Thread(target=self._sample, name='utz.prof', daemon=True)
+            self._thread.start()
+        else:
+            from cProfile import Profile
+            self._profile = Profile()
+            self._profile.enable()
+        return self
+
+    async def __aenter__(self) -> Self:
+        return self.__enter__(depth=2)
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_tb: TracebackType | None,
+    ):
+        if not self.enabled:
+            return
+        if self.mode == 'sample':
+            self._stop.set()
+            self._thread.join()
+            self._thread = self._root = None
+        else:
+            self._profile.disable()
+            from pstats import Stats
+            self.stats = Stats(self._profile)
+        self.duration = perf_counter() - self._start
+        if self.path:
+            self.write(self.path)
+        self._profile = None
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        exc_tb: TracebackType | None,
+    ):
+        self.__exit__(exc_type, exc_value, exc_tb)
+
+    def collapsed(self) -> str:
+        """Collapsed stacks, one ``<stack> <count>`` per line (most-sampled first)."""
+        return ''.join(f'{stack} {n}\n' for stack, n in self.stacks.most_common())
+
+    def top(self, n: int = 10) -> list[tuple[str, int]]:
+        """Frames most often at the top of sampled stacks ("self" samples)."""
+        tops = Counter()
+        for stack, count in self.stacks.items():
+            tops[stack.rpartition(';')[2]] += count
+        return tops.most_common(n)
+
+    def write(self, path: str):
+        """Write collapsed stacks (``"sample"`` mode) or a ``.prof`` dump (``"cprofile"`` mode) to ``path``."""
+        if dirname(path):
+            makedirs(dirname(path), exist_ok=True)
+        if self.mode == 'sample':
+            with open(path, 'w') as f:
+                f.write(self.collapsed())
+        else:
+            self.stats.dump_stats(path)
+        self.log(f"prof.Tracker wrote {path}")
@@ -2,14 +2,65 @@ from __future__ import annotations
 
 import re
 
-from typing import Sequence
+from typing import Callable, Iterable, Sequence
 
 from re import Pattern
 
 from abc import ABC
 
+# Regex metacharacters; patterns containing none of these match only themselves
+META = frozenset('.^$*+?{}[]\\|()')
+# Constructs whose meaning depends on group numbering/naming, which combining patterns would break
+BACKREF = re.compile(r'\\[1-9]|\(\?P=|\(\?\(')
+
+
+def is_literal(pat: str) -> bool:
+    return not META.intersection(pat)
+
+
+def literal_trie(lits: Iterable[str], search: bool = True) -> str:
+    """Build a regex matching any of ``lits``, factored into a prefix-trie (e.g. ``['abc', 'abd']`` → ``ab(?:c|d)``).
+
+    In ``search`` mode, literals extending another literal are redundant (any string containing ``abc`` also contains
+    ``ab``), and are pruned.
+    """
+    trie = {}
+    for lit in lits:
+        node = trie
+        for ch in lit:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def emit(node: dict) -> str:
+        if '' in node and search:
+            return ''
+        alts = []
+        for ch, child in sorted(node.items()):
+            if not ch:
+                continue
+            # Walk single-child chains iteratively
+            prefix = ch
+            while len(child) == 1 and '' not in child:
+                (ch, child), = child.items()
+                prefix += ch
+            alts.append(re.escape(prefix) + emit(child))
+        if not alts:
+            return ''
+        body = alts[0] if len(alts) == 1 else f'(?:{"|".join(alts)})'
+        if '' in node:
+            body = f'{body}?' if len(alts) > 1 else f'(?:{body})?'
+        return body
+
+    return emit(trie)
+
 
 class Patterns(ABC):
+    """Filter strings by a list of regexs (``search``ed, or ``fullmatch``ed if ``search=False``).
+
+    Patterns are combined into a single alternation regex (with literal patterns factored into a prefix-trie, or, in
+    ``fullmatch`` mode, checked via ``set`` membership), so each value is tested with one regex call. Patterns that
+    can't be safely combined (mixed flags, backreferences, etc.) fall back to being tested one at a time.
+    """
     def __init__(
         self,
         pats: Sequence[str | Pattern] | None,
@@ -24,17 +75,73 @@ class Patterns(ABC):
             for pat in pats
         ]
         self.search = search
+        self.lits: frozenset[str] | None = None
+        self.rgx: Pattern | None = None
+        self.fallback: list[Pattern] | None = None
+        self._match = None
+        if self.pats is not None:
+            self._combine()
+            self._match = self.matcher()
+
+    def _combine(self):
+        pats = self.pats
+        flags = { pat.flags for pat in pats }
+        if (
+            not pats or
+            len(flags) > 1 or
+            any(not isinstance(pat.pattern, str) or BACKREF.search(pat.pattern) for pat in pats)
+        ):
+            self.fallback = pats
+            return
+        flags = flags.pop()
+        verbose = flags & re.VERBOSE
+        lits = [ pat.pattern for pat in pats if not verbose and is_literal(pat.pattern) ]
+        rest = [ pat.pattern for pat in pats if verbose or not is_literal(pat.pattern) ]
+        alts = []
+        if lits:
+            if self.search or flags & re.IGNORECASE:
+                alts.append(literal_trie(lits, search=self.search))
+            else:
+                self.lits = frozenset(lits)
+        alts += [ f'(?:{pat})' for pat in rest ]
+        if alts:
+            try:
+                self.rgx = re.compile('|'.join(alts), flags=flags)
+            except re.error:
+                # E.g. global inline flags (``(?i)``) that aren't at the start of the combined pattern
+                self.lits = None
+                self.fallback = pats
 
     def __bool__(self) -> bool:
         return self.pats is not None
 
+    def matcher(self) -> Callable[[str], bool]:
+        """Return a function testing whether a value matches any pattern."""
+        lits, rgx, fallback = self.lits, self.rgx, self.fallback
+        if fallback is not None:
+            search = self.search
+            return lambda val: any(pat.search(val) if search else pat.fullmatch(val) for pat in fallback)
+        match = None if rgx is None else rgx.search if self.search else rgx.fullmatch
+        if lits is None:
+            return lambda val: match(val) is not None
+        elif match is None:
+            return lits.__contains__
+        else:
+            return lambda val: val in lits or match(val) is not None
+
     def __call__(self, val: str) -> bool:
-        pats = self.pats
         if not self:
             # `pats is None` ⟹ everything passes this filter
             return True
         else:
-            return any(pat.search(val) if self.search else pat.fullmatch(val) for pat in pats)
+            return self._match(val)
+
+    def filter(self, vals: Iterable[str]) -> list[str]:
+        """Return the elements of ``vals`` that pass this filter."""
+        if not self:
+            return list(vals)
+        match = self._match
+        return [ val for val in vals if match(val) ]
 
 
 class Includes(Patterns):
@@ -47,3 +154,9 @@ class Excludes(Patterns):
             return True
         else:
             return not super().__call__(val)
+
+    def filter(self, vals: Iterable[str]) -> list[str]:
+        if not self:
+            return list(vals)
+        match = self._match
+        return [ val for val in vals if not match(val) ]
@@ -1,11 +1,192 @@
+"""SSH tunnels (``ssh -L`` port forwards) as context managers.
+
+On POSIX, tunnels to the same proxy share one authenticated ``ControlMaster`` connection (kept alive for
+``ControlPersist`` after last use); each forward is added/removed with ``ssh -O forward``/``-O cancel``, which doesn't
+re-authenticate. ``Pool`` reuses live forwards across callers.
+"""
+from __future__ import annotations
+
+import atexit
+import os
+import socket
 import subprocess
 from contextlib import AbstractContextManager
-from subprocess import CalledProcessError, PIPE, Popen
+from hashlib import sha1
+from os.path import exists, join
+from subprocess import CalledProcessError, DEVNULL, PIPE, Popen
+from tempfile import gettempdir
+from threading import Lock
+from typing import Sequence
+
+from utz.backoff import Backoff, BackoffTimeout
+
+Ssh = str | Sequence[str]
+
+
+def wait_port(
+    host: str,
+    port: int | str,
+    timeout: float = 10,
+    base: float = .001,
+    cap: float = .1,
+    proc: Popen | None = None,
+) -> float:
+    """Wait for ``host:port`` to accept TCP connections, retrying ``connect`` with exponential backoff (starting at
+    ``base`` seconds, capped at ``cap``) for up to ``timeout`` seconds; returns the time waited.
+
+    If ``proc`` (e.g. the ``ssh`` process that should be listening) exits first, raises ``CalledProcessError``.
+    """
+    def connect():
+        if proc is not None and proc.poll() is not None:
+            raise CalledProcessError(proc.returncode, proc.args)
+        with socket.create_connection((host, int(port)), timeout=cap):
+            pass
+
+    backoff = Backoff(base=base, cap=cap, jitter=None, tries=None, deadline=timeout, exc=OSError)
+    try:
+        backoff.run(connect)
+    except BackoffTimeout as e:
+        raise TimeoutError(f"{host}:{port} not accepting connections after {timeout}s") from e.last
+    return backoff.stats.elapsed
+
+
+def is_open(host: str, port: int | str, timeout: float = .1) -> bool:
+    try:
+        with socket.create_connection((host, int(port)), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+class Master:
+    """A ``ControlMaster`` connection to ``proxy``, whose control socket lives in ``control_dir``."""
+    def __init__(
+        self,
+        proxy: str,
+        control_dir: str | None = None,
+        persist: str = '10m',
+        ssh: Ssh = 'ssh',
+        timeout: float = 30,
+    ):
+        self.proxy = proxy
+        self.ssh = [ ssh ] if isinstance(ssh, str) else list(ssh)
+        self.persist = persist
+        self.timeout = timeout
+        control_dir = control_dir or join(gettempdir(), f'utz-ssh-{os.getuid()}')
+        os.makedirs(control_dir, mode=0o700, exist_ok=True)
+        # Unix socket paths are limited to ~100 chars; hash the proxy name
+        self.path = join(control_dir, sha1(proxy.encode()).hexdigest()[:16])
+        self.lock = Lock()
+        # Bumped each time a master connection is started; forwards added to one connection don't survive the next
+        self.generation = 0
+        # Reference counts of ``-L`` specs forwarded over the current connection, shared by ``Tunnel``s
+        self.forwards: dict[str, int] = {}
+        self.forwards_lock = Lock()
+
+    def _cmd(self, *args: str) -> list[str]:
+        return [ *self.ssh, '-o', f'ControlPath={self.path}', *args, self.proxy ]
+
+    def alive(self) -> bool:
+        if not exists(self.path):
+            return False
+        return not subprocess.run(self._cmd('-O', 'check'), stdout=DEVNULL, stderr=DEVNULL).returncode
+
+    def _start(self):
+        if exists(self.path):
+            os.unlink(self.path)
+        self.generation += 1
+        self.forwards.clear()
+        subprocess.run(
+            self._cmd('-f', '-N', '-o', 'ControlMaster=yes', '-o', f'ControlPersist={self.persist}'),
+            stdin=DEVNULL,
+            check=True,
+            timeout=self.timeout,
+        )
+
+    def start(self):
+        """Authenticate and background a master connection (replacing any stale control socket)."""
+        with self.lock:
+            self._start()
+
+    def ensure(self):
+        with self.lock:
+            if not exists(self.path):
+                self._start()
+
+    def control(self, op: str, *args: str, start: bool | None = None):
+        """Run ``ssh -O <op> …`` against the master, starting (or restarting) it if necessary.
+
+        With ``start=False`` (the default for ``cancel``/``exit``), a dead master is left alone and the request is
+        skipped, so e.g. closing a tunnel never re-authenticates just to tear down a forward.
+        """
+        if start is None:
+            start = op not in ('cancel', 'exit')
+        if not start and not self.alive():
+            return
+        if start:
+            self.ensure()
+        cmd = self._cmd('-O', op, *args)
+        p = subprocess.run(cmd, stdout=PIPE, stderr=PIPE, timeout=self.timeout)
+        if p.returncode and start:
+            with self.lock:
+                restarted = not self.alive()
+                if restarted:
+                    self._start()
+            if restarted:
+                p = subprocess.run(cmd, stdout=PIPE, stderr=PIPE, timeout=self.timeout)
+        if p.returncode:
+            raise CalledProcessError(p.returncode, cmd, p.stdout, p.stderr)
 
-from utz import backoff, check
+    def forward(self, spec: str) -> int:
+        """Add ``-L spec`` to the master (sharing it, if another ``Tunnel`` already forwards ``spec`` over the current
+        connection); return the generation of the connection the forward lives on."""
+        with self.forwards_lock:
+            if self.forwards.get(spec) and self.alive():
+                self.forwards[spec] += 1
+            else:
+                self.control('forward', '-L', spec)
+                self.forwards[spec] = 1
+            return self.generation
+
+    def cancel(self, spec: str, generation: int):
+        """Release a forward returned by ``forward``; ``-O cancel`` it once no other ``Tunnel`` uses it (and only if
+        it is still on the connection that added it)."""
+        with self.forwards_lock:
+            if generation != self.generation or not self.forwards.get(spec):
+                return
+            self.forwards[spec] -= 1
+            if self.forwards[spec]:
+                return
+            del self.forwards[spec]
+            self.control('cancel', '-L', spec)
+
+    def stop(self):
+        self.forwards.clear()
+        if exists(self.path):
+            subprocess.run(self._cmd('-O', 'exit'), stdout=DEVNULL, stderr=DEVNULL)
+
+
+_masters: dict[tuple, Master] = {}
+_masters_lock = Lock()
+
+
+def master(proxy: str, control_dir: str | None = None, persist: str = '10m', ssh: Ssh = 'ssh') -> Master:
+    """Return the (shared) ``Master`` for ``proxy``."""
+    key = (proxy, control_dir, persist, ssh if isinstance(ssh, str) else tuple(ssh))
+    with _masters_lock:
+        m = _masters.get(key)
+        if m is None:
+            m = _masters[key] = Master(proxy, control_dir=control_dir, persist=persist, ssh=ssh)
+        return m
 
 
 class Tunnel(AbstractContextManager):
+    """Forward ``src_host:src_port`` to ``dst:dst_port`` (as seen from ``proxy``).
+
+    With ``multiplex`` (default: on POSIX), the forward is added to a shared ``Master`` connection; otherwise, a
+    dedicated ``ssh -N -L`` process is started. Entering returns once ``src_host:src_port`` accepts connections (polled
+    with millisecond-scale backoff, for up to ``timeout`` seconds, starting after ``sleep``).
+    """
     def __init__(
         self,
         proxy,
@@ -13,8 +194,12 @@ class Tunnel(AbstractContextManager):
         dst='localhost',
         dst_port=None,
         src_host='localhost',
-        sleep=1,
-        timeout=1,
+        sleep=0,
+        timeout=10,
+        multiplex: bool | None = None,
+        control_dir: str | None = None,
+        persist: str = '10m',
+        ssh: Ssh = 'ssh',
     ):
         src_port = str(src_port)
         dst_host = dst
@@ -33,34 +218,111 @@ class Tunnel(AbstractContextManager):
         self.sleep = sleep
         self.timeout = timeout
 
+        if multiplex is None:
+            multiplex = os.name == 'posix'
+        self.multiplex = multiplex
+        self.control_dir = control_dir
+        self.persist = persist
+        self.ssh = ssh
+        self.proc: Popen | None = None
+        self.master: Master | None = None
+        self.generation: int | None = None
+
     @property
     def src(self): return f'{self.src_host}:{self.src_port}'
 
     @property
     def dst(self): return f'{self.dst_host}:{self.dst_port}'
 
+    @property
+    def spec(self): return f'{self.src}:{self.dst}'
+
     def start(self):
         return self.__enter__()
 
+    def alive(self) -> bool:
+        """Whether this tunnel's forward is (still) in place: the master connection it was added to is still the current
+        one and answers on its control socket, or its dedicated ``ssh`` process is running. Doesn't connect through the
+        tunnel."""
+        if self.multiplex:
+            master = self.master
+            return master is not None and self.generation == master.generation and master.alive()
+        return self.proc is not None and self.proc.poll() is None
+
     def __enter__(self):
-        self.proc = Popen(['ssh','-N','-L',f'{self.src}:{self.dst}',self.proxy])
+        if self.multiplex:
+            self.master = master(self.proxy, control_dir=self.control_dir, persist=self.persist, ssh=self.ssh)
+            self.generation = self.master.forward(self.spec)
+        else:
+            ssh = [ self.ssh ] if isinstance(self.ssh, str) else list(self.ssh)
+            self.proc = Popen([ *ssh, '-N', '-L', self.spec, self.proxy ], stdin=DEVNULL)
         try:
-            if not check('which','telnet'):
-                raise RuntimeError("`telnet` required to test SSH connection")
-
-            def check_ssh():
-                # Verify telnet connectivity
-                cmd = ['telnet',self.src_host,self.src_port]
-                p = subprocess.run(cmd, input=b'\035\n', stderr=PIPE, timeout=self.timeout)
-                if p.returncode:
-                    raise CalledProcessError(p.returncode, cmd)
+            if self.sleep:
+                from time import sleep
+                sleep(self.sleep)
+            wait_port(self.src_host, self.src_port, timeout=self.timeout, proc=self.proc)
+        except BaseException:
+            self.close()
+            raise
+        return self
 
-            backoff(check_ssh, init=self.sleep, max=5, exc=CalledProcessError)
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if self.master is not None:
+            master, self.master = self.master, None
+            generation, self.generation = self.generation, None
+            try:
+                master.cancel(self.spec, generation)
+            except CalledProcessError:
+                pass
+        if self.proc is not None:
+            proc, self.proc = self.proc, None
+            proc.kill()
+            proc.wait()
 
-        except Exception as e:
-            self.proc.kill()
-            raise e
-
-    def __exit__(self, exc_type, exc_val, exc_tb): self.proc.kill()
     def stop(self): self.__exit__(None, None, None)
     def close(self): self.__exit__(None, None, None)
+
+
+class Pool:
+    """Reuse live ``Tunnel``s, keyed by ``(proxy, src, dst)``; tunnels stay open until ``close()``.
+
+    ``kwargs`` are defaults for the ``Tunnel``s' constructor.
+    """
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.tunnels: dict[tuple[str, str, str], Tunnel] = {}
+        self.lock = Lock()
+
+    def get(self, proxy, src_port, dst='localhost', dst_port=None, src_host='localhost', **kwargs) -> Tunnel:
+        """Return a live tunnel for these endpoints, opening one if necessary."""
+        tunnel = Tunnel(proxy, src_port, dst, dst_port, src_host, **{ **self.kwargs, **kwargs })
+        key = (proxy, tunnel.src, tunnel.dst)
+        with self.lock:
+            existing = self.tunnels.get(key)
+            if existing is not None:
+                if existing.alive():
+                    return existing
+                existing.close()
+            tunnel.start()
+            self.tunnels[key] = tunnel
+            return tunnel
+
+    def __len__(self):
+        return len(self.tunnels)
+
+    def close(self):
+        with self.lock:
+            tunnels = list(self.tunnels.values())
+            self.tunnels.clear()
+        for tunnel in tunnels:
+            tunnel.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+tunnels = Pool()
+atexit.register(tunnels.close)
@@ -34,6 +34,7 @@ def parametrize(
     *cases: Case | Iterable[Case],
     delim: str = "-",
     id_fmts: dict[str | tuple[str], IdFmtField] | None = None,
+    perf: bool | dict | None = None,
     **sweeps,
 ):
     """"Parametrize" [sic] a test function with a list of test-"case"s (instances of a dataclass).
@@ -49,6 +50,9 @@ def parametrize(
     ``**sweeps`` supports parameter sweeps, where ``cases`` is "Cartesian product"-ed against a
      series of ``(str, list[Any])`` pairs (where the "key" is a dataclass-field name).
 
+    ``perf`` applies a ``pytest.mark.perf`` marker (``True``, or a ``dict`` of marker kwargs), so that each case's
+    time and memory use are checked against a baseline, keyed by case ID (see ``utz.perf``).
+
     Adapted/Extended from https://github.com/single-cell-data/TileDB-SOMA/blob/1.14.2/apis/python/tests/parametrize_cases.py.
     """
     # Flatten the ``cases`` varargs. Sometimes it's convenient to pass a Generator as a single arg
@@ -78,6 +82,7 @@ def parametrize(
             ],
             delim=delim,
             id_fmts=id_fmts,
+            perf=perf,
             **sweeps,
         )
 
@@ -183,6 +188,9 @@ def parametrize(
 
         import pytest
 
+        if perf:
+            fn = pytest.mark.perf(**(perf if isinstance(perf, dict) else {}))(fn)
+
         # Delegate to PyTest `parametrize`
         return pytest.mark.parametrize(
             fn_arg_names,  # List of kwarg ("key") names that match eligible ``Case`` class members
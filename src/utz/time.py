@@ -1,12 +1,17 @@
 from __future__ import annotations
 
 from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+from math import ceil, inf, log
+from threading import get_ident
 
 from typing import KeysView, ItemsView, ValuesView, Callable
 
 from datetime import datetime as dt, timezone
 from sys import stderr
-from time import perf_counter
+from time import perf_counter, perf_counter_ns
 from types import TracebackType
 
 from utz.proc import err
@@ -128,6 +133,322 @@ class Time:
         return self.times.items()
 
 
+class Sketch:
+    """Streaming quantile sketch with bounded relative error (cf. DDSketch).
+
+    Positive values are counted in logarithmically-sized buckets (each spanning a factor of ``gamma = (1+α)/(1-α)``),
+    so any quantile is estimated to within relative error ``α``, and memory is bounded by the dynamic range of the data
+    (≈1.2k buckets for ``α=.01`` across 1ns–1hr), not the number of values.
+    """
+    __slots__ = ('alpha', 'gamma', '_inv_log_gamma', 'buckets', 'zeros', 'count')
+
+    def __init__(self, alpha: float = .01):
+        self.alpha = alpha
+        self.gamma = (1 + alpha) / (1 - alpha)
+        self._inv_log_gamma = 1 / log(self.gamma)
+        self.buckets: dict[int, int] = {}
+        self.zeros = 0
+        self.count = 0
+
+    def add(self, v: float):
+        self.count += 1
+        if v <= 0:
+            self.zeros += 1
+            return
+        idx = ceil(log(v) * self._inv_log_gamma)
+        buckets = self.buckets
+        buckets[idx] = buckets.get(idx, 0) + 1
+
+    def merge(self, other: Sketch):
+        if other.alpha != self.alpha:
+            raise ValueError(f"Can't merge sketches with different accuracies ({self.alpha} vs. {other.alpha})")
+        self.count += other.count
+        self.zeros += other.zeros
+        for idx, n in other.buckets.items():
+            self.buckets[idx] = self.buckets.get(idx, 0) + n
+
+    def quantile(self, q: float) -> float | None:
+        """Estimate the ``q``-th quantile (``0 ≤ q ≤ 1``); ``None`` if empty."""
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zeros
+        if rank < seen:
+            return 0.
+        for idx in sorted(self.buckets):
+            seen += self.buckets[idx]
+            if rank < seen:
+                return 2 * self.gamma ** idx / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class SpanStats:
+    """Count, total, min, max, and (sketched) quantiles of one span's durations (in ns), plus child spans, keyed by
+    name."""
+    __slots__ = ('name', 'parent', 'children', 'count', 'total', 'min', 'max', 'sketch')
+
+    def __init__(self, name: str | None = None, parent: SpanStats | None = None, alpha: float = .01):
+        self.name = name
+        self.parent = parent
+        self.children: dict[str, SpanStats] = {}
+        self.count = 0
+        self.total = 0
+        # Sentinels, so that updates needn't check for `None`; see `summary`
+        self.min = inf
+        self.max = -1
+        self.sketch = Sketch(alpha)
+
+    def child(self, name: str) -> SpanStats:
+        child = self.children.get(name)
+        if child is None:
+            child = self.children[name] = SpanStats(name, self, self.sketch.alpha)
+        return child
+
+    def add(self, ns: int):
+        self.count += 1
+        self.total += ns
+        if ns < self.min:
+            self.min = ns
+        if ns > self.max:
+            self.max = ns
+        self.sketch.add(ns)
+
+    def merge(self, other: SpanStats):
+        """Fold ``other``'s durations (not its children) into this node."""
+        if not other.count:
+            return
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+
+    @property
+    def path(self) -> tuple[str, ...]:
+        node, path = self, []
+        while node.parent is not None:
+            path.append(node.name)
+            node = node.parent
+        return tuple(reversed(path))
+
+    @property
+    def mean(self) -> float | None:
+        """Mean duration, in seconds."""
+        return self.total / self.count / 1e9 if self.count else None
+
+    def quantile(self, q: float) -> float | None:
+        """Estimated ``q``-th quantile duration, in seconds."""
+        v = self.sketch.quantile(q)
+        return None if v is None else v / 1e9
+
+    def summary(self, quantiles=(.5, .9, .99)) -> dict:
+        """Stats as a ``dict`` (durations in seconds)."""
+        return dict(
+            count=self.count,
+            total=self.total / 1e9,
+            min=self.min / 1e9 if self.count else None,
+            max=self.max / 1e9 if self.count else None,
+            mean=self.mean,
+            **{ f'p{q * 100:g}': self.quantile(q) for q in quantiles },
+        )
+
+    def walk(self):
+        """Yield this node and its descendants, depth-first."""
+        yield self
+        for child in self.children.values():
+            yield from child.walk()
+
+
+class Span:
+    """One timed execution of a named span; see ``Spans.span``."""
+    __slots__ = ('spans', 'name', 'node', 'token', 'start')
+
+    def __init__(self, spans: Spans, name: str):
+        self.spans = spans
+        self.name = name
+
+    def __enter__(self):
+        spans = self.spans
+        node = spans._current.get()
+        node = node.children.get(self.name) or node.child(self.name)
+        self.node = node
+        self.token = spans._current.set(node)
+        self.start = perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        end = perf_counter_ns()
+        ns = end - self.start
+        spans = self.spans
+        spans._current.reset(self.token)
+        # Inlined `SpanStats.add` / `Sketch.add`
+        node = self.node
+        node.count += 1
+        node.total += ns
+        if ns < node.min:
+            node.min = ns
+        if ns > node.max:
+            node.max = ns
+        sketch = node.sketch
+        sketch.count += 1
+        if ns > 0:
+            idx = ceil(log(ns) * sketch._inv_log_gamma)
+            buckets = sketch.buckets
+            buckets[idx] = buckets.get(idx, 0) + 1
+        else:
+            sketch.zeros += 1
+        events = spans.events
+        if events is not None:
+            if len(events) < spans.max_events:
+                events.append((node, self.start, end, get_ident()))
+            else:
+                spans.dropped += 1
+
+    async def __aenter__(self):
+        return self.__enter__()
+
+    async def __aexit__(self, exc_type, exc_value, exc_tb):
+        self.__exit__(exc_type, exc_value, exc_tb)
+
+
+class Spans(Time):
+    """``Time`` extension that aggregates nested, repeated spans.
+
+    Each span name, under each parent span, accumulates count, total, min, max, and streaming-quantile stats (see
+    ``Sketch``), in memory independent of the number of executions. The current span is tracked in a ``ContextVar``, so
+    ``asyncio`` tasks nest under the span that was active when they were created, and don't interfere with one another.
+
+    >>> spans = Spans()
+    >>> with spans.span("load"):
+    >>>     for row in rows:
+    >>>         with spans.span("parse"):
+    >>>             parse(row)
+    >>> print(spans.tree())
+    >>> spans["load", "parse"].quantile(.99)
+
+    ``Time``-style timers (``spans("name")``) are recorded under the current span too. Individual executions are kept
+    (up to ``max_events``) for ``chrome_trace`` export; pass ``max_events=0`` to disable this.
+    """
+    def __init__(
+        self,
+        log: str | True | Callable[[str, float], str] | None = None,
+        alpha: float = .01,
+        max_events: int = 100_000,
+    ):
+        super().__init__(log=log)
+        self.root = SpanStats(alpha=alpha)
+        self._current: ContextVar[SpanStats] = ContextVar(f'spans-{id(self)}', default=self.root)
+        self.max_events = max_events
+        # (node, start ns, end ns, thread ID)
+        self.events: list[tuple[SpanStats, int, int, int]] | None = [] if max_events else None
+        self.dropped = 0
+        self.t0 = perf_counter_ns()
+
+    def span(self, name: str) -> Span:
+        """Context manager (sync or ``async``) timing one execution of span ``name``, nested under the current span."""
+        return Span(self, name)
+
+    def wrap(self, name: str | None = None):
+        """Decorator recording each call of a (sync or ``async``) function as a span (named for the function, by
+        default)."""
+        def wrapper(fn):
+            span_name = name or fn.__qualname__
+            if iscoroutinefunction(fn):
+                @wraps(fn)
+                async def _fn(*args, **kwargs):
+                    with Span(self, span_name):
+                        return await fn(*args, **kwargs)
+            else:
+                @wraps(fn)
+                def _fn(*args, **kwargs):
+                    with Span(self, span_name):
+                        return fn(*args, **kwargs)
+            return _fn
+        return wrapper
+
+    def save(self, name: str, duration: float):
+        super().save(name, duration)
+        self._current.get().child(name).add(int(duration * 1e9))
+
+    def __getitem__(self, name: str | tuple[str, ...]) -> float | SpanStats:
+        """``Time``-style latest duration of timer ``name``, or (for a tuple path) the ``SpanStats`` node at that
+        path."""
+        if isinstance(name, tuple):
+            node = self.root
+            for piece in name:
+                node = node.children[piece]
+            return node
+        return super().__getitem__(name)
+
+    def flat(self) -> dict[str, SpanStats]:
+        """Stats per span name, merged across all the places in the tree each name occurs."""
+        flat: dict[str, SpanStats] = {}
+        for node in self.root.walk():
+            if node is self.root:
+                continue
+            if node.name not in flat:
+                flat[node.name] = SpanStats(node.name, alpha=node.sketch.alpha)
+            flat[node.name].merge(node)
+        return flat
+
+    def tree(self, quantiles=(.5, .99), fmt: str = '.3g') -> str:
+        """Render the span tree as text: one line per node, with count, total, mean, quantiles, and max durations."""
+        def fmt_s(v):
+            if v is None:
+                return '-'
+            for unit, scale in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+                if v >= scale:
+                    return f'{v / scale:{fmt}}{unit}'
+            return f'{v / 1e-9:{fmt}}ns'
+
+        header = [ 'span', 'count', 'total', 'mean', *[ f'p{q * 100:g}' for q in quantiles ], 'max' ]
+        rows = [ header ]
+        for node in self.root.walk():
+            if node is self.root:
+                continue
+            rows.append([
+                '  ' * (len(node.path) - 1) + node.name,
+                str(node.count),
+                fmt_s(node.total / 1e9),
+                fmt_s(node.mean),
+                *[ fmt_s(node.quantile(q)) for q in quantiles ],
+                fmt_s(node.max / 1e9 if node.count else None),
+            ])
+        widths = [ max(len(row[i]) for row in rows) for i in range(len(header)) ]
+        return '\n'.join(
+            '  '.join(
+                cell.ljust(width) if i == 0 else cell.rjust(width)
+                for i, (cell, width) in enumerate(zip(row, widths))
+            ).rstrip()
+            for row in rows
+        )
+
+    def chrome_trace(self, path: str | None = None, pid: int = 1) -> dict:
+        """Export recorded span executions as Chrome trace-event JSON (viewable in ``chrome://tracing`` / Perfetto);
+        written to ``path``, if provided.
+
+        Events are keyed by thread; concurrent ``asyncio`` tasks on one thread may render as overlapping.
+        """
+        events = [
+            dict(
+                name=node.name,
+                cat='/'.join(node.path[:-1]) or 'span',
+                ph='X',
+                ts=(start - self.t0) / 1e3,
+                dur=(end - start) / 1e3,
+                pid=pid,
+                tid=tid,
+            )
+            for node, start, end, tid in (self.events or [])
+        ]
+        trace = dict(traceEvents=events, displayTimeUnit='ms', otherData=dict(dropped=self.dropped))
+        if path:
+            import json
+            with open(path, 'w') as f:
+                json.dump(trace, f)
+        return trace
+
+
 class now:
     try:
         from pytz import UTC
@@ -1,28 +1,101 @@
 from importlib.metadata import version, PackageNotFoundError
+from os import stat
+from os.path import join
 from pathlib import Path
 from re import fullmatch
 from subprocess import CalledProcessError
+from time import monotonic
 
+from .git.repo import common_dir, git_dir, read_head
 from .proc import line
 
 
 VERSION_TAG_REGEX = r"v?(?P<version>(?P<base>\d+\.\d+\.\d+)(?P<rc>(?:r|c|rc|a|b)\d+)?(?:-(?P<commits_ahead>\d+)-g(?P<sha>[0-9a-f]{6,}))?)"
 
 
-def git_version():
-    """Infer version from git tag of the form "v_._._"; otherwise, return current Git commit SHA"""
+# Memoized `git describe`s and dirty checks; keys include the `HEAD` SHA, and mtimes of files the results depend on
+_cache = {}
+
+# Seconds for which a memoized dirty check is reused (worktree edits don't touch the index, so can't invalidate it)
+DIRTY_TTL = 1.
+
+
+def _mtime(path: str) -> int | None:
+    try:
+        return stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _head_key(cwd: str | None = None) -> tuple | None:
+    """``(git dir, HEAD ref, HEAD SHA)``, read without forking; ``None`` if ``HEAD`` can't be resolved that way."""
+    gitdir = git_dir(cwd)
+    head = read_head(cwd) if gitdir else None
+    if not head or not head[1]:
+        return None
+    return (gitdir, *head)
+
+
+def git_version(cwd: str = None):
+    """Infer version from git tag of the form "v_._._"; otherwise, return current Git commit SHA.
+
+    Memoized per ``HEAD`` commit (and state of the repo's tags).
+    """
+    head = _head_key(cwd)
+    key = None
+    if head:
+        common = common_dir(cwd)
+        key = ('describe', *head, _mtime(join(common, 'refs', 'tags')), _mtime(join(common, 'packed-refs')))
+        if key in _cache:
+            return _cache[key]
+
+    kwargs = dict(cwd=cwd) if cwd else {}
     try:
-        tag = line('git', 'describe', '--tags', 'HEAD')
+        tag = line('git', 'describe', '--tags', 'HEAD', **kwargs)
         m = fullmatch(VERSION_TAG_REGEX, tag)
         if not m:
             raise ValueError('Unrecognized tag: %s' % tag)
         version = m['version']
     except CalledProcessError:
-        version = line('git', 'log', '--format=%h', '-n1')
+        version = line('git', 'log', '--format=%h', '-n1', **kwargs)
 
+    if key:
+        _cache[key] = version
     return version
 
 
+def _is_dirty(cwd: str = None, head: tuple | None = None) -> bool:
+    """``utz.git.status.is_dirty``, memoized per ``(HEAD, index mtime)`` for up to ``DIRTY_TTL`` seconds.
+
+    Edits to tracked files that haven't touched the index (e.g. unstaged changes) don't invalidate a memoized "clean"
+    result, so are only seen once it expires; pass ``head=None`` to force a fresh check.
+    """
+    from .git.status import is_dirty
+    if head is None:
+        return is_dirty(cwd=cwd)
+    key = ('dirty', *head, _mtime(join(head[0], 'index')))
+    now = monotonic()
+    hit = _cache.get(key)
+    if hit and now - hit[0] < DIRTY_TTL:
+        return hit[1]
+    dirty = is_dirty(cwd=cwd)
+    _cache[key] = (now, dirty)
+    return dirty
+
+
+def _caller_root(frame) -> str | None:
+    """Walk up from the file of the code running in ``frame`` to the nearest directory containing ``.git``."""
+    caller_file = frame.f_globals.get('__file__') if frame else None
+    if not caller_file:
+        return None
+    current = Path(caller_file).resolve().parent
+    while current != current.parent:
+        if (current / '.git').exists():
+            return str(current)
+        current = current.parent
+    return None
+
+
 def pkg_version(name: str = None):
     try:
         return version(name)
@@ -79,16 +152,29 @@ def pkg_version_with_git(
         - Falls back to plain version if git is not available or fails
         - If neither pkg_version nor pkg_name provided, tries git_version()
         - The "+git.HASH" format follows PEP 440 local version identifier conventions
+        - The hash is read from ``.git/HEAD`` (and loose / packed refs) without running ``git``; short hashes are
+          always 7 chars (not extended if ambiguous). Dirty checks are memoized per ``(HEAD, index mtime)`` for
+          ``DIRTY_TTL`` (1) seconds, so an unstaged edit to a tracked file can take that long to add ``.dirty``; see
+          ``version_getattr`` to defer all of this until ``__version__`` is first accessed.
     """
+    if cwd is None and include_git:
+        # Auto-detect from caller's package directory
+        import inspect
+        frame = inspect.currentframe()
+        cwd = _caller_root(frame.f_back if frame else None)
+    return _pkg_version_with_git(pkg_version, pkg_name, include_git, include_dirty, short_hash, cwd)
+
+
+def _pkg_version_with_git(pkg_version, pkg_name, include_git, include_dirty, short_hash, cwd):
     # Get base version
     if pkg_version is None:
         if pkg_name:
             try:
                 pkg_version = version(pkg_name)
             except PackageNotFoundError:
-                pkg_version = git_version()
+                pkg_version = git_version(cwd)
         else:
-            pkg_version = git_version()
+            pkg_version = git_version(cwd)
 
     # Return plain version if git info not requested
     if not include_git:
@@ -96,40 +182,28 @@ def pkg_version_with_git(
 
     # Try to get git info
     try:
-        # Determine working directory
-        if cwd is None:
-            # Try to auto-detect from caller's package directory
-            import inspect
-            frame = inspect.currentframe()
-            if frame and frame.f_back:
-                caller_file = frame.f_back.f_globals.get('__file__')
-                if caller_file:
-                    # Walk up from caller's file to find .git
-                    current = Path(caller_file).resolve().parent
-                    while current != current.parent:
-                        if (current / '.git').exists():
-                            cwd = str(current)
-                            break
-                        current = current.parent
-
-        # Get git hash
-        hash_format = '--short=7' if short_hash else ''
-        git_cmd = ['git', 'rev-parse']
-        if hash_format:
-            git_cmd.append(hash_format)
-        git_cmd.append('HEAD')
-
-        kwargs = {}
-        if cwd:
-            kwargs['cwd'] = cwd
-
-        git_hash = line(*git_cmd, **kwargs)
+        # Get git hash: read `HEAD` directly if possible, otherwise ask `git`
+        head = _head_key(cwd)
+        if head:
+            sha = head[2]
+            git_hash = sha[:7] if short_hash else sha
+        else:
+            hash_format = '--short=7' if short_hash else ''
+            git_cmd = ['git', 'rev-parse']
+            if hash_format:
+                git_cmd.append(hash_format)
+            git_cmd.append('HEAD')
+
+            kwargs = {}
+            if cwd:
+                kwargs['cwd'] = cwd
+
+            git_hash = line(*git_cmd, **kwargs)
 
         # Check if dirty
         dirty_suffix = ''
         if include_dirty:
-            from .git.status import is_dirty
-            if is_dirty(cwd=cwd):
+            if _is_dirty(cwd=cwd, head=head):
                 dirty_suffix = '.dirty'
 
         return f"{pkg_version}+git.{git_hash}{dirty_suffix}"
@@ -137,3 +211,42 @@ def pkg_version_with_git(
     except Exception:
         # Fall back to plain version if anything goes wrong
         return pkg_version
+
+
+def version_getattr(
+    attr: str = '__version__',
+    pkg_version: str = None,
+    pkg_name: str = None,
+    include_git: bool = True,
+    include_dirty: bool = True,
+    short_hash: bool = True,
+    cwd: str = None,
+):
+    """Return a module-level ``__getattr__`` (PEP 562) that computes ``attr`` via ``pkg_version_with_git`` (with the
+    same kwargs) on first access (and memoizes it), so that importing a package does no Git work:
+
+    ```python
+    # In your package's __init__.py:
+    from utz.version import version_getattr
+    __getattr__ = version_getattr(pkg_version="0.1.1")
+    ```
+
+    The Git root is resolved from the caller's file (unless ``cwd`` is passed); if the caller isn't in a Git repo, no
+    Git info is included.
+    """
+    if cwd is None and include_git:
+        import inspect
+        frame = inspect.currentframe()
+        cwd = _caller_root(frame.f_back if frame else None)
+        if cwd is None:
+            include_git = False
+    values = {}
+
+    def __getattr__(name):
+        if name != attr:
+            raise AttributeError(name)
+        if name not in values:
+            values[name] = _pkg_version_with_git(pkg_version, pkg_name, include_git, include_dirty, short_hash, cwd)
+        return values[name]
+
+    return __getattr__
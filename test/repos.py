@@ -0,0 +1,29 @@
+"""Helpers for creating local Git repos in tests."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+
+from utz import cd_tmpdir, run
+
+
+def init_repo(branch: str = 'main'):
+    run('git', 'init', '-q', '-b', branch, log=None)
+    run('git', 'config', 'user.name', 'test', log=None)
+    run('git', 'config', 'user.email', 'test@example.com', log=None)
+
+
+def commit(path: str, content: str, msg: str | None = None):
+    with open(path, 'w') as f:
+        f.write(content)
+    run('git', 'add', path, log=None)
+    run('git', 'commit', '-qm', msg or f'write {path}', log=None)
+
+
+@contextmanager
+def tmp_repo(commits: int = 3, branch: str = 'main'):
+    """``cd`` into a temporary Git repo with ``commits`` commits (each writing ``file.txt``, with message ``commit <i>``)."""
+    with cd_tmpdir() as dir:
+        init_repo(branch)
+        for i in range(commits):
+            commit('file.txt', f'{i}\n', f'commit {i}')
+        yield dir
@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""Stand-in for the ``ssh`` CLI (the subset ``utz.ssh`` uses), forwarding ports over loopback.
+
+- ``ssh -N -L <spec> <proxy>``: forward in the foreground, until killed
+- ``ssh -f -N -o ControlMaster=yes -o ControlPath=<path> … <proxy>``: daemonize a "master", serving forward requests on
+  the control socket
+- ``ssh -o ControlPath=<path> -O {check,forward,cancel,exit} [-L <spec>] <proxy>``: send a request to the master
+
+Each invocation's args are appended (as a JSON line) to ``$SSH_STANDIN_LOG``, if set.
+"""
+import json
+import os
+import socket
+import sys
+from threading import Thread
+
+
+def pump(src: socket.socket, dst: socket.socket):
+    try:
+        while data := src.recv(65536):
+            dst.sendall(data)
+    except OSError:
+        pass
+    finally:
+        for s in (src, dst):
+            try:
+                s.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+
+class Forward:
+    def __init__(self, spec: str):
+        src_host, src_port, dst_host, dst_port = spec.split(':')
+        self.dst = (dst_host, int(dst_port))
+        self.server = socket.create_server((src_host, int(src_port)))
+        Thread(target=self.serve, daemon=True).start()
+
+    def serve(self):
+        while True:
+            try:
+                conn, _ = self.server.accept()
+            except OSError:
+                return
+            try:
+                upstream = socket.create_connection(self.dst)
+            except OSError:
+                conn.close()
+                continue
+            Thread(target=pump, args=(conn, upstream), daemon=True).start()
+            Thread(target=pump, args=(upstream, conn), daemon=True).start()
+
+    def close(self):
+        # (wakes the `accept` in `serve`; `close` alone doesn't, on Linux)
+        self.server.shutdown(socket.SHUT_RDWR)
+        self.server.close()
+
+
+def serve_master(path: str, ready: int):
+    forwards: dict[str, Forward] = {}
+    server = socket.socket(socket.AF_UNIX)
+    server.bind(path)
+    server.listen()
+    os.write(ready, b'1')
+    os.close(ready)
+    while True:
+        conn, _ = server.accept()
+        with conn, conn.makefile('rw') as f:
+            op, _, spec = f.readline().strip().partition(' ')
+            try:
+                if op == 'forward':
+                    forwards[spec] = Forward(spec)
+                elif op == 'cancel':
+                    forwards.pop(spec).close()
+                elif op == 'exit':
+                    f.write('ok\n')
+                    f.flush()
+                    os.unlink(path)
+                    os._exit(0)
+                f.write('ok\n')
+            except Exception as e:
+                f.write(f'{e}\n')
+
+
+def main(args: list[str]):
+    log = os.environ.get('SSH_STANDIN_LOG')
+    if log:
+        with open(log, 'a') as f:
+            f.write(json.dumps(args) + '\n')
+
+    opts, flags, op, spec = {}, set(), None, None
+    it = iter(args)
+    for arg in it:
+        if arg == '-o':
+            k, _, v = next(it).partition('=')
+            opts[k] = v
+        elif arg == '-O':
+            op = next(it)
+        elif arg == '-L':
+            spec = next(it)
+        elif arg.startswith('-'):
+            flags.add(arg)
+    path = opts.get('ControlPath')
+
+    if op:
+        try:
+            with socket.socket(socket.AF_UNIX) as s:
+                s.connect(path)
+                with s.makefile('rw') as f:
+                    f.write(f'{op} {spec or ""}\n')
+                    f.flush()
+                    response = f.readline().strip()
+        except OSError as e:
+            sys.stderr.write(f'Control socket connect({path}): {e}\n')
+            return 255
+        if response != 'ok':
+            sys.stderr.write(f'{response}\n')
+            return 255
+        return 0
+
+    if opts.get('ControlMaster') == 'yes':
+        r, w = os.pipe()
+        if os.fork():
+            os.close(w)
+            return 0 if os.read(r, 1) == b'1' else 255
+        os.close(r)
+        os.setsid()
+        serve_master(path, w)
+
+    forward = Forward(spec)
+    forward.serve()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
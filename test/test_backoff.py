@@ -0,0 +1,127 @@
+import asyncio
+from random import Random
+
+import pytest
+
+from utz import raises
+from utz.backoff import Backoff, BackoffTimeout
+
+
+class Clock:
+    """Fake clock, advanced by ``sleep``."""
+    def __init__(self):
+        self.t = 0.
+        self.sleeps = []
+
+    def __call__(self):
+        return self.t
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.t += delay
+
+    async def asleep(self, delay):
+        self.sleep(delay)
+
+
+def flaky(n, exc=ValueError):
+    """Return a function that raises ``exc`` ``n`` times, then returns the number of calls."""
+    calls = []
+
+    def fn():
+        calls.append(None)
+        if len(calls) <= n:
+            raise exc(f'call {len(calls)}')
+        return len(calls)
+
+    return fn
+
+
+def make(clock, **kwargs):
+    return Backoff(rng=Random(0), clock=clock, sleep=clock.sleep, asleep=clock.asleep, **kwargs)
+
+
+def test_delays():
+    clock = Clock()
+    delays = make(clock, jitter=None, base=1, cap=10).delays()
+    assert [ next(delays) for _ in range(6) ] == [ 1, 2, 4, 8, 10, 10 ]
+
+    delays = make(clock, base=1, cap=10).delays()
+    caps = [ 1, 2, 4, 8, 10, 10, 10, 10 ]
+    for cap in caps:
+        assert 0 <= next(delays) <= cap
+
+    delays = make(clock, jitter='equal', base=1, cap=10).delays()
+    for cap in caps:
+        assert cap / 2 <= next(delays) <= cap
+
+    delays = make(clock, jitter='decorrelated', base=1, cap=10).delays()
+    prev = 1
+    for _ in range(20):
+        delay = next(delays)
+        assert 1 <= delay <= min(10, prev * 3)
+        prev = delay
+
+    with raises(ValueError, 'Unrecognized jitter'):
+        Backoff(jitter='half')
+
+
+def test_run():
+    clock = Clock()
+    b = make(clock, jitter=None, base=1, exc=ValueError)
+    assert b.run(flaky(3)) == 4
+    assert clock.sleeps == [ 1, 2, 4 ]
+    assert b.stats.attempts == 4
+    assert b.stats.waited == 7
+    assert b.stats.elapsed == 7
+
+    # Non-matching exceptions propagate immediately
+    with raises(KeyError):
+        b.run(flaky(1, KeyError))
+    assert b.stats.attempts == 1
+
+    # `pred` retries on falsy return values
+    vals = iter([ 0, 0, 5 ])
+    assert make(clock, pred=bool).run(lambda: next(vals)) == 5
+
+
+def test_exhausted():
+    clock = Clock()
+    b = make(clock, jitter=None, base=1, tries=3)
+    with pytest.raises(BackoffTimeout, match='Failed after 3 attempts') as exc:
+        b.run(flaky(5))
+    assert exc.value.stats.attempts == 3
+    assert exc.value.stats.delays == [ 1, 2 ]
+    assert str(exc.value.__cause__) == 'call 3'
+
+    # Last sleep is truncated to end at the deadline
+    clock = Clock()
+    b = make(clock, jitter=None, base=1, tries=None, deadline=10)
+    with pytest.raises(BackoffTimeout, match=r'Deadline \(10s\) exceeded after 5 attempts'):
+        b.run(flaky(10))
+    assert clock.sleeps == [ 1, 2, 4, 3 ]
+
+
+def test_decorator():
+    clock = Clock()
+    b = make(clock, jitter=None, base=1)
+
+    @b
+    def fn(n, calls=[]):
+        calls.append(n)
+        if len(calls) < 3:
+            raise ValueError
+        return calls
+
+    assert fn.stats is None
+    assert fn(7) == [ 7, 7, 7 ]
+    assert fn.stats.attempts == 3
+    assert fn.stats.waited == 3
+
+    @b
+    async def afn(fn):
+        return fn()
+
+    assert asyncio.run(afn(flaky(2))) == 3
+    assert afn.stats.attempts == 3
+    assert clock.sleeps == [ 1, 2, 1, 2 ]
@@ -1,4 +1,7 @@
-from utz.bases import b64
+import pytest
+
+from utz import raises
+from utz.bases import b36l, b62, b64, b90
 
 
 def test_ints_strs():
@@ -26,3 +29,48 @@ def test_bytes():
     assert b64(bytes([ 1 ])) == '+'
     assert b64(bytes([ 1, 2 ])) == '1/'
     assert b64(bytes([ 1, 2, 3 ])) == 'D50'
+
+
+def test_encode_decode_many():
+    np = pytest.importorskip('numpy')
+    ints = list(range(10_000)) + [ 2**63, 2**64 - 1 ]
+    for cvt in [ b36l, b62, b64, b90 ]:
+        strs = cvt.encode_many(np.array(ints, dtype=np.uint64))
+        assert strs == [ cvt(i) for i in ints ]
+        decoded = cvt.decode_many(strs)
+        assert decoded.dtype == np.uint64
+        assert decoded.tolist() == ints
+
+    # Values beyond 64 bits fall back to Python `int`s
+    big = [ 2**70 + 5, 3 ]
+    strs = b64.encode_many(big)
+    assert strs == [ b64(i) for i in big ]
+    assert b64.decode_many(strs).tolist() == big
+
+    assert b64.encode_many([]) == []
+    assert b64.decode_many([ '' ]).tolist() == [ 0 ]
+
+
+def test_encode_many_bytes():
+    pytest.importorskip('numpy')
+    bs = [ bytes([]), bytes([ 1 ]), bytes([ 1, 2 ]), bytes([ 1, 2, 3 ]), bytes(range(20)) ]
+    assert b64.encode_many(bs) == [ b64(b) for b in bs ]
+    # Equal-length (≤8 bytes) inputs are folded into `uint64`s
+    bs = [ bytes([ i, 255 - i, 7, 0, 1, 2, 3, i ]) for i in range(256) ]
+    assert b64.encode_many(bs) == [ b64(b) for b in bs ]
+
+
+def test_fixed_width():
+    pytest.importorskip('numpy')
+    strs = b64.encode_many(range(0x1000), width=2)
+    assert strs[:3] == [ '++', '+/', '+0' ]
+    assert strs[-1] == 'zz'
+    assert strs == sorted(strs)
+    assert b64.decode_many(strs, width=2).tolist() == list(range(0x1000))
+    with raises(ValueError, 'too large for width 2'):
+        b64.encode_many([ 0x1000 ], width=2)
+    assert b64.encode_many([ 0, 0 ], width=0) == [ '', '' ]
+    with raises(ValueError, 'too large for width 0'):
+        b64.encode_many([ 5 ], width=0)
+    with raises(ValueError, 'Expected 2-char strings'):
+        b64.decode_many([ 'zzz' ], width=2)
@@ -5,6 +5,7 @@ from contextlib import contextmanager, asynccontextmanager
 
 from pytest import raises
 from tempfile import NamedTemporaryFile
+from threading import Event
 
 from utz import exists, AbstractContextManager, contexts, acontexts, Time
 
@@ -140,3 +141,165 @@ def test_acontexts():
     assert 0 < inside < 1e-5
     total = time.times["acontexts"]
     assert 0.1 < total < 0.11
+
+
+class Recorder:
+    """Sync or async context manager recording (relative) enter/exit times, in a shared ``events`` list; ``exited`` is
+    set once it has been exited (possibly from a worker thread)."""
+    def __init__(self, name, events, enter=0., exit=0., sync=False, fail=False):
+        self.name = name
+        self.events = events
+        self.enter = enter
+        self.exit = exit
+        self.sync = sync
+        self.fail = fail
+        self.exc_type = 'not exited'
+        self.exited = Event()
+
+    def __repr__(self):
+        return f'Recorder({self.name})'
+
+    def _log(self, event):
+        import time
+        self.events.append((event, self.name, time.perf_counter()))
+
+    def __getattr__(self, attr):
+        import time
+        if attr == '__enter__' and self.sync:
+            def enter():
+                time.sleep(self.enter)
+                if self.fail:
+                    raise EnterException(self.name)
+                self._log('enter')
+                return self.name
+            return enter
+        if attr == '__exit__' and self.sync:
+            def exit(exc_type, exc_val, exc_tb):
+                time.sleep(self.exit)
+                self.exc_type = exc_type
+                self._log('exit')
+                self.exited.set()
+            return exit
+        if attr == '__aenter__' and not self.sync:
+            async def aenter():
+                await sleep(self.enter)
+                if self.fail:
+                    raise EnterException(self.name)
+                self._log('enter')
+                return self.name
+            return aenter
+        if attr == '__aexit__' and not self.sync:
+            async def aexit(exc_type, exc_val, exc_tb):
+                await sleep(self.exit)
+                self.exc_type = exc_type
+                self._log('exit')
+                self.exited.set()
+            return aexit
+        raise AttributeError(attr)
+
+
+def test_acontexts_sync_threads():
+    events = []
+    ctxs = [ Recorder(f'sync{i}', events, enter=.1, exit=.1, sync=True) for i in range(3) ]
+    ticks = []
+
+    async def tick():
+        while True:
+            ticks.append(1)
+            await sleep(.01)
+
+    async def main():
+        ticker = asyncio.ensure_future(tick())
+        async with acontexts(ctxs) as values:
+            assert values == ['sync0', 'sync1', 'sync2']
+        ticker.cancel()
+
+    time = Time()
+    with time('total'):
+        asyncio.run(main())
+    # Enters and exits ran concurrently (.1s each, vs. .6s serially), in threads, without blocking the event loop
+    assert time['total'] < .5
+    assert len(ticks) > 5
+    assert [ ctx.exc_type for ctx in ctxs ] == [ None ] * 3
+
+
+def test_acontexts_deps():
+    events = []
+    a = Recorder('a', events, enter=.05)
+    b = Recorder('b', events, enter=.05, sync=True)
+    c = Recorder('c', events)
+    d = Recorder('d', events, exit=.05)
+
+    async def main():
+        async with acontexts(c, a, b, d, deps={c: [a, b]}) as values:
+            assert values == ['c', 'a', 'b', 'd']
+
+    asyncio.run(main())
+    order = [ (event, name) for event, name, _ in events ]
+    enters = [ name for event, name in order if event == 'enter' ]
+    exits = [ name for event, name in order if event == 'exit' ]
+    assert enters[0] == 'd'
+    assert set(enters[1:3]) == {'a', 'b'}
+    assert enters[3] == 'c'
+    assert exits[0] == 'c'
+    assert set(exits[1:3]) == {'a', 'b'}
+    assert exits[3] == 'd'
+
+    with raises(ValueError, match='cycle'):
+        acontexts(a, b, deps={a: [b], b: [a]})
+    with raises(ValueError, match='not passed'):
+        acontexts(a, deps={a: [b]})
+
+
+def test_acontexts_partial_enter():
+    events = []
+    ok_async = Recorder('ok_async', events)
+    ok_sync = Recorder('ok_sync', events, sync=True)
+    fails = Recorder('fails', events, enter=.05, fail=True)
+    slow = Recorder('slow', events, enter=5)
+    after = Recorder('after', events)
+
+    async def main():
+        async with acontexts(ok_async, ok_sync, fails, slow, after, deps={after: [fails]}):
+            raise AssertionError("unreachable")
+
+    time = Time()
+    with time('total'), raises(EnterException, match='fails'):
+        asyncio.run(main())
+    assert time['total'] < 2
+    assert ok_async.exc_type is EnterException
+    assert ok_sync.exc_type is EnterException
+    assert fails.exc_type == 'not exited'
+    assert slow.exc_type == 'not exited'
+    assert after.exc_type == 'not exited'
+
+
+def test_acontexts_timeouts():
+    events = []
+    fast = Recorder('fast', events)
+    slow_async = Recorder('slow_async', events, enter=1)
+
+    async def main(*ctxs, **kwargs):
+        async with acontexts(*ctxs, **kwargs):
+            raise AssertionError("unreachable")
+
+    with raises(TimeoutError, match='slow_async'):
+        asyncio.run(main(fast, slow_async, timeout=.05))
+    assert fast.exc_type is TimeoutError
+    assert slow_async.exc_type == 'not exited'
+
+    # Sync `__enter__`s can't be interrupted; contexts entered after the timeout are exited by their worker thread
+    fast = Recorder('fast', events)
+    slow_sync = Recorder('slow_sync', events, enter=1, sync=True)
+    time = Time()
+
+    async def timed():
+        # (`asyncio.run` waits for worker threads on exit)
+        with time('total'), raises(TimeoutError, match=r'after 0.05s entering 1/2 contexts: Recorder\(slow_sync\)$'):
+            await main(fast, slow_sync, total_timeout=.05)
+
+    asyncio.run(timed())
+    assert time['total'] < .5
+    assert fast.exc_type is TimeoutError
+    assert slow_sync.exited.wait(5)
+    assert slow_sync.exc_type is None
@@ -167,3 +167,78 @@ class TestConflictHandling:
             env["TEST_VAR"] = "modified"
 
         assert env["TEST_VAR"] == "initial"
+
+
+class TestSnapshot:
+    def test_overlay(self, clean_env):
+        os.environ["BASE_VAR"] = "base"
+        os.environ["GONE_VAR"] = "gone"
+        snap = env.snapshot()
+        assert snap["BASE_VAR"] == "base"
+
+        child = snap.overlay(NEW_VAR=1, GONE_VAR=None)
+        assert child["NEW_VAR"] == "1"
+        assert child["BASE_VAR"] == "base"
+        assert "GONE_VAR" not in child
+        with raises(KeyError):
+            child["GONE_VAR"]
+        assert len(child) == len(snap)
+        assert set(child) == set(snap) - {"GONE_VAR"} | {"NEW_VAR"}
+        assert child.dict() is child.dict()
+
+        grandchild = child.overlay({"NEW_VAR": "2", "GONE_VAR": "back"})
+        assert grandchild["NEW_VAR"] == "2"
+        assert grandchild["GONE_VAR"] == "back"
+        assert child["NEW_VAR"] == "1"
+
+        # Snapshots are copies, and overlays don't touch `os.environ`
+        assert env.snapshot() is snap
+        os.environ["BASE_VAR"] = "changed"
+        assert snap["BASE_VAR"] == "base"
+        assert env.snapshot()["BASE_VAR"] == "changed"
+        assert "NEW_VAR" not in os.environ
+        with raises(TypeError):
+            snap["X"] = "1"
+
+    def test_process_env(self, clean_env):
+        from utz import proc
+        echo = ["sh", "-c", "echo ${SNAP_VAR-unset}"]
+        snap = env.snapshot().overlay(SNAP_VAR="explicit")
+        assert proc.line(*echo, env=snap, log=None) == "explicit"
+        assert proc.line(*echo, log=None) == "unset"
+
+        with env.overlay(SNAP_VAR="outer") as outer:
+            assert env.snapshot() is outer
+            assert "SNAP_VAR" not in os.environ
+            assert proc.line(*echo, log=None) == "outer"
+            with env.overlay(SNAP_VAR=None):
+                assert proc.line(*echo, log=None) == "unset"
+            # An explicit `env=` takes precedence over the active overlay
+            assert proc.line(*echo, env=snap, log=None) == "explicit"
+            assert proc.line(*echo, log=None) == "outer"
+        assert proc.line(*echo, log=None) == "unset"
+
+    def test_threads(self, clean_env):
+        from concurrent.futures import ThreadPoolExecutor
+        from utz import proc
+
+        def run(i):
+            with env.overlay(SNAP_VAR=i):
+                return proc.line("sh", "-c", "echo $SNAP_VAR", log=None)
+
+        with ThreadPoolExecutor(8) as pool:
+            assert list(pool.map(run, range(16))) == [ str(i) for i in range(16) ]
+
+    def test_asyncio(self, clean_env):
+        import asyncio
+        from utz.process import aio
+
+        async def run(i):
+            with env.overlay(SNAP_VAR=i):
+                await asyncio.sleep(.01 * (i % 3))
+                return await aio.line("sh", "-c", "echo $SNAP_VAR", log=None)
+
+        async def main():
+            return await asyncio.gather(*[ run(i) for i in range(8) ])
+
+        assert asyncio.run(main()) == [ str(i) for i in range(8) ]
@@ -1,12 +1,17 @@
 from functools import partial
+from io import StringIO
+from random import Random
 
-from utz.escape import split, join, esc
+from utz import raises
+from utz.escape import split, split_io, join, esc
 
 
 def test_split_join():
     def check(s, strs, ch, **kwargs):
         assert split(s, ch, **kwargs) == strs
         assert join(strs, ch, **kwargs) == s
+        for size in [1, 2, 3, 100]:
+            assert list(split_io(StringIO(s), ch, size=size, **kwargs)) == strs
 
     chk = partial(check, ch=':')
 
@@ -64,3 +69,41 @@ def test_split_join():
 
 def test_escape():
     assert esc('"s"', '"') == r'\"s\"'
+
+
+def test_lone_backslash():
+    for s in [ '\\', 'a\\b', 'a:\\\\\\b' ]:
+        with raises(RuntimeError, 'lone backslash'):
+            split(s, ':')
+        with raises(RuntimeError, 'lone backslash'):
+            list(split_io(StringIO(s), ':', size=1))
+
+
+def test_split_join_roundtrip():
+    """Property test: ``split`` and ``join`` are inverses, for random lists of strings (with and without ``max``)."""
+    rng = Random(0)
+    for ch in ':|':
+        alphabet = f'ab{ch}\\'
+        for _ in range(1000):
+            strs = [
+                ''.join(rng.choice(alphabet) for _ in range(rng.randint(0, 6)))
+                for _ in range(rng.randint(1, 6))
+            ]
+            s = join(strs, ch)
+            assert split(s, ch) == strs
+            assert join(split(s, ch), ch) == s
+            size = rng.randint(1, 8)
+            assert list(split_io(StringIO(s), ch, size=size)) == strs
+
+            max = rng.randint(1, len(strs))
+            head = split(s, ch, max=max)
+            assert head[:max] == strs[:max]
+            assert join(head, ch, max=max) == s
+            assert list(split_io(StringIO(s), ch, max=max, size=size)) == head
+
+
+def test_split_long():
+    strs = [ f'k{i}:\\{i}\\:' for i in range(100_000) ]
+    s = join(strs, ':')
+    assert split(s, ':') == strs
+    assert list(split_io(StringIO(s), ':')) == strs
@@ -1,6 +1,7 @@
 from functools import wraps
 
 from utz import recvs, call
+from utz.fn import kwarg_names
 
 
 def fn1(a, b):
@@ -29,3 +30,53 @@ def test_call():
 
     assert call(fn2, a=1, b=2, c=3) == dict(a=1, c=3, kwargs=dict(b=2))
     assert call(fn2, a=1, b=2, c=3, d=4) == dict(a=1, c=3, kwargs=dict(b=2))
+
+
+def test_kwarg_names():
+    assert kwarg_names(fn1) == {'a', 'b'}
+    assert kwarg_names(fn2) == {'a', 'b', 'c'}
+
+    def fn3(**kwargs):
+        return kwargs
+
+    assert kwarg_names(fn3) == set()
+    # Reassigning `__wrapped__` after the first call takes effect
+    fn3.__wrapped__ = fn2
+    assert kwarg_names(fn3) == {'a', 'b', 'c'}
+    fn3.__wrapped__ = fn1
+    assert kwarg_names(fn3) == {'a', 'b'}
+
+
+def test_memoized(monkeypatch):
+    """Repeat ``call``s hit the ``WeakKeyDictionary`` cache instead of re-running ``getfullargspec``."""
+    import gc
+    from weakref import WeakKeyDictionary
+    from utz import fn as fn_mod
+
+    # Start from an empty cache, so this test doesn't depend on which functions other tests already introspected
+    monkeypatch.setattr(fn_mod, '_kwarg_names', WeakKeyDictionary())
+    computed = []
+    compute = fn_mod._compute_kwarg_names
+
+    def counting(fn):
+        computed.append(fn)
+        return compute(fn)
+
+    monkeypatch.setattr(fn_mod, '_compute_kwarg_names', counting)
+
+    @wraps(fn1)
+    def fn4(a, c, **kwargs):
+        return dict(a=a, c=c, kwargs=kwargs)
+
+    for _ in range(3):
+        assert call(fn4, a=1, b=2, c=3, d=4) == dict(a=1, c=3, kwargs=dict(b=2))
+    # `fn1` is introspected (once) via `fn4.__wrapped__`
+    assert computed == [ fn4, fn1 ]
+    assert fn_mod._kwarg_names[fn4] == ({'a', 'c'}, True)
+    assert fn_mod._kwarg_names[fn1] == ({'a', 'b'}, False)
+
+    # Entries don't outlive their functions
+    n = len(fn_mod._kwarg_names)
+    del fn4, computed[:]
+    gc.collect()
+    assert len(fn_mod._kwarg_names) == n - 1
@@ -0,0 +1,47 @@
+from test.repos import tmp_repo
+from utz import git, line, lines, run
+from utz.git import cat_file
+from utz.git.cat_file import CatFile
+
+
+def test_cat_file():
+    with tmp_repo(commits=3) as dir:
+        run('git', 'tag', '-a', 'v1', '-m', 'tag msg', 'HEAD~1', log=None)
+        shas = lines('git', 'log', '--format=%H', log=None)
+        with CatFile(dir) as cf:
+            assert cf.resolve('HEAD') == shas[0]
+            assert cf.resolve('main~2') == shas[2]
+            assert cf.resolve('nope') is None
+            assert cf.resolve_many([ 'HEAD', 'nope', 'v1^{commit}', 'HEAD~1' ]) == [ shas[0], None, shas[1], shas[1] ]
+            assert cf.resolve_many([]) == []
+            assert cf.info('HEAD:file.txt')[1:] == ('blob', 2)
+            assert cf.read('HEAD:file.txt')[1:] == ('blob', b'2\n')
+            assert cf.read('nope') is None
+            assert cf.msg() == 'commit 2\n'
+            assert cf.msg('v1') == 'commit 1\n'
+            assert cf.msg('nope') is None
+
+
+def test_helpers():
+    with tmp_repo(commits=2):
+        head = line('git', 'rev-parse', 'HEAD', log=None)
+        with cat_file.enabled():
+            assert git.log.sha('HEAD') == head
+            assert git.head.fmt('%H') == head
+            assert git.msg() == 'commit 1'
+            assert git.msg('HEAD^') == 'commit 0'
+            assert cat_file.session().check_proc.poll() is None
+        cat_file.close_all()
+        assert git.log.sha('HEAD') == head
+        assert git.msg() == 'commit 1'
+
+
+def test_resolve_many():
+    """Pipelined ``resolve_many`` (and per-ref lookups via the session) agree with one ``git rev-parse`` per ref."""
+    with tmp_repo(commits=50):
+        refs = [ f'HEAD~{i}' for i in range(50) ]
+        forked = [ line('git', 'rev-parse', ref, log=None) for ref in refs ]
+        with cat_file.enabled():
+            assert [ git.log.sha(ref) for ref in refs ] == forked
+        assert cat_file.session().resolve_many(refs) == forked
+        cat_file.close_all()
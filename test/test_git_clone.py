@@ -0,0 +1,58 @@
+from os import listdir, makedirs
+from os.path import exists, join
+
+from test.repos import commit, tmp_repo
+from utz import check, git, line, lines, output
+
+
+def count(ref='HEAD'):
+    return int(line('git', 'rev-list', '--count', ref, log=None))
+
+
+def test_shallow_partial():
+    with tmp_repo(commits=5) as origin:
+        url = f'file://{origin}'
+        with git.clone.tmp(url, depth=2, submodules=False) as wd:
+            assert count() == 2
+            assert exists(join(wd, '.git', 'shallow'))
+            assert lines('cat', 'file.txt', log=None) == ['4']
+
+        with git.clone.tmp(url, filter='blob:none', submodules=False):
+            assert count() == 5
+            assert line('git', 'config', 'remote.origin.partialclonefilter', log=None) == 'blob:none'
+            # Historical blobs are fetched lazily
+            assert output('git', 'show', 'HEAD~3:file.txt', log=None) == b'1\n'
+
+
+def test_sparse():
+    with tmp_repo(commits=1):
+        for d in [ 'a', 'b', 'c' ]:
+            makedirs(d)
+            commit(f'{d}/f.txt', f'{d}\n')
+        with git.clone.tmp(f'file://{git.repo.find_root()}', sparse=['a', 'c'], submodules=False) as wd:
+            assert sorted(listdir(wd)) == ['.git', 'a', 'c', 'file.txt']
+            assert count() == 4
+
+
+def test_reference_cache(tmp_path):
+    cache = str(tmp_path / 'mirrors')
+    with tmp_repo(commits=3) as origin:
+        url = f'file://{origin}'
+        with git.clone.tmp(url, cache=cache, submodules=False) as wd:
+            [ mirror ] = listdir(cache)
+            mirror = join(cache, mirror)
+            alternates = join(wd, '.git', 'objects', 'info', 'alternates')
+            with open(alternates) as f:
+                assert f.read().strip() == join(mirror, 'objects')
+            assert count() == 3
+
+        # New commits are fetched into the existing mirror
+        commit('file.txt', 'new\n')
+        head = line('git', 'rev-parse', 'HEAD', log=None)
+        with git.clone.tmp(url, cache=cache, dissociate=True, submodules=False) as wd:
+            assert listdir(cache) == [ mirror.rsplit('/', 1)[1] ]
+            assert line('git', 'rev-parse', 'HEAD', log=None) == head
+            # `--dissociate` copies borrowed objects, removing the dependency on the mirror
+            assert not exists(join(wd, '.git', 'objects', 'info', 'alternates'))
+        assert line('git', 'rev-parse', 'HEAD', cwd=mirror, log=None) == head
+        assert check('git', 'fsck', cwd=mirror)
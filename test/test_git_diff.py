@@ -0,0 +1,83 @@
+from os import makedirs, stat, utime
+
+from test.repos import commit, tmp_repo
+from utz import run
+from utz.proc import lines
+from utz.git import diff
+from utz.git.status import is_dirty
+
+
+def test_exists():
+    with tmp_repo(commits=0):
+        assert not diff.exists()
+        with open('a.txt', 'w') as f:
+            f.write('a\n')
+        assert diff.exists()
+        assert not diff.exists(untracked=False)
+        run('git', 'add', 'a.txt', log=None)
+        # Staged, in a repo with no commits
+        assert diff.exists(untracked=False, unstaged=False)
+        run('git', 'commit', '-qm', 'add a.txt', log=None)
+        assert not diff.exists()
+
+        # Ignored files don't count
+        with open('.gitignore', 'w') as f:
+            f.write('build/\n.gitignore\n')
+        makedirs('build')
+        for i in range(100):
+            with open(f'build/{i}.o', 'w') as f:
+                f.write(f'{i}\n')
+        assert not diff.exists()
+        assert not diff.has_untracked()
+
+        # Unstaged
+        with open('a.txt', 'a') as f:
+            f.write('b\n')
+        assert diff.exists()
+        assert diff.exists(untracked=False)
+        assert not diff.exists(untracked=False, unstaged=False)
+        assert diff.has_unstaged()
+        assert not diff.has_staged()
+
+        # Staged
+        run('git', 'add', 'a.txt', log=None)
+        assert diff.exists(untracked=False, unstaged=False)
+        assert not diff.has_unstaged()
+
+
+def test_ttl(mocker):
+    with tmp_repo(commits=1):
+        has_untracked = mocker.spy(diff, 'has_untracked')
+        assert not diff.exists(ttl=60)
+        assert not diff.exists(ttl=60)
+        assert has_untracked.call_count == 1
+
+        # Worktree changes aren't seen until the TTL expires…
+        with open('new.txt', 'w') as f:
+            f.write('new\n')
+        assert not diff.exists(ttl=60)
+        assert diff.exists()
+        # …or the index changes
+        run('git', 'add', 'new.txt', log=None)
+        assert diff.exists(ttl=60)
+
+        assert is_dirty(ttl=60)
+        commit('new.txt', 'newer\n')
+        assert not is_dirty(ttl=60)
+
+
+def test_touched_file_is_clean():
+    with tmp_repo(commits=1):
+        [path] = lines('git', 'ls-files', log=None)
+        # Record stat info older than the index (so the entry isn't "racily clean"), then `touch` the file: same
+        # content, but the index's stat info is stale
+        mtime = stat(path).st_mtime
+        utime(path, (mtime - 10, mtime - 10))
+        run('git', 'update-index', '-q', '--refresh', log=None)
+        utime(path)
+        # Stale stat info alone doesn't count as a modification
+        assert not diff.has_unstaged()
+        assert not diff.exists()
+        assert not is_dirty()
+        assert not diff.exists(refresh=True)
+        assert not diff.has_unstaged(refresh=True)
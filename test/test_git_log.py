@@ -0,0 +1,66 @@
+from itertools import islice
+from subprocess import Popen
+
+from test.repos import commit, tmp_repo
+from utz import lines, run
+from utz.git.log import Commit, FileStat, commits
+
+
+def test_commits():
+    with tmp_repo(commits=3):
+        shas = lines('git', 'log', '--format=%H', log=None)
+        for chunk_size in [ 1, 7, 2**16 ]:
+            assert list(commits(chunk_size=chunk_size)) == [
+                Commit(sha=sha, subject=f'commit {i}')
+                for i, sha in zip([ 2, 1, 0 ], shas)
+            ]
+        assert [ c.sha for c in commits('HEAD~2..HEAD', fields=['sha']) ] == shas[:2]
+        assert [ c.sha for c in commits(['HEAD~1', '^HEAD~2'], fields=['sha']) ] == shas[1:2]
+
+        [ c ] = commits('-1', fields=['parents', 'author_name', 'author_date', 'message'])
+        assert c.parents == (shas[1],)
+        assert c.author_name == 'test'
+        assert isinstance(c.author_date, int)
+        assert c.message == 'commit 2\n'
+        assert c.sha is None
+
+
+def test_numstat():
+    with tmp_repo(commits=1):
+        commit('a.txt', 'a\nb\n', 'subject\n\nbody line 1\nbody line 2')
+        with open('bin.dat', 'wb') as f:
+            f.write(bytes(range(256)))
+        run('git', 'add', 'bin.dat', log=None)
+        run('git', 'mv', 'a.txt', 'b.txt', log=None)
+        run('git', 'commit', '-qm', 'rename, binary', log=None)
+        [ c2, c1, c0 ] = commits(fields=['subject', 'body'], numstat=True, chunk_size=5)
+        assert c2.numstat == [
+            FileStat(0, 0, 'b.txt', 'a.txt'),
+            FileStat(None, None, 'bin.dat'),
+        ]
+        assert c1.subject == 'subject'
+        assert c1.body == 'body line 1\nbody line 2\n'
+        assert c1.numstat == [ FileStat(2, 0, 'a.txt') ]
+        assert c0.numstat == [ FileStat(1, 0, 'file.txt') ]
+
+
+def test_early_exit(monkeypatch):
+    from utz.git import log
+
+    procs = []
+
+    class Spy(Popen):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            procs.append(self)
+
+    monkeypatch.setattr(log, 'Popen', Spy)
+    with tmp_repo(commits=20):
+        shas = lines('git', 'log', '--format=%H', log=None)
+        it = commits(fields=['sha'], chunk_size=41)
+        assert [ c.sha for c in islice(it, 2) ] == shas[:2]
+        [ p ] = procs
+        # Closing the generator kills (and reaps) the `git log` process
+        it.close()
+        assert p.poll() is not None
+        assert p.stdout.closed
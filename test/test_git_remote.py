@@ -0,0 +1,114 @@
+from os import utime
+
+from pytest import raises
+
+from test.repos import commit, tmp_repo
+from utz import line, lines, run
+from utz.git import remote
+from utz.git.gist import get_gist_remote_name
+from utz.git.github import get_remotes
+
+
+def test_urls(mocker):
+    with tmp_repo(commits=0):
+        assert remote.urls() == {}
+        run('git', 'remote', 'add', 'origin', 'git@github.com:owner/repo.git', log=None)
+        run('git', 'remote', 'add', 'my.fork', 'https://github.com/me/repo', log=None)
+        run('git', 'remote', 'add', 'gist', 'git@gist.github.com:abc123.git', log=None)
+        run('git', 'remote', 'add', 'other', '/some/path', log=None)
+        expected = {
+            'origin': 'git@github.com:owner/repo.git',
+            'my.fork': 'https://github.com/me/repo',
+            'gist': 'git@gist.github.com:abc123.git',
+            'other': '/some/path',
+        }
+        assert remote.urls() == expected
+
+        # Memoized until `.git/config` changes
+        lines = mocker.spy(remote, 'lines')
+        assert remote.urls() == expected
+        assert get_remotes() == { 'origin': 'owner/repo', 'my.fork': 'me/repo' }
+        assert get_gist_remote_name('abc123') == 'gist'
+        assert get_gist_remote_name('def456') == 'origin'
+        assert lines.call_count == 0
+
+        run('git', 'remote', 'remove', 'other', log=None)
+        # Ensure the mtime changes, even on filesystems with coarse timestamps
+        utime('.git/config', ns=(0, 0))
+        del expected['other']
+        assert remote.urls() == expected
+        assert lines.call_count == 1
+
+
+def test_urls_instead_of():
+    with tmp_repo(commits=0):
+        run('git', 'config', 'url.https://github.com/.insteadOf', 'gh:', log=None)
+        run('git', 'config', 'url.git@github.com:.insteadOf', 'gh:me/', log=None)
+        run('git', 'config', 'url.git@gist.github.com:.pushInsteadOf', 'gist:', log=None)
+        run('git', 'remote', 'add', 'origin', 'gh:owner/repo', log=None)
+        run('git', 'remote', 'add', 'fork', 'gh:me/repo', log=None)
+        run('git', 'remote', 'add', 'gist', 'gist:abc123', log=None)
+        expected = {
+            'origin': 'https://github.com/owner/repo',
+            'fork': 'git@github.com:repo',
+            'gist': 'gist:abc123',
+        }
+        assert remote.urls() == expected
+        assert expected == { name: line('git', 'remote', 'get-url', name, log=None) for name in expected }
+        assert get_remotes() == { 'origin': 'owner/repo' }
+
+
+def test_refs_find():
+    lns = [
+        '12bbfa076261df4ed8069bb91044971bd47892a8	HEAD',
+        '3aded57969e3e71d2f28c47ed328529fb84fe963	refs/heads/master',
+        '12bbfa076261df4ed8069bb91044971bd47892a8	refs/heads/py',
+        '12bd000000000000000000000000000000000000	refs/pull/1/head',
+        '12bbfa076261df4ed8069bb91044971bd47892a8	refs/tags/v0.2.2',
+    ]
+    refs = remote.Refs(lns)
+    assert refs.find('12bb') == [ ('head', None), ('heads', 'py'), ('tags', 'v0.2.2') ]
+    assert refs.find('12b') == [ ('head', None), ('heads', 'py'), ('tags', 'v0.2.2'), ('pull', '1/head') ]
+    assert refs.find('ff') == []
+    assert refs.query(sha='12bd') == { 'pull': { '1/head': '12bd000000000000000000000000000000000000' } }
+    assert refs.query(head='py', sha='3a') is None
+    assert refs.query(head='master', sha='3a') == '3aded57969e3e71d2f28c47ed328529fb84fe963'
+    for bad in [ 'abc123	refs/heads/x', '3aded57969e3e71d2f28c47ed328529fb84fe963	nope', 'HEAD' ]:
+        with raises(ValueError):
+            remote.Refs([ bad ])
+
+
+def test_snapshot(mocker):
+    with tmp_repo(commits=2) as dir:
+        run('git', 'tag', 'v1', 'HEAD~', log=None)
+        shas = lines('git', 'log', '--format=%H')
+        url = f'file://{dir}'
+        remote.clear_snapshots()
+        remote.urls()  # warm the (memoized) remote-URL lookup, so that `lines` calls below are all `ls-remote`s
+        ls = mocker.spy(remote, 'lines')
+        monotonic = mocker.patch.object(remote, 'monotonic', return_value=100.)
+
+        assert remote.ls_remote(url, head='main', ttl=60) == shas[0]
+        assert remote.ls_remote(url, tag='v1', ttl=60) == shas[1]
+        assert remote.ls_remote(url, sha=shas[1][:7], ttl=60) == { 'tags': { 'v1': shas[1] } }
+        assert remote.ls_remote(url, heads=True, tags=True, ttl=60) == { 'heads': { 'main': shas[0] }, 'tags': { 'v1': shas[1] } }
+        assert ls.call_count == 1
+
+        commit('file.txt', 'new\n')
+        new = lines('git', 'log', '-1', '--format=%H')[0]
+        ls.reset_mock()
+        # Stale until the TTL expires, or a refresh is requested
+        assert remote.ls_remote(url, head='main', ttl=60) == shas[0]
+        monotonic.return_value = 161.
+        assert remote.ls_remote(url, head='main', ttl=60) == new
+        assert remote.ls_remote(url, head='main', ttl=None) == new
+        assert ls.call_count == 1
+        run('git', 'tag', 'v2', log=None)
+        assert remote.ls_remote(url, tag='v2', ttl=None) is None
+        assert remote.ls_remote(url, tag='v2', refresh=True) == new
+        # Uncached by default
+        run('git', 'tag', 'v3', log=None)
+        assert remote.ls_remote(url, tag='v3') == new
+        assert ls.call_count == 3
+        remote.clear_snapshots(url)
+        assert remote._refs_cache == {}
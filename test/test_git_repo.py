@@ -0,0 +1,68 @@
+from os import makedirs
+from os.path import realpath
+from subprocess import CalledProcessError
+
+from pytest import raises
+
+from test.repos import init_repo, tmp_repo
+from utz import cd, cd_tmpdir, line, run
+from utz.git import repo
+from utz.git.repo import RepoCache
+
+
+def test_git_repo_follows_cwd():
+    with tmp_repo(commits=1) as dir1:
+        r1 = repo.git_repo()
+        assert r1.working_tree_dir == realpath(dir1)
+        makedirs('sub/dir')
+        with cd('sub/dir'):
+            assert repo.git_repo() is r1
+            assert repo.root() == realpath(dir1) == line('git', 'rev-parse', '--show-toplevel')
+        with tmp_repo(commits=1) as dir2:
+            r2 = repo.git_repo()
+            assert r2 is not r1
+            assert repo.root() == realpath(dir2)
+        assert repo.git_repo(dir2) is r2
+        assert repo.git_repo() is r1
+
+
+def test_root_errors():
+    # Same errors with or without GitPython
+    with cd_tmpdir():
+        with raises(CalledProcessError):
+            repo.root()
+        run('git', 'init', '-q', '--bare', 'bare.git', log=None)
+        with cd('bare.git'), raises(CalledProcessError):
+            repo.root()
+
+
+def test_lru_eviction():
+    closed = []
+
+    class FakeRepo:
+        def __init__(self, path):
+            self.working_tree_dir = path
+
+        def close(self):
+            closed.append(self.working_tree_dir)
+
+    cache = RepoCache(maxsize=2, factory=FakeRepo)
+    with cd_tmpdir() as tmp:
+        dirs = []
+        for name in 'abc':
+            makedirs(name)
+            with cd(name):
+                init_repo()
+            dirs.append(realpath(f'{tmp}/{name}'))
+        a, b, c = dirs
+        ra = cache.get(a)
+        cache.get(b)
+        assert cache.get(a) is ra  # `a` is now most-recently used
+        cache.get(c)
+        assert closed == [b]
+        assert len(cache) == 2 and a in cache and c in cache and b not in cache
+        cache.resize(1)
+        assert closed == [b, a]
+        cache.clear()
+        assert closed == [b, a, c]
+        assert len(cache) == 0
@@ -0,0 +1,91 @@
+from os.path import exists, join
+
+import pytest
+
+from test.repos import commit, init_repo
+from utz import cd, cd_tmpdir, line, run
+from utz.git import submodule
+
+
+@pytest.fixture
+def superproject(monkeypatch):
+    # Allow `file://` submodule URLs
+    monkeypatch.setenv('GIT_CONFIG_COUNT', '1')
+    monkeypatch.setenv('GIT_CONFIG_KEY_0', 'protocol.file.allow')
+    monkeypatch.setenv('GIT_CONFIG_VALUE_0', 'always')
+    with cd_tmpdir() as dir:
+        for name in ['a', 'b.c', 'd']:
+            run('mkdir', f'src-{name}', log=None)
+            with cd(f'src-{name}'):
+                init_repo()
+                commit('file.txt', f'{name}\n')
+        run('mkdir', 'sup', log=None)
+        with cd('sup'):
+            init_repo()
+            commit('README', 'sup\n')
+            for name in ['a', 'b.c', 'd']:
+                run('git', 'submodule', 'add', '-q', f'file://{dir}/src-{name}', f'mods/{name}', log=None)
+            run('git', 'config', '-f', '.gitmodules', 'submodule.mods/d.branch', 'main', log=None)
+            run('git', 'commit', '-qam', 'add submodules', log=None)
+        yield dir
+
+
+def test_parse(superproject):
+    with cd('sup'):
+        subs = submodule.parse()
+        assert list(subs) == ['mods/a', 'mods/b.c', 'mods/d']
+        assert subs['mods/b.c'] == submodule.Submodule('mods/b.c', 'mods/b.c', f'file://{superproject}/src-b.c')
+        assert subs['mods/d'].branch == 'main'
+        assert submodule.ls() == ['mods/a', 'mods/b.c', 'mods/d']
+        assert submodule.exists('mods/a')
+        assert not submodule.exists('a')
+
+
+def test_parse_cached(superproject, mocker):
+    with cd('sup'):
+        submodule.parse()
+        lines = mocker.spy(submodule, 'lines')
+        for _ in range(10):
+            assert submodule.exists('mods/d')
+        assert lines.call_count == 0
+
+
+def test_update_fetch(superproject):
+    with cd_tmpdir():
+        run('git', 'clone', '-q', f'file://{superproject}/sup', 'clone', log=None)
+        with cd('clone'):
+            assert not exists('mods/a/file.txt')
+            assert submodule.fetch() == []
+
+            results = submodule.update('mods/a', 'mods/d', workers=2)
+            assert [ r.name for r in results ] == ['mods/a', 'mods/d']
+            assert all(r.returncode == 0 and r.elapsed > 0 for r in results)
+            assert exists('mods/a/file.txt') and exists('mods/d/file.txt')
+            assert not exists('mods/b.c/file.txt')
+
+            # Advance a submodule's upstream, and fetch it
+            with cd(join(superproject, 'src-a')):
+                commit('file.txt', 'a2\n')
+                sha = line('git', 'rev-parse', 'HEAD', log=None)
+            results = submodule.fetch()
+            assert [ r.name for r in results ] == ['mods/a', 'mods/d']
+            with cd('mods/a'):
+                assert line('git', 'rev-parse', 'origin/main', log=None) == sha
+
+            results = submodule.update()
+            assert len(results) == 3
+            assert exists('mods/b.c/file.txt')
+
+            with pytest.raises(ValueError, match='No such submodule: nope'):
+                submodule.update('nope')
+
+
+def test_git_submodules_deprecated(superproject):
+    pytest.importorskip('git')
+    with cd('sup'):
+        with pytest.deprecated_call():
+            subs = submodule.git_submodules()
+        assert sorted(subs) == ['mods/a', 'mods/b.c', 'mods/d']
+        run('git', 'rm', '-q', 'mods/a', log=None)
+        with pytest.deprecated_call():
+            assert sorted(submodule.git_submodules()) == ['mods/b.c', 'mods/d']
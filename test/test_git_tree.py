@@ -0,0 +1,91 @@
+from os import chmod, makedirs
+from os.path import join
+
+from test.repos import tmp_repo
+from utz import cd_tmpdir, line, lines, output, run
+from utz.git import gist
+from utz.git.tree import quote, write_tree
+
+
+def ls(ref):
+    return { ln.split('\t')[1]: ln.split('\t')[0].split(' ')[0] for ln in lines('git', 'ls-tree', '-r', ref, log=None) }
+
+
+def cat(ref, path):
+    return output('git', 'show', f'{ref}:{path}', log=None).decode()
+
+
+def test_write_tree():
+    with cd_tmpdir() as src:
+        makedirs('imgs')
+        for name in [ 'a.png', 'b.png', 'imgs/c.png', 'run.sh' ]:
+            with open(name, 'w') as f:
+                f.write(f'{name}\n')
+        chmod('run.sh', 0o755)
+        files = [
+            (join(src, 'a.png'), 'a.png'),
+            (join(src, 'b.png'), 'x/y/b.png'),
+            (join(src, 'imgs/c.png'), 'x/c.png'),
+            (join(src, 'run.sh'), 'run.sh'),
+        ]
+        with tmp_repo(commits=1):
+            makedirs('x/z')
+            with open('x/z/old.txt', 'w') as f:
+                f.write('old\n')
+            run('git', 'add', 'x', log=None)
+            run('git', 'commit', '-qm', 'add x/z/old.txt', log=None)
+            old_z = line('git', 'rev-parse', 'HEAD:x/z', log=None)
+
+            tree = write_tree(files, base='HEAD')
+            assert ls(tree) == {
+                'a.png': '100644',
+                'file.txt': '100644',
+                'run.sh': '100755',
+                'x/c.png': '100644',
+                'x/y/b.png': '100644',
+                'x/z/old.txt': '100644',
+            }
+            assert cat(tree, 'x/y/b.png') == 'b.png\n'
+            assert cat(tree, 'x/c.png') == 'imgs/c.png\n'
+            # Unchanged subtrees are reused
+            assert line('git', 'rev-parse', f'{tree}:x/z', log=None) == old_z
+
+            # Overwrite existing entries, including replacing a file with a directory
+            tree2 = write_tree([ (join(src, 'b.png'), 'file.txt/b.png'), (join(src, 'a.png'), 'x/c.png') ], base=tree)
+            assert set(ls(tree2)) == { 'a.png', 'file.txt/b.png', 'run.sh', 'x/c.png', 'x/y/b.png', 'x/z/old.txt' }
+            assert cat(tree2, 'x/c.png') == 'a.png\n'
+
+            # No base
+            assert set(ls(write_tree(files[:2]))) == { 'a.png', 'x/y/b.png' }
+
+
+def test_quote():
+    assert quote('a.png') == 'a.png'
+    assert quote('a\tb"c') == '"a\\tb\\"c"'
+
+
+def test_upload_files_to_gist(mocker):
+    mocker.patch.object(gist, 'get_github_user', return_value='user')
+    with cd_tmpdir() as src:
+        for name in [ 'a.png', 'b.png' ]:
+            with open(name, 'w') as f:
+                f.write(f'{name}\n')
+        with tmp_repo(commits=1) as origin:
+            run('git', 'init', '-q', '--bare', 'remote.git', log=None)
+            run('git', 'remote', 'add', 'gist', join(origin, 'remote.git'), log=None)
+            write_tree_spy = mocker.spy(gist, 'write_tree')
+            results = gist.upload_files_to_gist(
+                [ (join(src, 'a.png'), 'a.png'), (join(src, 'b.png'), 'imgs/b.png') ],
+                gist_id='abc',
+                is_local_clone=True,
+                remote_name='gist',
+                verbose=False,
+            )
+            assert write_tree_spy.call_count == 1
+            sha = line('git', 'rev-parse', 'assets', log=None)
+            assert results == [
+                ('a.png', 'a.png', f'https://gist.githubusercontent.com/user/abc/raw/{sha}/a.png'),
+                ('imgs/b.png', 'imgs/b.png', f'https://gist.githubusercontent.com/user/abc/raw/{sha}/imgs/b.png'),
+            ]
+            assert line('git', '--git-dir=remote.git', 'rev-parse', 'assets', log=None) == sha
+            assert set(ls(sha)) == { 'a.png', 'imgs/b.png' }
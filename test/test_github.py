@@ -0,0 +1,25 @@
+import json
+from os.path import realpath
+
+from test.repos import tmp_repo
+from utz import env, run
+from utz.git import github
+
+
+def test_repo_name_with_owner(mocker, tmp_path):
+    gh = mocker.patch.object(github.proc, 'json', return_value={ 'nameWithOwner': 'owner/repo' })
+    with env(XDG_CACHE_HOME=str(tmp_path)), tmp_repo(commits=0) as root:
+        assert github.repo_name_with_owner() == 'owner/repo'
+        assert github.repo_name_with_owner() == 'owner/repo'
+        assert gh.call_count == 1
+        with open(tmp_path / 'utz' / 'gh-repo-view.json') as f:
+            assert json.load(f)[realpath(root)]['nameWithOwner'] == 'owner/repo'
+
+        # Changing the repo's config invalidates the cache
+        gh.return_value = { 'nameWithOwner': 'owner/repo2' }
+        run('git', 'remote', 'add', 'origin', 'git@github.com:owner/repo2.git', log=None)
+        assert github.repo_name_with_owner() == 'owner/repo2'
+        assert gh.call_count == 2
+
+        assert github.repo_name_with_owner(cache=False) == 'owner/repo2'
+        assert gh.call_count == 3
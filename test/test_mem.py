@@ -0,0 +1,79 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from os.path import exists
+
+import pytest
+
+memray = pytest.importorskip('memray')
+
+from utz import cd_tmpdir
+from utz.mem import Tracker
+
+
+def allocate(n=100_000):
+    return list(range(n))
+
+
+def test_tracker():
+    with cd_tmpdir():
+        with (tracker := Tracker()):
+            allocate()
+        assert tracker.peak_mem == tracker.stats['metadata']['peak_memory'] > 0
+        assert tracker.path is None
+        assert tracker.future is None
+
+
+def test_background():
+    with cd_tmpdir() as dir, ThreadPoolExecutor(2) as executor:
+        trackers = []
+        for i in range(3):
+            with (tracker := Tracker(f'{dir}/{i}.memray', background=executor)):
+                allocate()
+            # Available immediately, from the capture file's header
+            assert tracker.peak_mem > 0
+            trackers.append(tracker)
+        for i, tracker in enumerate(trackers):
+            stats = tracker.result()
+            assert stats['metadata']['peak_memory'] == tracker.peak_mem
+            assert exists(f'{dir}/{i}.memray')
+            assert exists(f'{dir}/{i}.stats.json')
+            assert exists(f'{dir}/{i}.html')
+
+
+def test_sync_in_running_loop():
+    async def main():
+        # Sync `with` inside a coroutine (i.e. with a running event loop)
+        with (tracker := Tracker()):
+            allocate()
+        async with (atracker := Tracker(flamegraph=False, background=True)):
+            allocate()
+        stats = await asyncio.wrap_future(atracker.future)
+        return tracker, atracker, stats
+
+    with cd_tmpdir():
+        tracker, atracker, stats = asyncio.run(main())
+        assert tracker.stats['metadata']['peak_memory'] == tracker.peak_mem
+        assert stats['metadata']['peak_memory'] == atracker.peak_mem
+
+
+def test_exception():
+    with cd_tmpdir():
+        with pytest.raises(ValueError, match='boom'):
+            with (tracker := Tracker(background=True)):
+                raise ValueError('boom')
+        assert tracker.path is None
+        assert tracker.future is None and tracker.stats is None
+
+
+def test_reenter_background():
+    with cd_tmpdir() as dir:
+        tracker = Tracker(f'{dir}/re.memray', background=True)
+        with tracker:
+            allocate()
+        first = tracker.future
+        # Re-entering waits for the previous session's reports, before replacing the capture file they read
+        with tracker:
+            assert first.done()
+            allocate(200_000)
+        assert first.result()['metadata']['peak_memory'] < tracker.result()['metadata']['peak_memory']
+        assert tracker.path == f'{dir}/re.memray'
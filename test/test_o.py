@@ -1,6 +1,7 @@
 import json
 from pytest import raises
 from utz import o
+from utz.o import frozen_o, layered_o
 
 
 def test_kwargs():
@@ -115,3 +116,161 @@ def test_update():
     o1 = o(a=1,b=2)
     o1.update(b='bbb',c=3,d=4)
     assert dict(o1) == { 'a':1,'b':'bbb','c':3,'d':4 }
+
+
+def test_nested_cached():
+    d = {'a': {'b': {'c': 1}}}
+    o1 = o(d)
+    a = o1.a
+    assert o1.a is a
+    assert o1['a'] is a
+    assert o1.a.b is a.b
+    assert o1.a.b.c == 1
+
+    # Direct mutations of the wrapped `dict` invalidate cached wrappers
+    d['a'] = {'b': 2}
+    assert o1.a is not a
+    assert o1.a.b == 2
+
+    o1.a = {'x': 1}
+    assert o1.a == {'x': 1}
+    assert d['a'] == {'x': 1}
+    del o1.a
+    assert 'a' not in o1 and 'a' not in d
+    with raises(AttributeError):
+        o1.a
+
+
+def test_methods_shadow_keys():
+    o1 = o(items=1, a=2)
+    assert o1['items'] == 1
+    assert list(o1.items()) == [('items', 1), ('a', 2)]
+    assert json.dumps(o1) == '{"items": 1, "a": 2}'
+
+
+def test_serialization_empty():
+    _o = o()
+    assert json.dumps(_o) == '{}'
+    _o.a = {'b': 1}
+    _o['c'] = 2
+    assert json.dumps(_o) == '{"a": {"b": 1}, "c": 2}'
+    del _o['c']
+    assert json.dumps(_o) == '{"a": {"b": 1}}'
+
+
+def test_copy_pickle():
+    import copy
+    import pickle
+    o1 = o(a=1, b={'c': 2})
+    for o2 in [ copy.copy(o1), copy.deepcopy(o1), pickle.loads(pickle.dumps(o1)) ]:
+        assert o2 == o1
+        assert type(o2) is o
+        o2.a = 11
+        assert o1.a == 1
+
+
+def test_frozen():
+    d = {'a': 1, 'b': {'c': 2, 'd': {'e': 3}}}
+    f = o(d).freeze()
+    assert isinstance(f, frozen_o)
+    assert f == d
+    assert f == o(d)
+    assert f.b.d.e == 3
+    assert f.b.d is f.b.d
+    assert isinstance(f.b, frozen_o)
+    assert f.freeze() is f
+
+    # Copied on construction
+    d['a'] = 11
+    assert f.a == 1
+
+    for mutate in [
+        lambda: setattr(f, 'a', 2),
+        lambda: f.__setitem__('a', 2),
+        lambda: delattr(f, 'a'),
+        lambda: f.__delitem__('a'),
+        lambda: f.update(a=2),
+        lambda: f.pop('a'),
+        lambda: f.b.__setitem__('c', 3),
+    ]:
+        with raises(TypeError):
+            mutate()
+    assert f == {'a': 1, 'b': {'c': 2, 'd': {'e': 3}}}
+
+    f2 = frozen_o(a=1, b={'c': 2, 'd': {'e': 3}})
+    assert hash(f) == hash(f2)
+    assert len({ f, f2 }) == 1
+    assert { f: 'x' }[f2] == 'x'
+    assert json.dumps(f) == '{"a": 1, "b": {"c": 2, "d": {"e": 3}}}'
+
+    with raises(TypeError):
+        hash(frozen_o(a=[1]))
+    with raises(TypeError):
+        hash(o(a=1))
+
+
+def test_merge_deep():
+    defaults = {'a': 1, 'db': {'host': 'localhost', 'port': 5432, 'opts': {'ssl': False}}, 'tags': ['x']}
+    env = {'db': {'host': 'db.internal', 'opts': {'timeout': 5}}}
+    cli = {'a': 2, 'db': {'opts': {'ssl': True}}}
+    cfg = o.merge(defaults, env, cli)
+    assert isinstance(cfg, layered_o)
+    assert cfg == {
+        'a': 2,
+        'db': {'host': 'db.internal', 'port': 5432, 'opts': {'ssl': True, 'timeout': 5}},
+        'tags': ['x'],
+    }
+    assert list(cfg) == ['a', 'db', 'tags']
+    assert len(cfg) == 3
+    assert cfg.db.host == 'db.internal'
+    assert cfg.db.opts.ssl is True
+    assert cfg('db', 'opts', 'timeout') == 5
+    assert cfg.get('nope', 'default') == 'default'
+    with raises(AttributeError):
+        cfg.nope
+
+    # Nested views are memoized
+    assert cfg.db is cfg.db
+    assert cfg.db.opts is cfg['db']['opts']
+
+    # A non-`dict` value in a higher layer replaces lower layers' `dict`s
+    assert o.merge({'a': {'b': 1}}, {'a': 2}, {'c': 3}) == {'a': 2, 'c': 3}
+    assert o.merge({'a': 2}, {'a': {'b': 1}}).a == {'b': 1}
+    # kwargs take precedence
+    assert o.merge(defaults, a=3).a == 3
+    assert json.dumps(o.merge({'a': {'b': 1}}, {'a': {'c': 2}})) == '{"a": {"b": 1, "c": 2}}'
+
+    # Merging views flattens their layers
+    cfg2 = cfg.merge({'db': {'port': 1}})
+    assert cfg2.db.port == 1
+    assert cfg2.db.host == 'db.internal'
+    assert len(cfg2._data) == 4
+
+
+def test_merge_copy_on_write():
+    defaults = {'a': 1, 'db': {'host': 'localhost', 'port': 5432}}
+    cli = {'db': {'host': 'db.internal'}}
+    cfg = o.merge(defaults, cli)
+    db = cfg.db
+    db.port = 1
+    assert type(db) is o
+    assert cfg.db is db
+    assert cfg.db.port == 1
+    assert defaults == {'a': 1, 'db': {'host': 'localhost', 'port': 5432}}
+    assert cli == {'db': {'host': 'db.internal'}}
+
+    frozen = cfg.freeze()
+    assert isinstance(frozen, frozen_o)
+    assert frozen == {'a': 1, 'db': {'host': 'db.internal', 'port': 1}}
+    assert isinstance(cfg, layered_o)
+
+    cfg.b = {'c': 2}
+    assert type(cfg) is o
+    assert cfg == {'a': 1, 'db': {'host': 'db.internal', 'port': 1}, 'b': {'c': 2}}
+    assert defaults == {'a': 1, 'db': {'host': 'localhost', 'port': 5432}}
+
+    cfg = o.merge(defaults, cli)
+    del cfg['a']
+    assert type(cfg) is o
+    assert cfg == {'db': {'host': 'db.internal', 'port': 5432}}
+    assert defaults['a'] == 1
@@ -0,0 +1,97 @@
+import json
+
+import pytest
+
+pytest_plugins = ['pytester']
+
+TEST_FILE = '''
+from dataclasses import dataclass
+from time import sleep
+
+import pytest
+from utz import parametrize
+
+
+@dataclass
+class case:
+    n: int
+    delay: float = 0
+
+    @property
+    def id(self):
+        return f"n{self.n}"
+
+
+@parametrize(case(1_000), case(10_000), perf=dict(memory=MEMORY))
+def test_alloc(n, delay):
+    nums = list(range(n * SCALE))
+    sleep(DELAY)
+
+
+def test_unmarked():
+    pass
+'''
+
+
+def write_test(pytester, scale=1, delay=0., memory=False):
+    pytester.makepyfile(test_cases=(
+        TEST_FILE
+        .replace('SCALE', str(scale))
+        .replace('DELAY', str(delay))
+        .replace('MEMORY', str(memory))
+    ))
+
+
+def run(pytester, *args):
+    return pytester.runpytest_inprocess('-p', 'utz.perf', '-p', 'no:cacheprovider', *args)
+
+
+def test_time_budget(pytester):
+    write_test(pytester)
+    result = run(pytester)
+    result.assert_outcomes(passed=3)
+    baseline_path = pytester.path / 'perf-baseline.json'
+    baseline = json.loads(baseline_path.read_text())
+    assert list(baseline) == ['test_cases.py::test_alloc[n10000]', 'test_cases.py::test_alloc[n1000]']
+    assert set(baseline['test_cases.py::test_alloc[n1000]']) == {'time'}
+
+    # Within tolerance
+    run(pytester).assert_outcomes(passed=3)
+
+    # Slower than baseline (by more than tolerance and floor)
+    write_test(pytester, delay=.05)
+    result = run(pytester)
+    result.assert_outcomes(passed=1, failed=2)
+    result.stdout.fnmatch_lines(['*Performance regression in test_cases.py::test_alloc[[]n1000[]]*', '*time: *'])
+
+    # Loosen the tolerance
+    run(pytester, '--perf-tolerance', '1000').assert_outcomes(passed=3)
+
+    # Accept the new timings
+    run(pytester, '--perf-update').assert_outcomes(passed=3)
+    run(pytester).assert_outcomes(passed=3)
+
+
+def test_memory_budget(pytester):
+    pytest.importorskip('memray')
+    write_test(pytester, memory=True)
+    baseline_path = pytester.path / 'baseline.json'
+    run(pytester, '--perf-baseline', str(baseline_path)).assert_outcomes(passed=3)
+    baseline = json.loads(baseline_path.read_text())
+    metrics = baseline['test_cases.py::test_alloc[n10000]']
+    assert set(metrics) == {'time', 'peak_mem', 'allocations'}
+    assert metrics['peak_mem'] > 0
+
+    # 100x the allocations, vs. a synthetic baseline in which only the larger case's peak memory regresses (well beyond
+    # `FLOORS['peak_mem']`), and no other metric can
+    write_test(pytester, scale=100, memory=True)
+    baseline_path.write_text(json.dumps({
+        'test_cases.py::test_alloc[n1000]': dict(time=1e9, peak_mem=1e12, allocations=1e9),
+        'test_cases.py::test_alloc[n10000]': dict(time=1e9, peak_mem=1, allocations=1e9),
+    }))
+    result = run(pytester, '--perf-baseline', str(baseline_path))
+    result.assert_outcomes(passed=2, failed=1)
+    result.stdout.fnmatch_lines(['*Performance regression in test_cases.py::test_alloc[[]n10000[]]*', '*peak_mem: *'])
+    assert 'test_alloc[n1000]' not in result.stdout.str()
+    assert 'time: ' not in result.stdout.str()
+    assert 'allocations: ' not in result.stdout.str()
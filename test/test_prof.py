@@ -0,0 +1,85 @@
+import asyncio
+from os.path import exists
+
+import pytest
+
+from utz.prof import Tracker
+
+
+def busy(n=200_000):
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+
+def work(duration=.3):
+    from time import perf_counter
+    end = perf_counter() + duration
+    while perf_counter() < end:
+        busy(10_000)
+
+
+def test_sample(tmp_path):
+    path = tmp_path / 'prof' / 'stacks.txt'
+    with (tracker := Tracker(path=str(path), interval=.002)):
+        work()
+
+    assert tracker.mode == 'sample'
+    assert tracker.samples > 20
+    assert tracker.duration >= .3
+    assert sum(tracker.stacks.values()) <= tracker.samples
+    # Stacks start at the frame containing the `with` block
+    for stack in tracker.stacks:
+        assert stack.startswith('test_sample (test_prof.py:')
+    assert any(';work (test_prof.py:' in stack and stack.endswith(')') for stack in tracker.stacks)
+    (top, _), *_ = tracker.top()
+    assert top.startswith('busy (test_prof.py:') or top.startswith('work (test_prof.py:')
+
+    lines = path.read_text().splitlines()
+    assert lines == tracker.collapsed().splitlines()
+    stack, count = lines[0].rsplit(' ', 1)
+    assert int(count) == max(tracker.stacks.values())
+
+
+def test_async():
+    async def main():
+        async with (tracker := Tracker(interval=.002)):
+            work(.2)
+            await asyncio.sleep(.01)
+        return tracker
+
+    tracker = asyncio.run(main())
+    assert tracker.samples > 10
+    # Stacks start at the coroutine containing the `async with` block (except when the event loop is idle)
+    assert any(
+        stack.startswith('main (test_prof.py:') and ';work (test_prof.py:' in stack
+        for stack in tracker.stacks
+    )
+
+
+def test_cprofile(tmp_path):
+    path = tmp_path / 'out.prof'
+    with (tracker := Tracker(path=str(path), mode='cprofile')):
+        busy()
+    assert exists(path)
+    assert not tracker.stacks
+    stats = tracker.stats.stats
+    assert any(func == 'busy' for (_, _, func) in stats)
+
+
+@pytest.mark.parametrize('env', [None, '0'])
+def test_disabled(env, monkeypatch):
+    if env is None:
+        tracker = Tracker(enabled=False)
+    else:
+        monkeypatch.setenv('UTZ_PROF', env)
+        tracker = Tracker()
+    with tracker:
+        busy()
+    assert tracker.samples == 0 and not tracker.stacks and tracker.duration is None
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError, match='Unrecognized mode'):
+        Tracker(mode='nope')
@@ -51,3 +51,75 @@ def test_fullmatch():
         ['bc', 'c', 'cb', 'a', 'AA', 'B'],
         search=False,
     )
+
+
+def test_literals():
+    pats = ['ab', 'abc', 'abd', 'x.y', 'x']
+    check(
+        pats,
+        ['ab', 'xab', 'abcd', 'x', 'zxz'],
+        ['a', 'b', 'AB', 'yz'],
+    )
+    check(
+        pats,
+        ['ab', 'abc', 'abd', 'x', 'x.y', 'xzy'],
+        ['abcd', 'xab', 'a', 'xz', 'AB'],
+        search=False,
+    )
+    check(
+        pats,
+        ['AB', 'aBC', 'X', 'X.Y'],
+        ['abcd', 'xab', 'a', 'xz'],
+        search=False,
+        flags=re.I,
+    )
+
+
+def test_uncombinable():
+    # Backreferences and global inline flags can't be combined into one regex; these are tested one at a time
+    check(
+        [r'(.)\1', '(?i)z'],
+        ['aa', 'xyy', 'Z', 'z'],
+        ['ab', 'y'],
+    )
+    # Pre-compiled patterns with differing flags
+    incs = Includes([ re.compile('a', re.I), re.compile('b') ])
+    assert incs.fallback is not None
+    assert incs.filter(['A', 'B', 'b']) == ['A', 'b']
+
+
+def test_filter():
+    vals = ['a/b.py', 'a/c.md', 'd/b.py', 'e.txt']
+    assert Includes(['^a/', r'\.txt$']).filter(vals) == ['a/b.py', 'a/c.md', 'e.txt']
+    assert Excludes(['^a/', r'\.txt$']).filter(vals) == ['d/b.py']
+    assert Includes(None).filter(vals) == vals
+    assert Excludes(None).filter(vals) == vals
+    assert Includes([]).filter(vals) == []
+    assert Excludes([]).filter(vals) == vals
+
+
+def test_combined_matches_individual():
+    """Combined regex matches the same values as testing each of 50 patterns one at a time."""
+    from random import Random
+    rng = Random(0)
+    words = ['src', 'lib', 'test', 'data', 'build', 'node_modules', 'docs', 'img', 'cache', 'out']
+    exts = ['py', 'js', 'md', 'png', 'txt']
+    vals = [
+        '/'.join(rng.choice(words) for _ in range(4)) + f'/f{i}.{rng.choice(exts)}'
+        for i in range(20_000)
+    ]
+    pats = [ f'{a}/{b}' for a in words[:5] for b in words[1:9] ][:40] + [
+        r'\.png$', r'f\d+7\.py', r'^docs/', r'cache/.*\.md', r'(?:img|out)/f1\d\d\.js',
+        r'\.txt$', r'f\d+3\.js', r'^out/', r'lib/.*\.md', r'(?:src|test)/f2\d\d\.py',
+    ]
+    for search in [ True, False ]:
+        incs = Includes(pats, search=search)
+        compiled = [ re.compile(pat) for pat in pats ]
+        actual = incs.filter(vals)
+        expected = [
+            val for val in vals
+            if any(pat.search(val) if search else pat.fullmatch(val) for pat in compiled)
+        ]
+        assert actual == expected
+        assert actual
+        assert len(actual) < len(vals)
@@ -0,0 +1,189 @@
+import json
+import socket
+import sys
+from os.path import dirname, join
+from threading import Thread
+
+from pytest import fixture, raises
+
+from utz import ssh
+from utz.ssh import Pool, Tunnel, is_open, wait_port
+
+STANDIN = [ sys.executable, join(dirname(__file__), 'ssh_standin.py') ]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('localhost', 0))
+        return s.getsockname()[1]
+
+
+@fixture
+def echo_port():
+    """Port of a local TCP echo server."""
+    server = socket.create_server(('localhost', 0))
+
+    def serve():
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            with conn:
+                while data := conn.recv(1024):
+                    conn.sendall(data)
+
+    Thread(target=serve, daemon=True).start()
+    yield server.getsockname()[1]
+    server.close()
+
+
+@fixture
+def ssh_log(tmp_path, monkeypatch):
+    """Stand-in ``ssh`` invocations, read from ``$SSH_STANDIN_LOG``."""
+    path = tmp_path / 'ssh.log'
+    path.touch()
+    monkeypatch.setenv('SSH_STANDIN_LOG', str(path))
+
+    def read():
+        return [ json.loads(ln) for ln in path.read_text().splitlines() ]
+
+    yield read
+
+
+@fixture
+def control_dir(tmp_path):
+    yield str(tmp_path)
+    for master in list(ssh._masters.values()):
+        master.stop()
+    ssh._masters.clear()
+
+
+def echo(port: int, msg: bytes) -> bytes:
+    with socket.create_connection(('localhost', port), timeout=2) as s:
+        s.sendall(msg)
+        return s.recv(1024)
+
+
+def test_wait_port(echo_port):
+    assert wait_port('localhost', echo_port, timeout=1) < .1
+    port = free_port()
+    with raises(TimeoutError):
+        wait_port('localhost', port, timeout=.05)
+    assert not is_open('localhost', port)
+
+
+def test_tunnel_dedicated(echo_port):
+    port = free_port()
+    with Tunnel('proxy', port, dst_port=echo_port, multiplex=False, ssh=STANDIN) as tunnel:
+        assert tunnel.alive()
+        assert echo(port, b'hello') == b'hello'
+    assert not tunnel.alive()
+    assert not is_open('localhost', port)
+
+
+def test_tunnel_multiplexed(echo_port, ssh_log, control_dir):
+    ports = [ free_port() for _ in range(3) ]
+    tunnels = [
+        Tunnel('proxy', port, dst_port=echo_port, ssh=STANDIN, control_dir=control_dir)
+        for port in ports
+    ]
+    for tunnel in tunnels:
+        tunnel.start()
+    for port in ports:
+        assert echo(port, f'{port}'.encode()) == f'{port}'.encode()
+
+    # One master connection, shared by all forwards
+    calls = ssh_log()
+    masters = [ args for args in calls if 'ControlMaster=yes' in args ]
+    assert len(masters) == 1
+    forwards = [ args for args in calls if 'forward' in args ]
+    assert len(forwards) == 3
+
+    for tunnel in tunnels:
+        tunnel.close()
+        assert not tunnel.alive()
+    for port in ports:
+        assert not is_open('localhost', port)
+    assert ssh.master('proxy', control_dir=control_dir, ssh=STANDIN).alive()
+
+
+def test_master_restart(echo_port, ssh_log, control_dir):
+    port = free_port()
+    master = ssh.master('proxy', control_dir=control_dir, ssh=STANDIN)
+    with Tunnel('proxy', port, dst_port=echo_port, ssh=STANDIN, control_dir=control_dir):
+        assert echo(port, b'1') == b'1'
+    master.stop()
+    assert not master.alive()
+    with Tunnel('proxy', port, dst_port=echo_port, ssh=STANDIN, control_dir=control_dir):
+        assert echo(port, b'2') == b'2'
+    assert len([ args for args in ssh_log() if 'ControlMaster=yes' in args ]) == 2
+
+
+def test_pool(echo_port, ssh_log, control_dir):
+    port, port2 = free_port(), free_port()
+    with Pool(ssh=STANDIN, control_dir=control_dir) as pool:
+        t1 = pool.get('proxy', port, dst_port=echo_port)
+        t2 = pool.get('proxy', port, dst_port=echo_port)
+        assert t1 is t2
+        t3 = pool.get('proxy', port2, dst_port=echo_port)
+        assert t3 is not t1
+        assert len(pool) == 2
+        assert echo(port2, b'x') == b'x'
+
+        # Dead forwards are replaced
+        t1.close()
+        t4 = pool.get('proxy', port, dst_port=echo_port)
+        assert t4 is not t1
+        assert echo(port, b'y') == b'y'
+    assert len(pool) == 0
+    assert not is_open('localhost', port)
+    assert not is_open('localhost', port2)
+    assert len([ args for args in ssh_log() if 'forward' in args ]) == 3
+
+
+def test_close_after_master_exit(echo_port, ssh_log, control_dir):
+    port = free_port()
+    tunnel = Tunnel('proxy', port, dst_port=echo_port, ssh=STANDIN, control_dir=control_dir).start()
+    assert tunnel.alive()
+    tunnel.master.stop()
+    assert not tunnel.alive()
+
+    # Closing doesn't start a new master (re-authenticating) just to cancel the forward
+    tunnel.close()
+    calls = ssh_log()
+    assert len([ args for args in calls if 'ControlMaster=yes' in args ]) == 1
+    assert not [ args for args in calls if 'cancel' in args ]
+
+
+def test_pool_master_restarted(echo_port, ssh_log, control_dir):
+    port, port2 = free_port(), free_port()
+    with Pool(ssh=STANDIN, control_dir=control_dir) as pool:
+        t1 = pool.get('proxy', port, dst_port=echo_port)
+        t1.master.stop()
+
+        # Another tunnel restarts the master; `t1`'s forward didn't survive the restart
+        with Tunnel('proxy', port2, dst_port=echo_port, ssh=STANDIN, control_dir=control_dir):
+            assert not t1.alive()
+            assert not is_open('localhost', port)
+            t2 = pool.get('proxy', port, dst_port=echo_port)
+            assert t2 is not t1
+            assert t2.alive()
+            assert echo(port, b'z') == b'z'
+    assert len([ args for args in ssh_log() if 'ControlMaster=yes' in args ]) == 2
+
+
+def test_shared_spec(echo_port, ssh_log, control_dir):
+    port = free_port()
+    with Pool(ssh=STANDIN, control_dir=control_dir) as pool:
+        t1 = pool.get('proxy', port, dst_port=echo_port)
+        # Another tunnel with the same spec shares the forward, and exiting doesn't cancel it
+        with Tunnel('proxy', port, dst_port=echo_port, ssh=STANDIN, control_dir=control_dir):
+            assert echo(port, b'1') == b'1'
+        assert t1.alive()
+        assert pool.get('proxy', port, dst_port=echo_port) is t1
+        assert echo(port, b'2') == b'2'
+    assert not is_open('localhost', port)
+    calls = ssh_log()
+    assert len([ args for args in calls if 'forward' in args ]) == 1
+    assert len([ args for args in calls if 'cancel' in args ]) == 1
@@ -5,7 +5,8 @@ import pytest
 from pytest import approx
 from pytz import UTC
 
-from utz import b62, b64, b90, now, o, today, Time
+from utz import b62, b64, b90, now, o, today, Spans, Time
+from utz.time import Sketch
 
 to_dt = now.to_dt
 
@@ -165,3 +166,140 @@ def test_timer_ctx():
         'g': 0.3,
         'h': 0.1,
     })
+
+
+class FakeNs:
+    """Fake ``perf_counter_ns``, advancing by ``increment`` on each call."""
+    def __init__(self, increment=100):
+        self.value = 0
+        self.increment = increment
+
+    def __call__(self):
+        self.value += self.increment
+        return self.value
+
+
+def test_spans_nested():
+    with patch('utz.time.perf_counter_ns', FakeNs()):
+        spans = Spans()
+        with spans.span("load"):
+            for _ in range(10):
+                with spans.span("parse"):
+                    pass
+            with spans.span("save"):
+                with spans.span("parse"):
+                    pass
+
+    load = spans["load",]
+    assert load.count == 1
+    assert load.total == 2500
+    parse = spans["load", "parse"]
+    assert (parse.count, parse.total, parse.min, parse.max) == (10, 1000, 100, 100)
+    assert parse.quantile(.5) == approx(100e-9, rel=.01)
+    assert spans["load", "save", "parse"].path == ("load", "save", "parse")
+    flat = spans.flat()
+    assert set(flat) == {"load", "parse", "save"}
+    assert flat["parse"].count == 11
+
+    tree = spans.tree()
+    lines = tree.split("\n")
+    assert lines[0].split() == ["span", "count", "total", "mean", "p50", "p99", "max"]
+    assert [ line.split()[:2] for line in lines[1:] ] == [
+        ["load", "1"],
+        ["parse", "10"],
+        ["save", "1"],
+        ["parse", "1"],
+    ]
+    assert lines[2].startswith("  parse")
+    assert lines[4].startswith("    parse")
+
+    trace = spans.chrome_trace()
+    events = trace["traceEvents"]
+    assert len(events) == 13
+    assert { (e["name"], e["cat"]) for e in events } == {
+        ("load", "span"), ("parse", "load"), ("save", "load"), ("parse", "load/save"),
+    }
+    assert all(e["ph"] == "X" for e in events)
+    # Children finish (and are recorded) before their parents
+    assert events[-1]["name"] == "load" and events[-1]["dur"] == 2.5
+
+
+def test_spans_max_events():
+    spans = Spans(max_events=3)
+    for _ in range(5):
+        with spans.span("x"):
+            pass
+    assert spans["x",].count == 5
+    assert len(spans.chrome_trace()["traceEvents"]) == 3
+    assert spans.dropped == 2
+
+
+def test_spans_time_compat():
+    with patch('utz.time.perf_counter', FakeTimer()):
+        spans = Spans()
+        with spans.span("outer"):
+            spans("a")
+            spans("b")
+            spans()
+    assert spans.times == approx({ "a": .1, "b": .1 })
+    assert spans["outer", "a"].total == 100_000_000
+
+
+def test_spans_async():
+    import asyncio
+    spans = Spans()
+
+    @spans.wrap()
+    async def fetch(i):
+        with spans.span("io"):
+            await asyncio.sleep(.001 * (i % 3))
+
+    async def main():
+        async with spans.span("main"):
+            await asyncio.gather(*[ fetch(i) for i in range(20) ])
+
+    asyncio.run(main())
+    # Interleaved tasks each nest under the span active when they were created
+    assert list(spans.root.children) == ["main"]
+    assert spans["main",].children.keys() == { "test_spans_async.<locals>.fetch" }
+    fetch_stats = spans["main", "test_spans_async.<locals>.fetch"]
+    assert fetch_stats.count == 20
+    assert fetch_stats.children["io"].count == 20
+    assert fetch_stats.children["io"].quantile(.99) >= .002
+
+
+def test_sketch():
+    import random
+    rng = random.Random(0)
+    vals = [ rng.lognormvariate(10, 2) for _ in range(10_000) ]
+    sketch = Sketch(alpha=.01)
+    for v in vals:
+        sketch.add(v)
+    assert sketch.count == 10_000
+    vals.sort()
+    for q in (.01, .25, .5, .9, .99, .999):
+        assert sketch.quantile(q) == approx(vals[int(q * (len(vals) - 1))], rel=.02)
+    # Memory is bounded by the range of values, not their number
+    assert len(sketch.buckets) < 1000
+
+    other = Sketch(alpha=.01)
+    other.add(0)
+    other.add(1e12)
+    sketch.merge(other)
+    assert sketch.count == 10_002
+    assert sketch.quantile(0) == 0
+    assert sketch.quantile(1) == approx(1e12, rel=.01)
+    assert Sketch().quantile(.5) is None
+
+
+def test_spans_no_events():
+    """With ``max_events=0``, spans are aggregated without recording events (the configuration
+    ``benchmarks/bench_spans.py`` measures per-span overhead for)."""
+    spans = Spans(max_events=0)
+    span = spans.span
+    n = 1_000
+    for _ in range(n):
+        with span("x"):
+            pass
+    assert spans["x",].count == n
+    assert spans.events is None
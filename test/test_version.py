@@ -4,9 +4,12 @@ import pytest
 from pathlib import Path
 from tempfile import TemporaryDirectory
 
-from utz import run
+from test.repos import commit, tmp_repo
+from utz import line, run
+from utz.git import status
 from utz.git.status import is_dirty
-from utz.version import pkg_version_with_git
+from utz import version as version_mod
+from utz.version import git_version, pkg_version_with_git, version_getattr
 
 
 def test_pkg_version_with_git_basic():
@@ -28,7 +31,7 @@ def test_pkg_version_full_hash():
     version = pkg_version_with_git(pkg_version="1.0.0", short_hash=False)
     assert version.startswith("1.0.0+git.")
     # Should have full 40-char hash
-    hash_part = version.split("+git.")[1].rstrip(".dirty")
+    hash_part = version.split("+git.")[1].removesuffix(".dirty")
     assert len(hash_part) == 40
 
 
@@ -109,3 +112,75 @@ def test_pkg_version_fallback_on_error():
     )
     # Should fall back to plain version
     assert version == "1.0.0"
+
+
+def test_pkg_version_fast_path(mocker, monkeypatch):
+    """Hash is read without forking `git`; dirty checks are memoized per (HEAD, index mtime), for `DIRTY_TTL`."""
+    monkeypatch.setattr(version_mod, 'DIRTY_TTL', 60)
+    with tmp_repo(commits=1) as dir:
+        run('git', 'pack-refs', '--all', log=None)
+        sha = line('git', 'rev-parse', 'HEAD', log=None)
+        ln = mocker.spy(version_mod, 'line')
+        dirty = mocker.spy(status, 'run')
+        assert pkg_version_with_git(pkg_version="1.0.0", cwd=dir) == f"1.0.0+git.{sha[:7]}"
+        assert pkg_version_with_git(pkg_version="1.0.0", cwd=dir, short_hash=False) == f"1.0.0+git.{sha}"
+        assert ln.call_count == 0
+        assert dirty.call_count == 1
+
+        # Staging a change updates the index, invalidating the memoized dirty check
+        with open('file.txt', 'w') as f:
+            f.write('changed\n')
+        run('git', 'add', 'file.txt', log=None)
+        assert pkg_version_with_git(pkg_version="1.0.0", cwd=dir) == f"1.0.0+git.{sha[:7]}.dirty"
+        run('git', 'commit', '-qm', 'change', log=None)
+        sha2 = line('git', 'rev-parse', 'HEAD', log=None)
+        assert pkg_version_with_git(pkg_version="1.0.0", cwd=dir) == f"1.0.0+git.{sha2[:7]}"
+        assert ln.call_count == 0
+
+        # Unstaged edits don't touch the index; they're seen once the memoized result expires
+        with open('file.txt', 'w') as f:
+            f.write('unstaged\n')
+        assert pkg_version_with_git(pkg_version="1.0.0", cwd=dir) == f"1.0.0+git.{sha2[:7]}"
+        monkeypatch.setattr(version_mod, 'DIRTY_TTL', 0)
+        assert pkg_version_with_git(pkg_version="1.0.0", cwd=dir) == f"1.0.0+git.{sha2[:7]}.dirty"
+
+
+def test_git_version_memoized(mocker):
+    with tmp_repo(commits=1) as dir:
+        run('git', 'tag', 'v1.2.3', log=None)
+        ln = mocker.spy(version_mod, 'line')
+        assert git_version(dir) == '1.2.3'
+        assert git_version(dir) == '1.2.3'
+        assert ln.call_count == 1
+        commit('file.txt', 'new\n')
+        sha = line('git', 'rev-parse', '--short', 'HEAD', log=None)
+        assert git_version(dir) == f'1.2.3-1-g{sha}'
+        run('git', 'tag', 'v1.2.4', log=None)
+        assert git_version(dir) == '1.2.4'
+        assert ln.call_count == 3
+
+
+def test_version_getattr(mocker):
+    with tmp_repo(commits=1) as dir:
+        dirty = mocker.spy(status, 'run')
+        getattr_ = version_getattr(pkg_version="2.0.0", cwd=dir)
+        assert dirty.call_count == 0
+        sha = line('git', 'rev-parse', '--short=7', 'HEAD', log=None)
+        assert getattr_('__version__') == f"2.0.0+git.{sha}"
+        assert getattr_('__version__') == f"2.0.0+git.{sha}"
+        assert dirty.call_count == 1
+        with pytest.raises(AttributeError):
+            getattr_('nope')
+
+
+def test_version_getattr_outside_repo(tmp_path, monkeypatch):
+    # A package outside any Git repo (in particular, outside utz's)
+    pkg = tmp_path / 'ext_pkg'
+    pkg.mkdir()
+    (pkg / '__init__.py').write_text(
+        'from utz.version import version_getattr\n'
+        '__getattr__ = version_getattr(pkg_version="1.0")\n'
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import ext_pkg
+    assert ext_pkg.__version__ == '1.0'